@@ -0,0 +1,117 @@
+"""
+Mixed read/write throughput of the SQLite database with and without the tuned
+profile (WAL, synchronous=NORMAL, reader pool + single writer).
+
+Usage: python benchmarks/sqlite_profile.py [--workers 16] [--ops 400] [--write-ratio 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import select
+from sqlalchemy.dialects import sqlite
+
+from src.config import Config
+from src.database.manager import Base, create_engines
+from src.database.models import Permission
+
+TARGETS = 500
+
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        session.add_all(
+            Permission(target_type="user", target_id=i, guild_id=1, bot_usage=True)
+            for i in range(TARGETS)
+        )
+        await session.commit()
+
+
+async def read_op(session_factory, target_id: int):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Permission).filter(
+                Permission.target_type == "user",
+                Permission.target_id == target_id,
+                Permission.guild_id == 1,
+            )
+        )
+        result.scalar_one_or_none()
+
+
+async def write_op(session_factory, target_id: int):
+    stmt = sqlite.insert(Permission).values(
+        target_type="user", target_id=target_id, guild_id=1, bot_usage=False
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["target_type", "target_id", "guild_id"],
+        set_={"bot_usage": stmt.excluded.bot_usage},
+    )
+    async with session_factory() as session:
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def worker(session_factory, ops: int, write_ratio: float, rng: random.Random):
+    for _ in range(ops):
+        target_id = rng.randrange(TARGETS)
+        if rng.random() < write_ratio:
+            await write_op(session_factory, target_id)
+        else:
+            await read_op(session_factory, target_id)
+
+
+async def run(tuned: bool, args) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        database_config = replace(
+            Config().database,
+            url=f"sqlite+aiosqlite:///{directory}/bench.sqlite",
+            sqlite_tuned=tuned,
+        )
+        engine, read_engine, session_factory = create_engines(database_config)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(session_factory)
+
+        rng = random.Random(42)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(session_factory, args.ops, args.write_ratio, rng)
+                for _ in range(args.workers)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        await engine.dispose()
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+    return args.workers * args.ops / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=400)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    baseline = await run(False, args)
+    tuned = await run(True, args)
+
+    print(f"default profile: {baseline:10.1f} ops/s")
+    print(f"tuned profile:   {tuned:10.1f} ops/s")
+    print(f"speedup:         {tuned / baseline:10.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+Time-to-initialised of the bot: interpreter start, imports and every phase of
+create_bot, measured in fresh processes against a throwaway database. Exits
+non-zero when the median regresses past the saved baseline, or when there is
+no baseline to compare against.
+
+Timings depend on the machine, so the baseline is not committed: record one
+per environment (and again after hardware or interpreter changes) with
+--save-baseline, then compare later runs against it.
+
+Usage: python benchmarks/startup.py [--runs 5] [--tolerance 0.25] [--save-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+RESULT_PREFIX = "STARTUP_RESULT "
+
+
+async def child():
+    """Run one startup in this process and print its timings"""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    from src.bot import create_bot
+    from src.utils.startup import import_timings
+
+    imported = time.perf_counter()
+    bot = await create_bot()
+    ready = time.perf_counter()
+
+    await bot.usage.stop()
+    await bot.transcripts.stop()
+    # One write, so the logging thread can't split the line
+    sys.stdout.write(
+        RESULT_PREFIX
+        + json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "create_bot_ms": (ready - imported) * 1000,
+                "total_ms": (ready - started) * 1000,
+                "phases": bot.startup.timings(),
+                "imports": import_timings,
+            }
+        )
+        + "\n"
+    )
+    sys.stdout.flush()
+
+
+def migrate(workdir: str) -> None:
+    """Bring the throwaway database up to the latest schema"""
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
+
+    alembic_cfg = AlembicConfig(os.path.join(ROOT, "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    alembic_cfg.set_main_option(
+        "sqlalchemy.url",
+        f"sqlite+aiosqlite:///{os.path.join(workdir, 'data', 'database.sqlite')}",
+    )
+    command.upgrade(alembic_cfg, "head")
+
+
+def run_once(workdir: str) -> dict:
+    env = dict(
+        os.environ,
+        DISCORD_TOKEN="benchmark",
+        DISCORD_OWNER_ID="1",
+        PYTHONPATH=ROOT,
+    )
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    wall_ms = (time.perf_counter() - started) * 1000
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX) :])
+            result["process_ms"] = wall_ms
+            return result
+    raise RuntimeError(f"Child produced no result:\n{output}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        asyncio.run(child())
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "data"))
+        migrate(workdir)
+        # Warm-up run builds the feature manifest
+        run_once(workdir)
+        results = [run_once(workdir) for _ in range(args.runs)]
+
+    median_total = statistics.median(r["total_ms"] for r in results)
+    print(f"{'runs':<22}{args.runs}")
+    print(f"{'time to initialised':<22}{median_total:8.1f}ms (median)")
+    print(
+        f"{'  imports':<22}{statistics.median(r['import_ms'] for r in results):8.1f}ms"
+    )
+    print(
+        f"{'  create_bot':<22}"
+        f"{statistics.median(r['create_bot_ms'] for r in results):8.1f}ms"
+    )
+    for phase in results[0]["phases"]:
+        duration = statistics.median(r["phases"][phase]["duration_ms"] for r in results)
+        start = statistics.median(r["phases"][phase]["start_ms"] for r in results)
+        print(f"{'    ' + phase:<22}{duration:8.1f}ms  (starts at {start:.1f}ms)")
+    for module in sorted(results[0]["imports"]):
+        duration = statistics.median(r["imports"].get(module, 0) for r in results)
+        print(f"{'    ' + module:<36}{duration:8.1f}ms")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"total_ms": median_total}, f)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(
+            "FAIL: no baseline saved for this machine; "
+            "run with --save-baseline to record one"
+        )
+        sys.exit(1)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["total_ms"]
+    limit = baseline * (1 + args.tolerance)
+    print(f"{'baseline':<22}{baseline:8.1f}ms (limit {limit:.1f}ms)")
+    if median_total > limit:
+        print("FAIL: startup time regressed")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
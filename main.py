@@ -5,7 +5,9 @@ import os
 # Ensure the src directory is in the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from src.bot import create_bot
+from src.bot import create_bot, run_bot
+from src.config import Config
+from src.utils.cluster import ClusterLauncher
 from src.utils.logger import logger
 
 
@@ -18,19 +20,24 @@ async def main():
         bot = await create_bot()
 
         # Start the bot using the token from bot's config
-        await bot.start(bot.config.discord.token)
+        await run_bot(bot)
 
     except Exception as e:
-        logger.error(f"Bot startup failed: {e}")
+        logger.error("Bot startup failed: %s", e)
         raise
 
 
 if __name__ == "__main__":
+    clusters = Config().cluster.clusters
     try:
-        # Run the bot using asyncio
-        asyncio.run(main())
+        if clusters > 1:
+            # Supervise one AutoShardedBot process per cluster
+            asyncio.run(ClusterLauncher(clusters).run())
+        else:
+            # Run the bot using asyncio
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Bot shutdown initiated.")
     except Exception as e:
-        logger.error(f"Unhandled exception: {e}")
+        logger.error("Unhandled exception: %s", e)
         sys.exit(1)
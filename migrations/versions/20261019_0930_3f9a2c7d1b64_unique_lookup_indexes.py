@@ -0,0 +1,52 @@
+"""unique lookup indexes for permissions and command hashes
+
+Revision ID: 3f9a2c7d1b64
+Revises: ec6c27179e59
+Create Date: 2026-10-19 09:30:12.481920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '3f9a2c7d1b64'
+down_revision = 'ec6c27179e59'
+branch_labels = None
+depends_on = None
+
+
+# table name -> (index name, lookup columns)
+UNIQUE_INDEXES = {
+    "permissions": (
+        "ix_permissions_target",
+        ["target_type", "target_id", "guild_id"],
+    ),
+    "command_hashes": ("ix_command_hashes_guild_id", ["guild_id"]),
+}
+
+
+def _existing_tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    tables = _existing_tables()
+    for table, (index_name, columns) in UNIQUE_INDEXES.items():
+        if table not in tables:
+            continue
+
+        # Keep only the newest row per key so the unique index can be built
+        column_list = ", ".join(columns)
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MAX(id) FROM {table} GROUP BY {column_list})"
+        )
+        op.create_index(index_name, table, columns, unique=True)
+
+
+def downgrade() -> None:
+    tables = _existing_tables()
+    for table, (index_name, _) in UNIQUE_INDEXES.items():
+        if table in tables:
+            op.drop_index(index_name, table_name=table)
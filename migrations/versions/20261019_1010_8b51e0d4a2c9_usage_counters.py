@@ -0,0 +1,41 @@
+"""usage counters
+
+Revision ID: 8b51e0d4a2c9
+Revises: 3f9a2c7d1b64
+Create Date: 2026-10-19 10:10:47.215362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '8b51e0d4a2c9'
+down_revision = '3f9a2c7d1b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "usage_counters",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("guild_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False),
+        sa.Column("tokens", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_usage_counters_key",
+        "usage_counters",
+        ["guild_id", "user_id", "day"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_counters_key", table_name="usage_counters")
+    op.drop_table("usage_counters")
@@ -0,0 +1,28 @@
+"""permission token quota
+
+Revision ID: c47e19a5f3d0
+Revises: 8b51e0d4a2c9
+Create Date: 2026-10-19 10:40:03.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'c47e19a5f3d0'
+down_revision = '8b51e0d4a2c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "permissions" in sa.inspect(op.get_bind()).get_table_names():
+        with op.batch_alter_table("permissions") as batch_op:
+            batch_op.add_column(sa.Column("max_tokens_per_day", sa.Integer()))
+
+
+def downgrade() -> None:
+    if "permissions" in sa.inspect(op.get_bind()).get_table_names():
+        with op.batch_alter_table("permissions") as batch_op:
+            batch_op.drop_column("max_tokens_per_day")
@@ -0,0 +1,46 @@
+"""transcripts
+
+Revision ID: 5d2c8e7b9a14
+Revises: c47e19a5f3d0
+Create Date: 2026-10-19 11:20:38.660471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '5d2c8e7b9a14'
+down_revision = 'c47e19a5f3d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transcripts",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("guild_id", sa.BigInteger(), nullable=True),
+        sa.Column("channel_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=True),
+        sa.Column("completion_tokens", sa.Integer(), nullable=True),
+        sa.Column("total_tokens", sa.Integer(), nullable=True),
+        sa.Column("prompt", sa.LargeBinary(), nullable=False),
+        sa.Column("response", sa.LargeBinary(), nullable=False),
+    )
+    op.create_index("ix_transcripts_created_at", "transcripts", ["created_at"])
+    op.create_index(
+        "ix_transcripts_guild_created", "transcripts", ["guild_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transcripts_guild_created", table_name="transcripts")
+    op.drop_index("ix_transcripts_created_at", table_name="transcripts")
+    op.drop_table("transcripts")
@@ -0,0 +1,68 @@
+"""transcript full-text search
+
+Revision ID: e93b4f6c0d27
+Revises: 5d2c8e7b9a14
+Create Date: 2026-10-19 11:50:21.034518
+
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'e93b4f6c0d27'
+down_revision = '5d2c8e7b9a14'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+
+def _decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5("
+        "prompt, response, content='', tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    # Index existing transcripts; bodies are compressed so this runs in Python
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, prompt, response FROM transcripts "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text(
+                "INSERT INTO transcripts_fts(rowid, prompt, response) "
+                "VALUES (:id, :prompt, :response)"
+            ),
+            [
+                {
+                    "id": row.id,
+                    "prompt": _decompress(row.prompt),
+                    "response": _decompress(row.response),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS transcripts_fts")
@@ -0,0 +1,28 @@
+"""per command hashes
+
+Revision ID: a6d3f1c8e250
+Revises: e93b4f6c0d27
+Create Date: 2026-10-19 12:20:41.517302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = 'a6d3f1c8e250'
+down_revision = 'e93b4f6c0d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "command_hashes" in sa.inspect(op.get_bind()).get_table_names():
+        with op.batch_alter_table("command_hashes") as batch_op:
+            batch_op.add_column(sa.Column("command_hashes", sa.JSON()))
+
+
+def downgrade() -> None:
+    if "command_hashes" in sa.inspect(op.get_bind()).get_table_names():
+        with op.batch_alter_table("command_hashes") as batch_op:
+            batch_op.drop_column("command_hashes")
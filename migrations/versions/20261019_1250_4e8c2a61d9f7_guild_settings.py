@@ -0,0 +1,49 @@
+"""guild settings
+
+Revision ID: 4e8c2a61d9f7
+Revises: a6d3f1c8e250
+Create Date: 2026-10-19 12:50:18.604931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic
+revision = '4e8c2a61d9f7'
+down_revision = 'a6d3f1c8e250'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "guild_settings",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("guild_id", sa.BigInteger(), nullable=False),
+        sa.Column("key", sa.String(64), nullable=False),
+        sa.Column("enabled", sa.Boolean(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_guild_settings_key", "guild_settings", ["guild_id", "key"], unique=True
+    )
+    op.create_index("ix_guild_settings_version", "guild_settings", ["version"])
+
+    settings_versions = op.create_table(
+        "settings_versions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(settings_versions, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("settings_versions")
+    op.drop_index("ix_guild_settings_version", table_name="guild_settings")
+    op.drop_index("ix_guild_settings_key", table_name="guild_settings")
+    op.drop_table("guild_settings")
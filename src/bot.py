@@ -1,5 +1,7 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
+from typing import Optional
 from src.config import Config
 from src.utils.logger import logger
 from src.llm.events import setup_llm_events
@@ -7,10 +9,34 @@ from src.database.manager import DatabaseManager
 from src.utils.feature_manager import FeatureManager
 from src.utils.permissions import PermissionManager
 from src.utils.command_sync import CommandSyncer
+from src.utils.usage_buffer import UsageBuffer
+from src.utils.quota import QuotaManager
+from src.utils.transcript_writer import TranscriptWriter
+from src.utils.startup import StartupPipeline
+from src.utils.hot_reload import CogWatcher
+from src.utils.config_watcher import ConfigWatcher
+from src.utils.guild_settings import GuildSettings
+from src.utils.metrics import MetricsServer, setup_bot_metrics
+from src.utils.loop_monitor import LoopMonitor
+from src.utils.tracing import instrument_http, tracer
+from src.llm.interactions import handler
+from src.utils.cluster import ClusterInfo, IPCClient
 
 
-async def create_bot() -> commands.Bot:
-    """Create and configure the bot instance"""
+class BotCommandTree(app_commands.CommandTree):
+    async def _call(self, interaction: discord.Interaction) -> None:
+        # One trace and query count per command interaction. Commands that need
+        # several writes to commit together open db.unit_of_work() around just
+        # that work; wrapping the whole command would hold a transaction open
+        # across Discord and LLM I/O (up to 10 minutes for /profile).
+        db = DatabaseManager()
+        name = (interaction.data or {}).get("name", "unknown")
+        with tracer.trace(f"/{name}"), db.track_queries(f"/{name}"):
+            await super()._call(interaction)
+
+
+async def create_bot(cluster: Optional[ClusterInfo] = None) -> commands.Bot:
+    """Create and configure the bot instance, or one cluster worker's bot"""
     config = Config()
 
     # Set up logging first
@@ -21,49 +47,209 @@ async def create_bot() -> commands.Bot:
         logger.error("Invalid configuration")
         raise ValueError("Invalid configuration")
 
-    # Just verify database connection
     db = DatabaseManager()
-    await db.verify_database_exists()
 
     # Create bot instance with specified command prefix
     intents = discord.Intents.default()
     intents.message_content = True
     intents.members = True
 
-    bot = commands.Bot(
+    if config.discord.api_base != discord.http.Route.BASE:
+        discord.http.Route.BASE = config.discord.api_base
+
+    options = dict(
         command_prefix=config.discord.command_prefix,
         intents=intents,
         owner_id=config.discord.owner_id,
+        tree_cls=BotCommandTree,
     )
+    if cluster is None:
+        bot = commands.Bot(**options)
+    else:
+        # One process per cluster, each owning a range of the shards
+        bot = commands.AutoShardedBot(
+            shard_ids=cluster.shard_ids, shard_count=cluster.shard_count, **options
+        )
+        logger.info("Cluster %s: shards %s", cluster.cluster_id, cluster.shard_ids)
+
+    # Discord REST calls made while handling a traced request become spans
+    instrument_http(bot.http)
 
     # Store config and database references
     bot.config = config
     bot.db = db
+    # IPC link to the other clusters, None when running as a single process
+    bot.cluster = None
 
-    # Initialize core systems
-    try:
+    async def verify_database():
+        # Just verify database connection
+        await db.verify_database_exists()
+
+    async def setup_permissions():
         # Permission system
         logger.info("Setting up permission system...")
         bot.permissions = PermissionManager()
 
+    async def setup_settings():
+        # Per-guild feature flags, read from memory on the message path
+        bot.settings = GuildSettings()
+        await bot.settings.refresh()
+        bot.settings.start()
+
+    async def setup_usage():
+        # Buffered usage counters, flushed in the background
+        bot.usage = UsageBuffer()
+        bot.usage.start()
+
+    async def setup_quota():
+        # LLM request and token quotas
+        bot.quota = QuotaManager(bot.permissions, bot.usage, config.llm)
+        config.subscribe("llm", bot.quota.apply_config)
+
+    async def setup_transcripts():
+        # Batched transcript store for LLM exchanges
+        bot.transcripts = TranscriptWriter(
+            retention_days=config.llm.transcript_retention_days
+        )
+        bot.transcripts.start()
+        config.subscribe(
+            "llm",
+            lambda changes: setattr(
+                bot.transcripts,
+                "retention_days",
+                config.llm.transcript_retention_days,
+            ),
+        )
+
+    async def load_features():
         # Feature manager and load features
         logger.info("Loading features...")
         feature_manager = FeatureManager(bot)
         bot.feature_manager = feature_manager
         await feature_manager.load_all_features()
 
+    async def setup_events():
         # Set up LLM event handlers
         logger.info("Setting up LLM events...")
         await setup_llm_events(bot)
 
+    async def setup_metrics():
+        # Prometheus endpoint for LLM, command, database and cache timings
+        setup_bot_metrics(bot, handler)
+        # Each cluster worker serves its own metrics on the next port up
+        port = config.metrics.port + (cluster.cluster_id if cluster else 0)
+        bot.metrics = MetricsServer(config.metrics.host, port)
+        if config.metrics.enabled:
+            try:
+                await bot.metrics.start()
+            except OSError as e:
+                logger.error("Metrics endpoint unavailable: %s", e)
+
+    async def setup_loop_monitor():
+        # Watch for callbacks that block the gateway's event loop
+        bot.loop_monitor = LoopMonitor(
+            interval=config.metrics.loop_lag_interval,
+            threshold_ms=config.metrics.loop_blocking_ms,
+        )
+        if config.metrics.loop_monitor:
+            bot.loop_monitor.start()
+
+    async def setup_command_syncer():
         # Initialize command syncer
         logger.info("Initializing command syncer...")
-        bot.command_syncer = CommandSyncer(bot)
+        bot.command_syncer = CommandSyncer(
+            bot, sync_global=cluster is None or cluster.cluster_id == 0
+        )
+
+    async def setup_cluster():
+        # Cluster-wide operations arrive from the launcher over IPC
+        client = IPCClient(cluster)
 
+        async def reload(module):
+            if await bot.feature_manager.reload_feature(f"src.cogs.{module}"):
+                await bot.command_syncer.sync_all_guilds()
+                return True
+            return False
+
+        async def shutdown(data):
+            await bot.close()
+
+        async def stats(data):
+            return {
+                "cluster_id": cluster.cluster_id,
+                "shards": cluster.shard_ids,
+                "guilds": len(bot.guilds),
+                "latency": bot.latency if bot.is_ready() else None,
+            }
+
+        client.on("reload", reload)
+        client.on("shutdown", shutdown)
+        client.on("stats", stats)
+        client.on_disconnect = bot.close
+        await client.connect()
+        bot.cluster = client
+
+    async def setup_hot_reload():
+        # Reload edited cogs without restarting (dev/ops mode only)
+        bot.cog_watcher = CogWatcher(
+            bot, debounce=config.features.hot_reload_debounce
+        )
+        if config.features.hot_reload:
+            bot.cog_watcher.start()
+
+    async def setup_config_watcher():
+        # Apply .env edits to the running bot
+        bot.config_watcher = ConfigWatcher()
+        bot.config_watcher.start()
+
+    # Independent phases run concurrently; each waits only on what it uses
+    pipeline = StartupPipeline()
+    pipeline.add("database", verify_database)
+    pipeline.add("permissions", setup_permissions, after=["database"])
+    pipeline.add("settings", setup_settings, after=["database"])
+    pipeline.add("usage", setup_usage, after=["database"])
+    pipeline.add("transcripts", setup_transcripts, after=["database"])
+    pipeline.add("quota", setup_quota, after=["permissions", "usage"])
+    pipeline.add("features", load_features)
+    pipeline.add(
+        "llm_events", setup_events, after=["quota", "transcripts", "settings"]
+    )
+    pipeline.add("command_syncer", setup_command_syncer, after=["features"])
+    pipeline.add("hot_reload", setup_hot_reload, after=["command_syncer"])
+    pipeline.add("config_watcher", setup_config_watcher, after=["llm_events"])
+    pipeline.add("metrics", setup_metrics, after=["llm_events"])
+    pipeline.add("loop_monitor", setup_loop_monitor)
+    if cluster is not None:
+        pipeline.add("cluster", setup_cluster, after=["command_syncer"])
+    bot.startup = pipeline
+
+    # Initialize core systems
+    try:
+        await pipeline.run()
+        for line in pipeline.report():
+            logger.info(line)
         logger.info("Bot initialization complete!")
 
     except Exception as e:
-        logger.error(f"Failed to initialize bot: {str(e)}")
+        logger.error("Failed to initialize bot: %s", e)
         raise
 
     return bot
+
+
+async def run_bot(bot: commands.Bot) -> None:
+    """Run the bot until it closes, then stop its background components"""
+    try:
+        await bot.start(bot.config.discord.token)
+    finally:
+        # Write out buffered usage counters and transcripts before exiting
+        await bot.config_watcher.stop()
+        await bot.cog_watcher.stop()
+        await bot.settings.stop()
+        await bot.metrics.stop()
+        await bot.loop_monitor.stop()
+        await bot.usage.stop()
+        await bot.transcripts.stop()
+        if bot.cluster is not None:
+            await bot.cluster.close()
+        tracer.shutdown()
@@ -1,10 +1,5 @@
 from typing import List
 
-# Import your category packages
-from . import owner
-from . import admin
-from . import general
-
 
 def get_all_cogs() -> List[str]:
     return [
@@ -1,3 +1,16 @@
-from .permissions import PermissionsCog
+from importlib import import_module
 
-__all__ = ["PermissionsCog"]
+# Cog classes are imported on first access, so importing this package (which
+# load_extension does for every feature) doesn't import its sibling modules
+_exports = {
+    "PermissionsCog": ".permissions",
+    "TranscriptsCog": ".transcripts",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(import_module(_exports[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,8 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
+from src.database.manager import DatabaseManager
 from src.database.models.permission import PermissionType
 from src.utils.permissions import permission_manager
 from typing import Optional, Union
@@ -29,20 +31,31 @@ class PermissionCategory:
 
 
 class PermissionsView(discord.ui.View):
+    # Seconds to wait after the last toggle before writing pending changes
+    flush_delay = 2.0
+
     def __init__(self, cog, interaction, target):
         super().__init__(timeout=180)
         self.cog = cog
         self.interaction = interaction
         self.target = target
         self.current_view = "categories"
+        self.current_perms: dict = {}
+        self.pending: dict = {}
+        self._embeds: dict = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        # True while a flush is writing; only a flush still waiting out its
+        # delay may be cancelled
+        self._writing = False
+        # Option values are Permission columns, so toggles can be saved as-is
         self.permission_categories = {
             "general": PermissionCategory(
                 "General Access",
                 "Basic bot usage and access permissions",
                 {
-                    "use_commands": "Use Basic Commands",
-                    "view_content": "View Bot Content",
-                    "interact_features": "Use Basic Features",
+                    "bot_usage": "Use the Bot",
+                    "message_perms": "Chat With the Bot",
                 },
                 "🔑",
             ),
@@ -50,9 +63,8 @@ class PermissionsView(discord.ui.View):
                 "Moderation Tools",
                 "Moderation and member management capabilities",
                 {
-                    "manage_messages": "Delete/Edit Messages",
-                    "manage_members": "Manage Members",
-                    "view_logs": "View Logs",
+                    "moderation_perms": "Use Moderation Commands",
+                    "channel_perms": "Manage Channel Settings",
                 },
                 "🛡️",
             ),
@@ -60,9 +72,7 @@ class PermissionsView(discord.ui.View):
                 "Advanced Controls",
                 "Advanced configuration and management",
                 {
-                    "manage_settings": "Configure Bot",
-                    "manage_integrations": "Manage Integrations",
-                    "override_limits": "Override Limits",
+                    "admin_perms": "Configure Bot",
                 },
                 "⚙️",
             ),
@@ -83,6 +93,85 @@ class PermissionsView(discord.ui.View):
             self.add_item(PermissionSelect(category.permissions))
             self.add_item(BackButton())
 
+    async def load_permissions(self):
+        """Load the target's permissions once for the whole session"""
+        self.current_perms = await get_current_permissions(self.interaction, self)
+        self._embeds.clear()
+
+    async def get_embed(self) -> discord.Embed:
+        """Return the embed for the current page, rebuilding it only after changes"""
+        if self.current_view not in self._embeds:
+            if self.current_view == "categories":
+                embed = await create_category_overview_embed(
+                    self.target, self.permission_categories, self.current_perms
+                )
+            else:
+                embed = await create_permissions_embed(
+                    self.target,
+                    self.permission_categories[self.current_view],
+                    self.current_perms,
+                )
+            self._embeds[self.current_view] = embed
+        return self._embeds[self.current_view]
+
+    def toggle_permission(self, permission: str) -> bool:
+        """Flip a permission in memory and queue it for the next flush"""
+        new_value = not self.current_perms.get(permission, False)
+        self.current_perms[permission] = new_value
+        self.pending[permission] = new_value
+        self._embeds.clear()
+        self._schedule_flush()
+        return new_value
+
+    def _schedule_flush(self):
+        if self._flush_task and not self._flush_task.done() and not self._writing:
+            self._flush_task.cancel()
+        self._flush_task = asyncio.create_task(self._debounced_flush())
+
+    async def _debounced_flush(self):
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to save permissions: %s", e)
+            await self._report_flush_failure(
+                "They will be retried with your next change."
+            )
+
+    async def _report_flush_failure(self, hint: str):
+        try:
+            await self.interaction.followup.send(
+                f"⚠️ Your permission changes could not be saved. {hint}",
+                ephemeral=True,
+            )
+        except discord.HTTPException as e:
+            logger.error("Failed to report permission save failure: %s", e)
+
+    async def flush(self):
+        """Write all pending toggles in a single upsert"""
+        # One write at a time, so an older batch can never land after a newer one
+        async with self._flush_lock:
+            if not self.pending:
+                return
+
+            changes, self.pending = self.pending, {}
+            self._writing = True
+            try:
+                # Cache invalidation waits for the commit
+                async with DatabaseManager().unit_of_work():
+                    await permission_manager.set_permission(
+                        guild_id=self.interaction.guild_id,
+                        target_type=self.cog._get_target_type(self.target),
+                        target_id=self.target.id,
+                        **changes,
+                    )
+            except BaseException:
+                # Keep newer toggles made while the write was in flight
+                self.pending = {**changes, **self.pending}
+                raise
+            finally:
+                self._writing = False
+
     def _get_target_type_display(self):
         if isinstance(self.target, discord.Member):
             return "User"
@@ -91,6 +180,15 @@ class PermissionsView(discord.ui.View):
         return "Channel"
 
     async def on_timeout(self):
+        if self._flush_task and not self._flush_task.done() and not self._writing:
+            self._flush_task.cancel()
+        try:
+            # Waits for a write already in flight, then saves what is left
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to save permissions: %s", e)
+            await self._report_flush_failure("Run `/perms` again to retry.")
+
         for child in self.children:
             child.disabled = True
 
@@ -99,16 +197,14 @@ class PermissionsView(discord.ui.View):
             description="⌛ The permission management session has timed out.",
             color=discord.Color.red(),
         )
-        await self.interaction.followup.edit_message(
-            self.interaction.message.id, embed=embed, view=self
-        )
+        await self.interaction.edit_original_response(embed=embed, view=self)
 
 
 class CategorySelect(discord.ui.Select):
     def __init__(self, categories):
         options = [
             discord.SelectOption(
-                label=data["display"],
+                label=data.display_name,
                 value=category_name,
             )
             for category_name, data in categories.items()
@@ -119,11 +215,7 @@ class CategorySelect(discord.ui.Select):
         await interaction.response.defer()
         self.view.current_view = self.values[0]
 
-        embed = await create_permissions_embed(
-            self.view.target,
-            self.view.permission_categories[self.values[0]],
-            await get_current_permissions(interaction, self.view),
-        )
+        embed = await self.view.get_embed()
 
         self.view.update_view_items()
         await interaction.message.edit(embed=embed, view=self.view)
@@ -143,36 +235,26 @@ class PermissionSelect(discord.ui.Select):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
         permission = self.values[0]
-        category = self.view.current_view
 
         try:
-            current_perms = await get_current_permissions(interaction, self.view)
-            new_value = not getattr(current_perms, permission, False)
-
-            await permission_manager.set_permission(
-                guild_id=interaction.guild_id,
-                target_type=self.view.cog._get_target_type(self.view.target),
-                target_id=self.view.target.id,
-                **{permission: new_value},
-            )
-
-            embed = await create_permissions_embed(
-                self.view.target,
-                self.view.permission_categories[category],
-                await get_current_permissions(interaction, self.view),
-            )
+            new_value = self.view.toggle_permission(permission)
+            embed = await self.view.get_embed()
 
             await interaction.message.edit(embed=embed, view=self.view)
 
+            labels = {option.value: option.label for option in self.options}
             confirm_embed = discord.Embed(
-                title="Permission Updated",
-                description=f"{'✅' if new_value else '❌'} **{permission.replace('_', ' ').title()}**",
+                title="Permission Changed",
+                description=(
+                    f"{'✅' if new_value else '❌'} **{labels[permission]}**\n"
+                    "Saving in a moment..."
+                ),
                 color=discord.Color.green() if new_value else discord.Color.red(),
             )
             await interaction.followup.send(embed=confirm_embed, ephemeral=True)
 
         except Exception as e:
-            logger.error(f"Failed to update permission: {str(e)}")
+            logger.error("Failed to update permission: %s", e)
             await interaction.followup.send(
                 "An error occurred while updating the permission. Please try again.",
                 ephemeral=True,
@@ -187,11 +269,7 @@ class BackButton(discord.ui.Button):
         await interaction.response.defer()
         self.view.current_view = "categories"
 
-        embed = await create_category_overview_embed(
-            self.view.target,
-            self.view.permission_categories,
-            await get_current_permissions(interaction, self.view),
-        )
+        embed = await self.view.get_embed()
 
         self.view.update_view_items()
         await interaction.message.edit(embed=embed, view=self.view)
@@ -219,7 +297,7 @@ async def create_permissions_embed(target, category_data, current_perms):
 
     status_list = []
     for perm_name, display_name in category_data.permissions.items():
-        value = getattr(current_perms, perm_name, False)
+        value = current_perms.get(perm_name, False)
         emoji = "✅" if value else "❌"
         status_list.append(f"{emoji} **{display_name}**")
 
@@ -259,7 +337,7 @@ async def create_category_overview_embed(target, categories, current_perms):
         enabled_count = sum(
             1
             for perm_name in category_data.permissions.keys()
-            if getattr(current_perms, perm_name, False)
+            if current_perms.get(perm_name, False)
         )
         total_count = len(category_data.permissions)
 
@@ -274,12 +352,17 @@ async def create_category_overview_embed(target, categories, current_perms):
     return embed
 
 
-async def get_current_permissions(interaction, view):
-    return await permission_manager.repo.get_permissions(
+async def get_current_permissions(interaction, view) -> dict:
+    row = await permission_manager.repo.get_permissions(
         target_type=view.cog._get_target_type(view.target),
         target_id=view.target.id,
         guild_id=interaction.guild_id,
     )
+    return {
+        perm_name: bool(getattr(row, perm_name, False))
+        for category in view.permission_categories.values()
+        for perm_name in category.permissions
+    }
 
 
 class PermissionsCog(commands.Cog, name="Permissions"):
@@ -316,16 +399,14 @@ class PermissionsCog(commands.Cog, name="Permissions"):
             target = member or role or channel
             view = PermissionsView(self, interaction, target)
 
-            # Get current permissions and create initial embed
-            current_perms = await get_current_permissions(interaction, view)
-            embed = await create_category_overview_embed(
-                target, view.permission_categories, current_perms
-            )
+            # Load permissions once for the session and create initial embed
+            await view.load_permissions()
+            embed = await view.get_embed()
 
             await interaction.response.send_message(embed=embed, view=view)
 
         except Exception as e:
-            logger.error(f"Error in perms command: {str(e)}")
+            logger.error("Error in perms command: %s", e)
             if not interaction.response.is_done():
                 await interaction.response.send_message(
                     "An error occurred while setting up permissions management.",
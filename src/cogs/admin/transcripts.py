@@ -0,0 +1,73 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from datetime import datetime, timedelta
+from typing import Optional
+from src.database.repositories.transcript_repository import TranscriptRepository
+from src.utils.logger import logger
+
+
+class TranscriptsCog(commands.Cog, name="Transcripts"):
+    def __init__(self, bot):
+        self.bot = bot
+        self.repo = TranscriptRepository()
+
+    @app_commands.command(name="transcripts")
+    @app_commands.guild_only()
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(
+        query="Words to search for in past conversations",
+        channel="Only search this channel",
+        days="Only search the last N days",
+    )
+    async def transcripts(
+        self,
+        interaction: discord.Interaction,
+        query: str,
+        channel: Optional[discord.TextChannel] = None,
+        days: Optional[app_commands.Range[int, 1, 365]] = None,
+    ):
+        """Search this server's conversations with the bot"""
+        await interaction.response.defer(ephemeral=True)
+        try:
+            results = await self.repo.search(
+                query,
+                guild_id=interaction.guild_id,
+                channel_id=channel.id if channel else None,
+                since=datetime.utcnow() - timedelta(days=days) if days else None,
+                limit=10,
+            )
+        except Exception as e:
+            logger.error("Transcript search failed: %s", e)
+            await interaction.followup.send(
+                "An error occurred while searching transcripts.", ephemeral=True
+            )
+            return
+
+        embed = discord.Embed(
+            title=f"🔎 Transcripts matching “{query[:100]}”",
+            color=discord.Color.blue(),
+        )
+        if not results:
+            embed.description = "*No matching conversations found*"
+
+        for transcript in results:
+            prompt = transcript.prompt_text
+            embed.add_field(
+                name=f"{transcript.created_at:%Y-%m-%d %H:%M} UTC",
+                value=(
+                    f"<@{transcript.user_id}> in <#{transcript.channel_id}>\n"
+                    f"> {prompt[:200]}{'…' if len(prompt) > 200 else ''}"
+                ),
+                inline=False,
+            )
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    # Search relies on SQLite FTS5; other databases only store transcripts
+    if not TranscriptRepository().has_search:
+        logger.info("Transcript search needs SQLite; /transcripts is not registered")
+        return
+    await bot.add_cog(TranscriptsCog(bot))
@@ -1,4 +1,16 @@
-from .info import InfoCog
-from .utility import UtilityCog
+from importlib import import_module
 
-__all__ = ["InfoCog", "UtilityCog"]
+# Cog classes are imported on first access, so importing this package (which
+# load_extension does for every feature) doesn't import its sibling modules
+_exports = {
+    "InfoCog": ".info",
+    "UtilityCog": ".utility",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(import_module(_exports[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -24,7 +25,20 @@ class InfoCog(commands.Cog, name="Info"):
         # Add fields
         embed.add_field(name="Bot Name", value=self.bot.user.name, inline=True)
         embed.add_field(name="Uptime", value=str(uptime).split(".")[0], inline=True)
-        embed.add_field(name="Servers", value=str(len(self.bot.guilds)), inline=True)
+        servers = len(self.bot.guilds)
+        if self.bot.cluster is not None:
+            # Other clusters' guilds live in other processes
+            try:
+                stats = await self.bot.cluster.request("stats", timeout=2.0)
+                servers = sum(cluster["guilds"] for cluster in stats if cluster)
+                embed.add_field(
+                    name="Clusters",
+                    value=f"{len(stats)} ({self.bot.shard_count} shards)",
+                    inline=True,
+                )
+            except asyncio.TimeoutError:
+                pass
+        embed.add_field(name="Servers", value=str(servers), inline=True)
 
         await interaction.response.send_message(embed=embed)
 
@@ -1,5 +1,16 @@
-# This file can be empty, it just marks the directory as a Python package
+from importlib import import_module
 
-from .settings import OwnerSettingsCog
+# Cog classes are imported on first access, so importing this package (which
+# load_extension does for every feature) doesn't import its sibling modules
+_exports = {
+    "OwnerSettingsCog": ".settings",
+    "ProfilerCog": ".profiler",
+}
 
-__all__ = ["OwnerSettingsCog"]
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(import_module(_exports[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,192 @@
+import asyncio
+import io
+import threading
+import discord
+from datetime import datetime
+from discord import app_commands
+from discord.ext import commands
+from typing import Optional
+from src.utils.logger import logger
+from src.utils.profiler import HeapDiff, SamplingProfiler
+
+
+class ProfilerCog(commands.Cog, name="Profiler"):
+    # Owner tooling stays available even while other features are deferred
+    __cog_critical__ = True
+
+    profile = app_commands.Group(
+        name="profile", description="Profile the running bot (Owner only)"
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Set by /profile stop to end the running session early
+        self._stop: Optional[asyncio.Event] = None
+
+    async def is_owner(self, interaction: discord.Interaction) -> bool:
+        return await self.bot.is_owner(interaction.user)
+
+    async def _begin(self, interaction: discord.Interaction) -> bool:
+        """Check access and claim the single profiling slot"""
+        if not await self.is_owner(interaction):
+            await interaction.response.send_message(
+                "Only the bot owner can use this command.", ephemeral=True
+            )
+            return False
+        if self._stop is not None:
+            await interaction.response.send_message(
+                "A profiling session is already running, use `/profile stop`.",
+                ephemeral=True,
+            )
+            return False
+        self._stop = asyncio.Event()
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        return True
+
+    async def _wait(self, seconds: int) -> None:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    @staticmethod
+    def _file(text: str, kind: str, extension: str) -> discord.File:
+        name = f"{kind}-{datetime.utcnow():%Y%m%d-%H%M%S}.{extension}"
+        return discord.File(io.BytesIO(text.encode()), filename=name)
+
+    @profile.command(name="cpu")
+    @app_commands.describe(
+        seconds="How long to sample for",
+        interval_ms="Milliseconds between samples",
+        all_threads="Also sample worker threads, not just the event loop",
+    )
+    async def cpu(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 1, 600] = 30,
+        interval_ms: app_commands.Range[int, 1, 1000] = 5,
+        all_threads: bool = False,
+    ):
+        """Sample stacks and return a collapsed-stack flamegraph file"""
+        if not await self._begin(interaction):
+            return
+
+        profiler = SamplingProfiler(
+            interval=interval_ms / 1000,
+            # Commands run on the event loop thread
+            thread_ids=None if all_threads else [threading.get_ident()],
+        )
+        try:
+            profiler.start()
+            logger.info(
+                "CPU profiling started for %ss by %s", seconds, interaction.user
+            )
+            await self._wait(seconds)
+        finally:
+            # Joining the sampler thread takes at most one interval
+            profiler.stop()
+            self._stop = None
+
+        try:
+            collapsed = await asyncio.to_thread(profiler.collapsed)
+            embed = discord.Embed(
+                title="CPU Profile",
+                description=(
+                    f"{profiler.samples} samples over {profiler.duration:.1f}s.\n"
+                    "Open the file with speedscope.app or flamegraph.pl."
+                ),
+                color=discord.Color.blue(),
+            )
+            top = "\n".join(
+                f"{share:6.1%} {name[:80]}"
+                for name, share in profiler.top_functions(10)
+            )
+            embed.add_field(
+                name="Top functions (self)",
+                value=f"```\n{top or 'No samples'}\n```",
+                inline=False,
+            )
+            await interaction.followup.send(
+                embed=embed,
+                file=self._file(collapsed, "cpu", "collapsed.txt"),
+                ephemeral=True,
+            )
+        except Exception as e:
+            logger.error("Failed to send CPU profile: %s", e)
+            await interaction.followup.send(
+                "An error occurred while building the profile.", ephemeral=True
+            )
+
+    @profile.command(name="heap")
+    @app_commands.describe(
+        seconds="How long to trace allocations for",
+        top="Allocation sites to list in the summary",
+    )
+    async def heap(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 1, 600] = 30,
+        top: app_commands.Range[int, 1, 25] = 10,
+    ):
+        """Diff tracemalloc heap snapshots taken N seconds apart"""
+        if not await self._begin(interaction):
+            return
+
+        heap = HeapDiff()
+        try:
+            # Snapshots walk every traced block, so keep them off the loop
+            await asyncio.to_thread(heap.start)
+            logger.info(
+                "Heap profiling started for %ss by %s", seconds, interaction.user
+            )
+            await self._wait(seconds)
+            stats = await asyncio.to_thread(heap.stop)
+        except Exception as e:
+            logger.error("Heap profiling failed: %s", e)
+            await interaction.followup.send(
+                "An error occurred while profiling the heap.", ephemeral=True
+            )
+            return
+        finally:
+            heap.cancel()
+            self._stop = None
+
+        growth = sum(stat.size_diff for stat in stats)
+        summary = "\n".join(HeapDiff.format(stats, top))
+        embed = discord.Embed(
+            title="Heap Growth",
+            description=f"Net {growth / 1024:+.1f} KiB over {seconds}s.",
+            color=discord.Color.blue(),
+        )
+        embed.add_field(
+            name="Top allocation sites",
+            value=f"```\n{summary[:1000] or 'No change'}\n```",
+            inline=False,
+        )
+        await interaction.followup.send(
+            embed=embed,
+            file=self._file("\n".join(HeapDiff.format(stats)), "heap", "txt"),
+            ephemeral=True,
+        )
+
+    @profile.command(name="stop")
+    async def stop(self, interaction: discord.Interaction):
+        """End the running profiling session early"""
+        if not await self.is_owner(interaction):
+            await interaction.response.send_message(
+                "Only the bot owner can use this command.", ephemeral=True
+            )
+            return
+        if self._stop is None:
+            await interaction.response.send_message(
+                "No profiling session is running.", ephemeral=True
+            )
+            return
+        self._stop.set()
+        await interaction.response.send_message(
+            "Stopping, results will follow.", ephemeral=True
+        )
+
+
+async def setup(bot):
+    await bot.add_cog(ProfilerCog(bot))
@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from src.config import Config
+from typing import Optional
 from src.utils.logger import logger
 
 
@@ -50,11 +51,15 @@ class SettingsView(discord.ui.View):
         }
         self.update_view_items()
 
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # The message is public; only whoever opened it passed the access check
+        return interaction.user.id == self.interaction.user.id
+
     def update_view_items(self):
         self.clear_items()
 
         # Add scope indicator
-        scope_text = "Global Settings" if not self.guild_id else f"Server Settings"
+        scope_text = "Global Settings" if not self.guild_id else "Server Settings"
         self.add_item(ScopeIndicator(scope_text))
 
         if self.current_view == "categories":
@@ -107,10 +112,10 @@ class SettingSelect(discord.ui.Select):
 
         try:
             current_settings = await get_current_settings(interaction, self.view)
-            new_value = not getattr(current_settings, setting, False)
+            new_value = not current_settings.get(setting, False)
 
-            # Update the setting in your config
-            # await update_setting(setting, new_value)
+            # Stored for this scope and applied to the in-memory settings cache
+            await self.view.cog.bot.settings.set(self.view.guild_id, setting, new_value)
 
             embed = await create_settings_embed(
                 self.view.settings_categories[category],
@@ -127,7 +132,7 @@ class SettingSelect(discord.ui.Select):
             await interaction.followup.send(embed=confirm_embed, ephemeral=True)
 
         except Exception as e:
-            logger.error(f"Failed to update setting: {str(e)}")
+            logger.error("Failed to update setting: %s", e)
             await interaction.followup.send(
                 "An error occurred while updating the setting. Please try again.",
                 ephemeral=True,
@@ -157,6 +162,9 @@ class ScopeIndicator(discord.ui.Button):
 
 
 class OwnerSettingsCog(commands.Cog, name="Owner Settings"):
+    # Owner tooling stays available even while other features are deferred
+    __cog_critical__ = True
+
     def __init__(self, bot):
         self.bot = bot
         self.config = Config()
@@ -164,19 +172,52 @@ class OwnerSettingsCog(commands.Cog, name="Owner Settings"):
     async def is_owner(self, interaction: discord.Interaction) -> bool:
         return await self.bot.is_owner(interaction.user)
 
+    async def can_configure(
+        self, interaction: discord.Interaction, guild_id: Optional[int]
+    ) -> bool:
+        """Owners can edit any scope; server administrators only their own server"""
+        if await self.is_owner(interaction):
+            return True
+        return (
+            guild_id is not None
+            and isinstance(interaction.user, discord.Member)
+            and interaction.user.guild_permissions.administrator
+        )
+
     @app_commands.command(name="settings")
-    async def settings(self, interaction: discord.Interaction):
-        """Configure bot-wide settings (Owner only)"""
-        if not await self.is_owner(interaction):
+    @app_commands.describe(scope="Settings to edit (defaults to this server)")
+    @app_commands.choices(
+        scope=[
+            app_commands.Choice(name="This server", value="guild"),
+            app_commands.Choice(name="Bot-wide", value="global"),
+        ]
+    )
+    async def settings(
+        self,
+        interaction: discord.Interaction,
+        scope: Optional[app_commands.Choice[str]] = None,
+    ):
+        """Configure settings for this server, or bot-wide (owner only)"""
+        # Server scope by default in a guild; DMs can only reach bot-wide settings
+        guild_id = interaction.guild_id
+        if scope is not None and scope.value == "global":
+            guild_id = None
+
+        if not await self.can_configure(interaction, guild_id):
+            description = (
+                "❌ Only bot owners and server administrators can use this command."
+                if guild_id
+                else "❌ Only bot owners can change bot-wide settings."
+            )
             embed = discord.Embed(
                 title="Access Denied",
-                description="❌ Only bot owners can use this command.",
+                description=description,
                 color=discord.Color.red(),
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        view = SettingsView(self, interaction)
+        view = SettingsView(self, interaction, guild_id=guild_id)
         current_settings = await get_current_settings(interaction, view)
         embed = await create_category_overview_embed(
             view.settings_categories, current_settings
@@ -196,7 +237,7 @@ async def create_settings_embed(category_data, current_settings, guild_name=None
 
     settings_text = []
     for setting_name, display_name in category_data.settings.items():
-        value = getattr(current_settings, setting_name, False)
+        value = current_settings.get(setting_name, False)
         status = "[ENABLED]" if value else "[DISABLED]"
         settings_text.append(f"{status} {display_name}")
 
@@ -215,11 +256,11 @@ async def create_category_overview_embed(categories, current_settings):
     status_list = []
     for category_name, category_data in categories.items():
         category_enabled = any(
-            getattr(current_settings, setting_name, False)
-            for setting_name in category_data["settings"].keys()
+            current_settings.get(setting_name, False)
+            for setting_name in category_data.settings.keys()
         )
         emoji = "✅" if category_enabled else "❌"
-        status_list.append(f"{emoji} {category_data['display']}")
+        status_list.append(f"{emoji} {category_data.display_name}")
 
     embed.add_field(
         name="Setting Categories", value="\n".join(status_list), inline=False
@@ -229,8 +270,8 @@ async def create_category_overview_embed(categories, current_settings):
 
 
 async def get_current_settings(interaction, view):
-    # Implement this to fetch current settings from your config
-    return view.cog.config
+    # Effective values for the view's scope, from the bot's settings cache
+    return view.cog.bot.settings.get_all(view.guild_id)
 
 
 async def setup(bot):
@@ -6,13 +6,16 @@ from src.utils.logger import logger
 
 
 class SystemCog(commands.Cog, name="System"):
+    # Owner tooling stays available even while other features are deferred
+    __cog_critical__ = True
+
     def __init__(self, bot):
         self.bot = bot
         self.config = Config()
 
     async def is_owner(self, interaction: discord.Interaction) -> bool:
         """Check if the user is the bot owner"""
-        return interaction.user.id == int(self.config.DISCORD_OWNER_ID)
+        return await self.bot.is_owner(interaction.user)
 
     @app_commands.command(name="reload")
     async def reload(self, interaction: discord.Interaction, module: str):
@@ -23,15 +26,27 @@ class SystemCog(commands.Cog, name="System"):
             )
             return
 
-        try:
-            await self.bot.reload_extension(f"src.cogs.{module}")
-            await interaction.response.send_message(
+        # Reloading and syncing (with 429 backoff) can outlast the 3s window
+        # for the initial response
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        if self.bot.cluster is not None:
+            # Every cluster reloads the module and syncs its own guilds
+            await self.bot.cluster.broadcast("reload", module)
+            await interaction.followup.send(
+                f"🔄 Reloading `{module}` on every cluster, check the logs.",
+                ephemeral=True,
+            )
+        elif await self.bot.feature_manager.reload_feature(f"src.cogs.{module}"):
+            # Push only the command scopes whose hashes changed
+            await self.bot.command_syncer.sync_all_guilds()
+            await interaction.followup.send(
                 f"✅ Module `{module}` reloaded successfully!", ephemeral=True
             )
-        except Exception as e:
-            logger.error(f"Failed to reload module {module}: {str(e)}")
-            await interaction.response.send_message(
-                f"❌ Failed to reload module: {str(e)}", ephemeral=True
+        else:
+            await interaction.followup.send(
+                f"❌ Failed to reload module `{module}`, check the logs.",
+                ephemeral=True,
             )
 
     @app_commands.command(name="shutdown")
@@ -44,7 +59,10 @@ class SystemCog(commands.Cog, name="System"):
             return
 
         await interaction.response.send_message("Shutting down...", ephemeral=True)
-        await self.bot.close()
+        if self.bot.cluster is not None:
+            await self.bot.cluster.shutdown_cluster()
+        else:
+            await self.bot.close()
 
 
 async def setup(bot):
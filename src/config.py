@@ -1,71 +1,270 @@
 # src/config.py
 
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
 import logging
 
+# The .env file in use, or where one would be picked up from
+ENV_PATH = find_dotenv() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"
+)
+
+# Values the .env file put into os.environ, and what the process environment
+# held for those keys before (None if unset), so reloads only undo their own
+_env_file_values: Dict[str, str] = {}
+_shadowed_values: Dict[str, Optional[str]] = {}
+
+
+def _apply_env_file(override: bool) -> None:
+    """Load .env into os.environ, tracking exactly the keys the load set"""
+    values = dotenv_values(ENV_PATH) if os.path.exists(ENV_PATH) else {}
+
+    # Keys deleted from .env go back to what the process environment had
+    for key in [key for key in _env_file_values if values.get(key) is None]:
+        del _env_file_values[key]
+        original = _shadowed_values.pop(key)
+        if original is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = original
+
+    for key, value in values.items():
+        if value is None:
+            continue
+        if key not in _env_file_values:
+            original = os.environ.get(key)
+            if original is not None and not override:
+                continue
+            _shadowed_values[key] = original
+        os.environ[key] = value
+        _env_file_values[key] = value
+
+
 # Load environment variables from .env file
-load_dotenv()
+_apply_env_file(override=False)
 
 logger = logging.getLogger(__name__)
 
+# field name -> (old value, new value)
+ConfigChanges = Dict[str, Tuple[Any, Any]]
+
+
+def _flag(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _env(name: str, default: Optional[str] = None, cast: Callable = str):
+    """Field read from the environment whenever its section is built, not just
+    once at import, so Config.reload() picks up changed values"""
+
+    def factory():
+        value = os.getenv(name, default)
+        return value if value is None else cast(value)
+
+    return field(default_factory=factory)
+
+
+def cluster_path(path: str) -> str:
+    """Give each cluster worker its own copy of a file, e.g. logs/bot.cluster2.log"""
+    cluster_id = os.getenv("CLUSTER_ID")
+    if not cluster_id:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.cluster{cluster_id}{extension}"
+
+
+def _ttls(value: str) -> Dict[str, float]:
+    """Parse "permissions=30,users=600" into {"permissions": 30.0, "users": 600.0}"""
+    ttls = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, ttl = item.split("=", 1)
+            ttls[name.strip()] = float(ttl)
+    return ttls
+
 
 @dataclass
 class DatabaseConfig:
     url: str = "sqlite+aiosqlite:///./data/database.sqlite"
-    echo: bool = os.getenv("DATABASE_ECHO", "false").lower() == "true"
+    echo: bool = _env("DATABASE_ECHO", "false", _flag)
+
+    # SQLite performance profile (WAL, relaxed sync, one writer + reader pool)
+    sqlite_tuned: bool = _env("DATABASE_SQLITE_TUNED", "true", _flag)
+    sqlite_cache_size_kb: int = _env("DATABASE_SQLITE_CACHE_KB", "65536", int)
+    sqlite_mmap_size: int = _env("DATABASE_SQLITE_MMAP_SIZE", "268435456", int)
+    sqlite_busy_timeout_ms: int = _env("DATABASE_SQLITE_BUSY_TIMEOUT_MS", "5000", int)
+    sqlite_reader_pool_size: int = _env("DATABASE_SQLITE_READERS", "4", int)
+    # Extra writer connections; they queue on busy_timeout for the write lock
+    # instead of failing pool checkout while one transaction holds it
+    sqlite_writer_overflow: int = _env("DATABASE_SQLITE_WRITER_OVERFLOW", "4", int)
+
+    # Connection pool (only used for PostgreSQL/MySQL)
+    pool_size: int = _env("DATABASE_POOL_SIZE", "5", int)
+    max_overflow: int = _env("DATABASE_MAX_OVERFLOW", "10", int)
+    pool_timeout: int = _env("DATABASE_POOL_TIMEOUT", "30", int)
+
+    # Query instrumentation
+    slow_query_ms: float = _env("DATABASE_SLOW_QUERY_MS", "100", float)
+    n_plus_one_threshold: int = _env("DATABASE_N_PLUS_ONE_THRESHOLD", "10", int)
+
+    # Per-table repository cache TTL overrides, e.g. "permissions=30,users=600"
+    cache_ttls: Dict[str, float] = _env("DATABASE_CACHE_TTLS", "", _ttls)
 
     # Optional pooling settings (only used for PostgreSQL/MySQL)
     @property
     def pooling_settings(self) -> dict:
         if not self.url.startswith("sqlite"):
             return {
-                "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
-                "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
-                "pool_timeout": int(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "pool_timeout": self.pool_timeout,
             }
         return {}
 
+    @property
+    def sqlite_pragmas(self) -> dict:
+        """PRAGMA values applied to every connection of the tuned SQLite profile"""
+        return {
+            # Must come first: only takes effect before the file is initialised
+            # (or after a VACUUM); lets transcript retention free pages
+            "auto_vacuum": "INCREMENTAL",
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -self.sqlite_cache_size_kb,
+            "mmap_size": self.sqlite_mmap_size,
+            "busy_timeout": self.sqlite_busy_timeout_ms,
+            "temp_store": "MEMORY",
+        }
+
 
 @dataclass
 class RedisConfig:
-    enabled: bool = os.getenv("REDIS_ENABLED", "false").lower() == "true"
-    host: str = os.getenv("REDIS_HOST", "localhost")
-    port: int = int(os.getenv("REDIS_PORT", "6379"))
-    password: Optional[str] = os.getenv("REDIS_PASSWORD")
-    db: int = int(os.getenv("REDIS_DB", "0"))
-    ttl: int = int(os.getenv("REDIS_TTL", "3600"))
+    enabled: bool = _env("REDIS_ENABLED", "false", _flag)
+    host: str = _env("REDIS_HOST", "localhost")
+    port: int = _env("REDIS_PORT", "6379", int)
+    password: Optional[str] = _env("REDIS_PASSWORD")
+    db: int = _env("REDIS_DB", "0", int)
+    ttl: int = _env("REDIS_TTL", "3600", int)
 
 
 @dataclass
 class DiscordConfig:
-    token: str = os.getenv("DISCORD_TOKEN", "")
-    owner_id: int = int(os.getenv("DISCORD_OWNER_ID", "0"))
-    command_prefix: str = os.getenv("DISCORD_COMMAND_PREFIX", "!")
-    guild_ids: list[int] = field(
-        default_factory=lambda: [
-            int(id) for id in os.getenv("DISCORD_GUILD_IDS", "").split(",") if id
-        ]
+    token: str = _env("DISCORD_TOKEN", "")
+    owner_id: int = _env("DISCORD_OWNER_ID", "0", int)
+    command_prefix: str = _env("DISCORD_COMMAND_PREFIX", "!")
+    guild_ids: list[int] = _env(
+        "DISCORD_GUILD_IDS", "", lambda ids: [int(id) for id in ids.split(",") if id]
     )
-    status: str = os.getenv("DISCORD_STATUS", "online")
-    activity: str = os.getenv("DISCORD_ACTIVITY", "")
+    status: str = _env("DISCORD_STATUS", "online")
+    activity: str = _env("DISCORD_ACTIVITY", "")
+    # REST API root; point it at a fake gateway to test without Discord
+    api_base: str = _env("DISCORD_API_BASE", "https://discord.com/api/v10")
 
 
 @dataclass
 class LoggingConfig:
-    level: str = os.getenv("LOG_LEVEL", "INFO")
-    format: str = os.getenv(
+    level: str = _env("LOG_LEVEL", "INFO")
+    format: str = _env(
         "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
-    directory: str = os.getenv("LOG_DIR", "logs")
-    file_name: str = os.getenv("LOG_FILE", "bot.log")
+    directory: str = _env("LOG_DIR", "logs")
+    file_name: str = _env("LOG_FILE", "bot.log")
+    # Rotation of the JSON lines log file
+    max_bytes: int = _env("LOG_MAX_BYTES", str(10 * 1024 * 1024), int)
+    backup_count: int = _env("LOG_BACKUP_COUNT", "5", int)
+    # Per call site: at most `burst` records per `interval` seconds at or
+    # above `rate_limit_level`; the rest are counted and reported later
+    rate_limit_burst: int = _env("LOG_RATE_LIMIT_BURST", "10", int)
+    rate_limit_interval: float = _env("LOG_RATE_LIMIT_INTERVAL", "60", float)
+    rate_limit_level: str = _env("LOG_RATE_LIMIT_LEVEL", "WARNING")
+    # Fraction of DEBUG records kept, so verbose tracing stays cheap
+    debug_sample_rate: float = _env("LOG_DEBUG_SAMPLE_RATE", "1.0", float)
+
+
+@dataclass
+class LLMConfig:
+    # Per-user and per-guild request token buckets (burst size, refill rate)
+    user_burst: int = _env("LLM_USER_BURST", "5", int)
+    user_requests_per_minute: float = _env("LLM_USER_REQUESTS_PER_MINUTE", "6", float)
+    guild_burst: int = _env("LLM_GUILD_BURST", "30", int)
+    guild_requests_per_minute: float = _env(
+        "LLM_GUILD_REQUESTS_PER_MINUTE", "120", float
+    )
+    # Per-user provider token budget, debited with actual usage after each reply
+    user_tokens_per_minute: int = _env("LLM_USER_TOKENS_PER_MINUTE", "20000", int)
+    # How long resolved daily limits are reused before re-reading permissions
+    limits_ttl: int = _env("LLM_LIMITS_TTL", "60", int)
+    # Days of conversation transcripts to keep
+    transcript_retention_days: int = _env("LLM_TRANSCRIPT_RETENTION_DAYS", "30", int)
+
+
+@dataclass
+class FeatureConfig:
+    # Cached static index of the cog modules, so discovery imports nothing
+    manifest_path: str = _env("FEATURES_MANIFEST", "data/feature_manifest.json")
+    # Load cogs without __cog_critical__ = True only once the gateway is ready
+    defer_noncritical: bool = _env("FEATURES_DEFER_NONCRITICAL", "false", _flag)
+    # Dev/ops mode: reload edited cogs in place and resync their commands
+    hot_reload: bool = _env("FEATURES_HOT_RELOAD", "false", _flag)
+    hot_reload_debounce: float = _env("FEATURES_HOT_RELOAD_DEBOUNCE", "0.5", float)
+
+
+@dataclass
+class MetricsConfig:
+    # Prometheus text endpoint at http://host:port/metrics; local only by default
+    enabled: bool = _env("METRICS_ENABLED", "true", _flag)
+    host: str = _env("METRICS_HOST", "127.0.0.1")
+    port: int = _env("METRICS_PORT", "9108", int)
+    # Event loop lag sampling, and the stall length that logs the blocking stack;
+    # the interval is capped at a fifth of the stall length
+    loop_monitor: bool = _env("METRICS_LOOP_MONITOR", "true", _flag)
+    loop_lag_interval: float = _env("METRICS_LOOP_LAG_INTERVAL", "0.05", float)
+    loop_blocking_ms: float = _env("METRICS_LOOP_BLOCKING_MS", "250", float)
+
+
+@dataclass
+class TracingConfig:
+    enabled: bool = _env("TRACING_ENABLED", "true", _flag)
+    # OTLP/JSON lines file the kept traces are appended to
+    path: str = _env("TRACING_PATH", "logs/traces.jsonl")
+    service_name: str = _env("TRACING_SERVICE_NAME", "discord-bot")
+    # Traces at least this slow (or that failed) are always kept...
+    slow_ms: float = _env("TRACING_SLOW_MS", "1000", float)
+    # ...and this fraction of the rest
+    sample_rate: float = _env("TRACING_SAMPLE_RATE", "0.01", float)
+
+
+@dataclass
+class ClusterConfig:
+    # Worker processes, each running an AutoShardedBot; 1 runs a plain Bot
+    clusters: int = _env("CLUSTER_COUNT", "1", int)
+    # Total shards across the cluster; 0 uses Discord's recommendation
+    shard_count: int = _env("SHARD_COUNT", "0", int)
+    # Launcher's local IPC endpoint
+    ipc_host: str = _env("CLUSTER_IPC_HOST", "127.0.0.1")
+    ipc_port: int = _env("CLUSTER_IPC_PORT", "9200", int)
+    # Set by the launcher in each worker process
+    cluster_id: Optional[int] = _env("CLUSTER_ID", None, int)
 
 
 class Config:
     _instance = None
 
+    # Attribute name -> section class
+    sections = {
+        "database": DatabaseConfig,
+        "redis": RedisConfig,
+        "discord": DiscordConfig,
+        "logging": LoggingConfig,
+        "llm": LLMConfig,
+        "features": FeatureConfig,
+        "metrics": MetricsConfig,
+        "tracing": TracingConfig,
+        "cluster": ClusterConfig,
+    }
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Config, cls).__new__(cls)
@@ -73,15 +272,16 @@ class Config:
         return cls._instance
 
     def _initialize(self):
+        self._subscribers: Dict[str, List[Callable[[ConfigChanges], None]]] = {}
         # Force reload environment variables
-        load_dotenv(override=True)
+        _apply_env_file(override=True)
 
         # Initialize configuration sections
-        self.database = DatabaseConfig()
-        self.redis = RedisConfig()
-        self.discord = DiscordConfig()
-        self.logging = LoggingConfig()
+        for name, section in self.sections.items():
+            setattr(self, name, section())
+        self._load_keys()
 
+    def _load_keys(self):
         # API Keys
         self.xai_api_key = os.getenv("XAI_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -95,10 +295,53 @@ class Config:
         self.supabase_password = os.getenv("SUPABASE_PASSWORD")
         self.supabase_service_role = os.getenv("SUPABASE_SERVICE_ROLE_SECRET")
 
-    def reload(self):
-        """Force reload of all configuration values"""
-        self._initialize()
+    def subscribe(self, section: str, callback: Callable[[ConfigChanges], None]):
+        """Call `callback(changes)` whenever a reload changes fields of `section`"""
+        if section not in self.sections:
+            raise ValueError(f"Unknown config section: {section}")
+        self._subscribers.setdefault(section, []).append(callback)
+
+    def unsubscribe(self, section: str, callback: Callable[[ConfigChanges], None]):
+        if callback in self._subscribers.get(section, []):
+            self._subscribers[section].remove(callback)
+
+    def reload(self) -> Dict[str, ConfigChanges]:
+        """
+        Re-read .env and the environment, update the existing section objects in
+        place (so components holding them see new values) and notify the
+        subscribers of every section that changed. Returns the changes.
+        """
+        # Variables deleted from .env are unset, or restored to the value the
+        # process environment gave them
+        _apply_env_file(override=True)
+
+        changed: Dict[str, ConfigChanges] = {}
+        for name, section_class in self.sections.items():
+            current = getattr(self, name)
+            fresh = section_class()
+            changes = {
+                f.name: (getattr(current, f.name), getattr(fresh, f.name))
+                for f in fields(section_class)
+                if getattr(current, f.name) != getattr(fresh, f.name)
+            }
+            if changes:
+                for key, (_, new) in changes.items():
+                    setattr(current, key, new)
+                changed[name] = changes
+        self._load_keys()
+
+        for name, changes in changed.items():
+            logger.info(
+                "Configuration section %s changed: %s", name, ", ".join(changes)
+            )
+            for callback in list(self._subscribers.get(name, [])):
+                try:
+                    callback(changes)
+                except Exception as e:
+                    logger.error("Failed to apply %s config change: %s", name, e)
+
         logger.info("Configuration reloaded")
+        return changed
 
     def validate(self) -> bool:
         """Validate critical configuration values"""
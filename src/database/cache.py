@@ -0,0 +1,178 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Cache keys are ((field, ...), (value, ...)) for one of the registered lookups
+CacheKey = Tuple[Tuple[str, ...], Tuple[Any, ...]]
+
+_MISSING = object()
+
+
+class RepositoryCache:
+    """
+    Read-through identity cache for one model: TTL-bounded, LRU-evicted, with
+    negative entries for lookups that found nothing. A cached row is stored
+    under every registered lookup so a write to any of its keys drops all of
+    them.
+    """
+
+    def __init__(
+        self,
+        lookups: Iterable[Tuple[str, ...]],
+        ttl: float,
+        max_size: int = 1024,
+        negative: bool = True,
+    ):
+        self.lookups = {("id",), *(tuple(sorted(fields)) for fields in lookups)}
+        self.ttl = ttl
+        self.default_ttl = ttl
+        self.max_size = max_size
+        self.negative = negative
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._keys_by_id: Dict[Any, set] = {}
+        self._id_by_key: Dict[CacheKey, Any] = {}
+        # Bumped by every invalidation; a read that started before a write
+        # committed must not store what it loaded (see set())
+        self.generation = 0
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def make_key(self, filters: dict) -> Optional[CacheKey]:
+        """Return the cache key for a lookup, or None if it is not cacheable"""
+        fields = tuple(sorted(filters))
+        if fields not in self.lookups:
+            return None
+        return fields, tuple(filters[field] for field in fields)
+
+    def get(self, key: CacheKey) -> Tuple[bool, Any]:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._discard(key)
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, value
+
+    def set(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> None:
+        """Store a loaded row; pass the generation read before the query so a
+        row loaded before a concurrent write committed is dropped"""
+        if generation is not None and generation != self.generation:
+            return
+        if value is None:
+            if self.negative:
+                self._store(key, None)
+            return
+
+        # Store the row under every lookup it can be found by
+        for fields in self.lookups:
+            alias = (fields, tuple(getattr(value, field) for field in fields))
+            self._store(alias, value)
+            self._keys_by_id.setdefault(value.id, set()).add(alias)
+            self._id_by_key[alias] = value.id
+
+    def invalidate(self, values: dict, id: Any = None) -> None:
+        """Drop entries affected by a write of `values` (and row `id` if known)"""
+        self.invalidations += 1
+        self.generation += 1
+        ids = {id} if id is not None else set()
+        for fields in self.lookups:
+            if all(field in values for field in fields):
+                key = (fields, tuple(values[field] for field in fields))
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None:
+                    ids.add(entry[1].id)
+                self._discard(key)
+
+        for row_id in ids:
+            for key in self._keys_by_id.pop(row_id, ()):
+                self._entries.pop(key, None)
+                self._id_by_key.pop(key, None)
+
+    def clear(self) -> None:
+        self.invalidations += 1
+        self.generation += 1
+        self._entries.clear()
+        self._keys_by_id.clear()
+        self._id_by_key.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            old_key, _ = self._entries.popitem(last=False)
+            self._forget(old_key)
+            self.evictions += 1
+
+    def _discard(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: CacheKey) -> None:
+        # Keep the id <-> keys index in step with evictions
+        row_id = self._id_by_key.pop(key, None)
+        if row_id is None:
+            return
+        keys = self._keys_by_id.get(row_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[row_id]
+
+
+# One cache per model, shared by every repository instance for that model
+_caches: Dict[type, RepositoryCache] = {}
+# Configured TTLs by table name, overriding the repositories' cache_ttl
+_ttl_overrides: Dict[str, float] = {}
+
+
+def get_model_cache(model: type, **settings) -> RepositoryCache:
+    if model not in _caches:
+        cache = RepositoryCache(**settings)
+        cache.default_ttl = cache.ttl
+        cache.ttl = _ttl_overrides.get(model.__tablename__, cache.ttl)
+        _caches[model] = cache
+    return _caches[model]
+
+
+def set_ttl_overrides(ttls: Dict[str, float]) -> None:
+    """Apply per-table TTLs to existing and future caches; unlisted tables
+    fall back to their repository's cache_ttl"""
+    _ttl_overrides.clear()
+    _ttl_overrides.update(ttls)
+    for model, cache in _caches.items():
+        cache.ttl = ttls.get(model.__tablename__, cache.default_ttl)
+
+
+def get_cache_stats() -> Dict[str, dict]:
+    """Hit-rate stats for every model cache, keyed by table name"""
+    return {model.__tablename__: cache.stats() for model, cache in _caches.items()}
@@ -0,0 +1,182 @@
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.utils.logger import lazy, logger
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*(?:\?|%s|:\w+|\$\d+)\s*,)+\s*(?:\?|%s|:\w+|\$\d+)\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so near-identical queries group together"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERALS.sub("?", statement)
+    statement = _PLACEHOLDER_LISTS.sub("(?, ...)", statement)
+    return statement[:500]
+
+
+def redact(parameters) -> str:
+    """Describe bound parameters by type only, never by value"""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in parameters.items()
+        ) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"<{len(parameters)} parameter sets>"
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "<redacted>"
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip([*LATENCY_BUCKETS_MS, "inf"], self.counts)),
+        }
+
+
+class QueryStats:
+    """Per-statement latency histograms plus an all-statements histogram"""
+
+    # Distinct statements tracked before new ones are folded into "other"
+    max_statements = 1000
+
+    def __init__(self):
+        self.overall = LatencyHistogram()
+        self.statements: Dict[str, LatencyHistogram] = {}
+        self.slow_queries = 0
+
+    def observe(self, statement: str, elapsed_ms: float) -> None:
+        self.overall.observe(elapsed_ms)
+        histogram = self.statements.get(statement)
+        if histogram is None:
+            if len(self.statements) >= self.max_statements:
+                statement = "other"
+                histogram = self.statements.get(statement)
+            if histogram is None:
+                histogram = self.statements[statement] = LatencyHistogram()
+        histogram.observe(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "overall": self.overall.to_dict(),
+            "slow_queries": self.slow_queries,
+            "statements": {
+                statement: histogram.to_dict()
+                for statement, histogram in self.statements.items()
+            },
+        }
+
+
+class RequestQueries:
+    """Query counts for one logical operation, used to spot N+1 patterns"""
+
+    __slots__ = ("name", "total", "by_statement")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.total = 0
+        self.by_statement: Dict[str, int] = {}
+
+    def record(self, statement: str) -> None:
+        self.total += 1
+        self.by_statement[statement] = self.by_statement.get(statement, 0) + 1
+
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar(
+    "request_queries", default=None
+)
+
+query_stats = QueryStats()
+
+
+@contextmanager
+def track_queries(name: str, repeat_threshold: int = 10):
+    """
+    Count the queries issued inside the block and warn when one statement
+    repeats repeat_threshold or more times (a likely N+1 loop).
+    """
+    if _request_queries.get() is not None:
+        # Already inside a tracked operation; count against the outer one
+        yield _request_queries.get()
+        return
+
+    queries = RequestQueries(name)
+    token = _request_queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _request_queries.reset(token)
+        for statement, count in queries.by_statement.items():
+            if count >= repeat_threshold:
+                logger.warning(
+                    "Possible N+1 in %s: %d near-identical queries (%d total): %.200s",
+                    name,
+                    count,
+                    queries.total,
+                    statement,
+                )
+
+
+def instrument_engine(
+    engine: AsyncEngine, stats: QueryStats = query_stats, slow_query_ms: float = 100
+) -> None:
+    """Time every statement on the engine and log slow ones with redacted params"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        normalized = fingerprint(statement)
+        stats.observe(normalized, elapsed_ms)
+
+        queries = _request_queries.get()
+        if queries is not None:
+            queries.record(normalized)
+
+        if elapsed_ms >= slow_query_ms:
+            stats.slow_queries += 1
+            logger.warning(
+                "Slow query (%.1f ms): %s params=%s",
+                elapsed_ms,
+                normalized,
+                lazy(redact, parameters),
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # Keep the timing stack balanced when a statement fails
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
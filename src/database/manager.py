@@ -5,15 +5,116 @@ from sqlalchemy.exc import SQLAlchemyError
 from src.config import Config
 from src.utils.logger import logger
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+import asyncio
 from src.database.migrations import MigrationManager
 from sqlalchemy.sql import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from src.database.sqlite_profile import apply_pragmas, is_file_sqlite, RoutingSession
+from src.database.instrumentation import instrument_engine, query_stats, track_queries
+from src.database.cache import set_ttl_overrides
 
 Base = declarative_base()
 
 
+@dataclass
+class _UnitOfWork:
+    session: AsyncSession
+    task: Optional[asyncio.Task]
+    # Callbacks to run once the transaction has committed
+    after_commit: List[Callable[[], None]] = field(default_factory=list)
+
+    @property
+    def has_writes(self) -> bool:
+        return bool(self.after_commit)
+
+
+# Unit of work for the current interaction or message, if one is active
+_current_unit_of_work: ContextVar[Optional[_UnitOfWork]] = ContextVar(
+    "current_unit_of_work", default=None
+)
+
+
+def _active_unit_of_work() -> Optional[_UnitOfWork]:
+    """
+    Return the unit of work the caller should join. Tasks spawned from inside a
+    unit of work inherit the contextvar but must not share its session, so only
+    the task that opened it joins.
+    """
+    unit_of_work = _current_unit_of_work.get()
+    if unit_of_work is None or unit_of_work.task is not asyncio.current_task():
+        return None
+    return unit_of_work
+
+
+def create_engines(database_config, echo: bool = False):
+    """
+    Create the engine(s) and session factory for the configured database.
+    Returns (engine, read_engine, session_factory); read_engine is the same as
+    engine unless the tuned SQLite profile splits reads from writes.
+    """
+    if database_config.sqlite_tuned and is_file_sqlite(database_config.url):
+        pragmas = database_config.sqlite_pragmas
+
+        # SQLite allows one writer at a time. Extra writer connections don't
+        # write in parallel: they wait up to busy_timeout for the write lock,
+        # so a background write queues behind an open unit of work rather
+        # than failing pool checkout. WAL lets the reader pool run alongside.
+        engine = create_async_engine(
+            database_config.url,
+            echo=echo,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=database_config.sqlite_writer_overflow,
+            pool_timeout=database_config.pool_timeout,
+        )
+        read_engine = create_async_engine(
+            database_config.url,
+            echo=echo,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=database_config.sqlite_reader_pool_size,
+            max_overflow=0,
+        )
+        apply_pragmas(engine, pragmas)
+        apply_pragmas(read_engine, pragmas, readonly=True)
+
+        session_factory = sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=RoutingSession,
+            expire_on_commit=False,
+            info={"writer": engine.sync_engine, "reader": read_engine.sync_engine},
+        )
+        return engine, read_engine, session_factory
+
+    engine = create_async_engine(
+        database_config.url, echo=echo, **database_config.pooling_settings
+    )
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    return engine, engine, session_factory
+
+
 class DatabaseManager:
     _instance = None
 
+    # DatabaseConfig fields baked into the engines; changing any rebuilds them
+    engine_settings = {
+        "echo",
+        "sqlite_tuned",
+        "sqlite_cache_size_kb",
+        "sqlite_mmap_size",
+        "sqlite_busy_timeout_ms",
+        "sqlite_reader_pool_size",
+        "sqlite_writer_overflow",
+        "pool_size",
+        "max_overflow",
+        "pool_timeout",
+        "slow_query_ms",
+    }
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
@@ -22,31 +123,123 @@ class DatabaseManager:
 
     def _initialize(self):
         config = Config()
-        engine_settings = {
-            "echo": config.database.echo,
-            **config.database.pooling_settings,
-        }
-
-        self.engine = create_async_engine(config.database.url, **engine_settings)
-        self.SessionLocal = sessionmaker(
-            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        self.engine, self.read_engine, self.SessionLocal = create_engines(
+            config.database, echo=config.database.echo
         )
+        self.config = config.database
+        self.query_stats = query_stats
+        for engine in {self.engine, self.read_engine}:
+            instrument_engine(engine, self.query_stats, config.database.slow_query_ms)
         self.migrations = MigrationManager(self.engine)
+        self._disposals = set()
+        set_ttl_overrides(config.database.cache_ttls)
+        config.subscribe("database", self._apply_config)
+
+    def _apply_config(self, changes):
+        """Apply a reloaded DatabaseConfig without dropping in-flight work"""
+        if "cache_ttls" in changes:
+            set_ttl_overrides(self.config.cache_ttls)
+        if changes.keys() & self.engine_settings:
+            self._swap_engines()
+
+    def _swap_engines(self):
+        old_engines = {self.engine, self.read_engine}
+        self.engine, self.read_engine, self.SessionLocal = create_engines(
+            self.config, echo=self.config.echo
+        )
+        for engine in {self.engine, self.read_engine}:
+            instrument_engine(engine, self.query_stats, self.config.slow_query_ms)
+        self.migrations.engine = self.engine
+        logger.info("Database engines rebuilt with the new settings")
+
+        # Sessions already open keep their connections; the old pools only
+        # have their idle connections closed
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for engine in old_engines:
+            task = loop.create_task(engine.dispose())
+            self._disposals.add(task)
+            task.add_done_callback(self._disposals.discard)
+
+    @asynccontextmanager
+    async def unit_of_work(self):
+        """
+        Share one session and transaction across every repository call made in
+        this block, committing once at the end. Nested calls join the outer one.
+        """
+        unit_of_work = _active_unit_of_work()
+        if unit_of_work:
+            yield unit_of_work.session
+            return
+
+        session = self.SessionLocal()
+        unit_of_work = _UnitOfWork(session=session, task=asyncio.current_task())
+        token = _current_unit_of_work.set(unit_of_work)
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            if isinstance(e, SQLAlchemyError):
+                logger.error("Database error: %s", e)
+            raise
+        finally:
+            _current_unit_of_work.reset(token)
+            await session.close()
+
+        for callback in unit_of_work.after_commit:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run callback once the caller's writes are committed: at the end of the
+        active unit of work, or right away when there is none (get_session has
+        already committed by the time a repository calls this).
+        """
+        unit_of_work = _active_unit_of_work()
+        if unit_of_work:
+            unit_of_work.after_commit.append(callback)
+        else:
+            callback()
+
+    def has_pending_writes(self) -> bool:
+        """Whether the active unit of work has written anything not yet committed"""
+        unit_of_work = _active_unit_of_work()
+        return unit_of_work is not None and unit_of_work.has_writes
+
+    @asynccontextmanager
+    async def savepoint(self):
+        """Run a block in a nested transaction that can roll back on its own"""
+        async with self.unit_of_work() as session:
+            async with session.begin_nested():
+                yield session
 
     @asynccontextmanager
     async def get_session(self):
         """Provide a transactional scope around a series of operations"""
+        unit_of_work = _active_unit_of_work()
+        if unit_of_work:
+            # The enclosing unit of work owns the commit
+            yield unit_of_work.session
+            return
+
         session = self.SessionLocal()
         try:
             yield session
             await session.commit()
         except SQLAlchemyError as e:
             await session.rollback()
-            logger.error(f"Database error: {str(e)}")
+            logger.error("Database error: %s", e)
             raise
         finally:
             await session.close()
 
+    def track_queries(self, name: str):
+        """Count queries for one interaction or message and flag N+1 patterns"""
+        return track_queries(name, self.config.n_plus_one_threshold)
+
     async def verify_database_exists(self):
         """Verify database connection and tables exist"""
         try:
@@ -55,5 +248,5 @@ class DatabaseManager:
                 await conn.run_sync(lambda sync_conn: Base.metadata.tables)
             logger.info("Database verification completed successfully")
         except Exception as e:
-            logger.error(f"Database verification failed: {e}")
+            logger.error("Database verification failed: %s", e)
             raise
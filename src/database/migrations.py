@@ -31,7 +31,7 @@ class MigrationManager:
 
             return await asyncio.to_thread(get_revision)
         except Exception as e:
-            logger.error(f"Failed to get current revision: {e}")
+            logger.error("Failed to get current revision: %s", e)
             return None
 
     async def get_pending_migrations(self) -> List[str]:
@@ -54,12 +54,12 @@ class MigrationManager:
 
             return await asyncio.to_thread(get_pending)
         except Exception as e:
-            logger.error(f"Failed to get pending migrations: {e}")
+            logger.error("Failed to get pending migrations: %s", e)
             return []
 
     async def create_migration(self, message: str, autogenerate: bool = True) -> None:
         """Create a new migration"""
-        logger.info(f"Starting migration creation: {message}")
+        logger.info("Starting migration creation: %s", message)
         try:
             await asyncio.to_thread(
                 command.revision,
@@ -67,33 +67,33 @@ class MigrationManager:
                 message=message,
                 autogenerate=autogenerate,
             )
-            logger.info(f"Migration created successfully: {message}")
+            logger.info("Migration created successfully: %s", message)
         except Exception as e:
-            logger.error(f"Failed to create migration: {e}")
+            logger.error("Failed to create migration: %s", e)
             raise
 
     async def upgrade(self, revision: str = "head") -> None:
         """Upgrade database to a later version"""
-        logger.info(f"Starting upgrade to revision: {revision}")
+        logger.info("Starting upgrade to revision: %s", revision)
         try:
             await asyncio.to_thread(command.upgrade, self.alembic_cfg, revision)
-            logger.info(f"Upgrade completed successfully to: {revision}")
+            logger.info("Upgrade completed successfully to: %s", revision)
         except Exception as e:
-            logger.error(f"Failed to upgrade: {e}")
+            logger.error("Failed to upgrade: %s", e)
             raise
 
     async def downgrade(self, revision: str) -> None:
         """Downgrade database to a previous version"""
-        logger.info(f"Starting downgrade to revision: {revision}")
+        logger.info("Starting downgrade to revision: %s", revision)
         try:
             await asyncio.to_thread(command.downgrade, self.alembic_cfg, revision)
-            logger.info(f"Downgrade completed successfully to: {revision}")
+            logger.info("Downgrade completed successfully to: %s", revision)
         except Exception as e:
-            logger.error(f"Failed to downgrade: {e}")
+            logger.error("Failed to downgrade: %s", e)
             raise
 
     async def stamp(self, revision: str) -> None:
         """Stamp the database with a specific revision without running migrations"""
-        logger.info(f"Starting stamp to revision: {revision}")
+        logger.info("Starting stamp to revision: %s", revision)
         await asyncio.to_thread(command.stamp, self.alembic_cfg, revision)
-        logger.info(f"Stamped database revision to: {revision}")
+        logger.info("Stamped database revision to: %s", revision)
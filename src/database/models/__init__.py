@@ -14,6 +14,18 @@ class BaseModel(Base):
 # After BaseModel is defined, then import the models
 from .command_hash import CommandHash
 from .permission import Permission
+from .setting import GuildSetting, SettingsVersion
+from .transcript import Transcript
+from .usage import UsageCounter
 from .user import User
 
-__all__ = ["BaseModel", "CommandHash", "Permission", "User"]
+__all__ = [
+    "BaseModel",
+    "CommandHash",
+    "GuildSetting",
+    "Permission",
+    "SettingsVersion",
+    "Transcript",
+    "UsageCounter",
+    "User",
+]
@@ -1,10 +1,11 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, Index, JSON
 from src.database.models import BaseModel
 
 
 class CommandHash(BaseModel):
     __tablename__ = "command_hashes"
+    __table_args__ = (Index("ix_command_hashes_guild_id", "guild_id", unique=True),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -14,6 +15,5 @@ class CommandHash(BaseModel):
         String(20), nullable=False
     )  # Using String for guild_id to support 'global'
     command_hash = Column(String(64), nullable=False)  # SHA-256 hash is 64 characters
-
-    class Config:
-        unique_together = (("guild_id", "command_hash"),)
+    # Per-command hashes keyed by command name; command_hash is their Merkle root
+    command_hashes = Column(JSON)
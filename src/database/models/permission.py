@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BigInteger, Boolean, Integer, Enum
+from sqlalchemy import Column, String, BigInteger, Boolean, Integer, Enum, Index
 from src.database.models import BaseModel
 import enum
 
@@ -10,6 +10,11 @@ class PermissionType(enum.Enum):
 
 class Permission(BaseModel):
     __tablename__ = "permissions"
+    __table_args__ = (
+        Index(
+            "ix_permissions_target", "target_type", "target_id", "guild_id", unique=True
+        ),
+    )
 
     target_type = Column(String(10), nullable=False)
     target_id = Column(BigInteger, nullable=False)
@@ -23,6 +28,4 @@ class Permission(BaseModel):
     moderation_perms = Column(Boolean, default=None)
 
     max_requests_per_day = Column(Integer, default=None)
-
-    class Config:
-        unique_together = (("target_type", "target_id", "guild_id"),)
+    max_tokens_per_day = Column(Integer, default=None)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, BigInteger, Boolean, Integer, String, Index
+from src.database.models import BaseModel
+
+
+class GuildSetting(BaseModel):
+    __tablename__ = "guild_settings"
+    __table_args__ = (
+        Index("ix_guild_settings_key", "guild_id", "key", unique=True),
+        Index("ix_guild_settings_version", "version"),
+    )
+
+    guild_id = Column(BigInteger, nullable=False)  # 0 for bot-wide settings
+    key = Column(String(64), nullable=False)
+    enabled = Column(Boolean, nullable=False)
+    # Value of SettingsVersion.version when this row was last written
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SettingsVersion(BaseModel):
+    """Single-row counter bumped by every settings write"""
+
+    __tablename__ = "settings_versions"
+
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,72 @@
+import zlib
+from sqlalchemy import Column, BigInteger, Integer, String, LargeBinary, Index
+from sqlalchemy import DDL, event, table, column
+from src.database.models import BaseModel
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+class Transcript(BaseModel):
+    __tablename__ = "transcripts"
+    __table_args__ = (
+        Index("ix_transcripts_created_at", "created_at"),
+        Index("ix_transcripts_guild_created", "guild_id", "created_at"),
+    )
+
+    guild_id = Column(BigInteger, nullable=True)  # None for direct messages
+    channel_id = Column(BigInteger, nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    message_id = Column(BigInteger, nullable=False)
+
+    model = Column(String(100), nullable=False)
+    latency_ms = Column(Integer, nullable=False)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+
+    # zlib-compressed UTF-8 message bodies
+    prompt = Column(LargeBinary, nullable=False)
+    response = Column(LargeBinary, nullable=False)
+
+    @property
+    def prompt_text(self) -> str:
+        return decompress_text(self.prompt)
+
+    @property
+    def response_text(self) -> str:
+        return decompress_text(self.response)
+
+
+# Contentless FTS5 index over the transcript bodies (SQLite only). It stores
+# just the index, since the bodies are compressed; rowid is Transcript.id.
+FTS_TABLE_NAME = "transcripts_fts"
+FTS_CREATE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5("
+    "prompt, response, content='', tokenize='unicode61 remove_diacritics 2')"
+)
+
+transcripts_fts = table(
+    FTS_TABLE_NAME,
+    column("rowid"),
+    column("prompt"),
+    column("response"),
+    # Writing 'delete' to the column named after the table removes an entry
+    column(FTS_TABLE_NAME),
+)
+
+event.listen(
+    Transcript.__table__,
+    "after_create",
+    DDL(FTS_CREATE_DDL).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Transcript.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE_NAME}").execute_if(dialect="sqlite"),
+)
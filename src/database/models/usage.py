@@ -0,0 +1,16 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, Index
+from src.database.models import BaseModel
+
+
+class UsageCounter(BaseModel):
+    __tablename__ = "usage_counters"
+    __table_args__ = (
+        Index("ix_usage_counters_key", "guild_id", "user_id", "day", unique=True),
+    )
+
+    guild_id = Column(BigInteger, nullable=False)  # 0 for direct messages
+    user_id = Column(BigInteger, nullable=False)
+    day = Column(Date, nullable=False)
+
+    requests = Column(Integer, nullable=False, default=0)
+    tokens = Column(Integer, nullable=False, default=0)
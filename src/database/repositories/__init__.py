@@ -1,31 +1,221 @@
-from typing import TypeVar, Generic, Type, Optional, List
+import functools
+import inspect
+from datetime import datetime
+from typing import TypeVar, Generic, Type, Optional, List, Iterable, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import and_, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from src.database.manager import DatabaseManager
 from src.database.models import BaseModel
+from src.database.cache import RepositoryCache, get_model_cache
+from src.utils.tracing import current_span, tracer
 
 T = TypeVar("T", bound=BaseModel)
 
+# Dialects with a single-statement INSERT ... ON CONFLICT/DUPLICATE KEY UPDATE
+_NATIVE_UPSERT_DIALECTS = ("sqlite", "postgresql", "mysql", "mariadb")
+
+
+def _batches(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _traced(func):
+    """Record each call of a repository coroutine as a span of the active trace"""
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if current_span() is None:
+            return await func(self, *args, **kwargs)
+        with tracer.span(
+            f"{type(self).__name__}.{func.__name__}",
+            **{"db.table": self.model.__tablename__},
+        ):
+            return await func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _trace_methods(cls) -> None:
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            setattr(cls, name, _traced(attr))
+
 
 class BaseRepository(Generic[T]):
+    # Rows per statement for bulk operations; keeps multi-row VALUES and IN
+    # lists well under SQLite's bound parameter limit
+    batch_size = 500
+
+    # Read-through cache settings; caching is off unless a subclass sets a TTL.
+    # cache_lookups lists the column sets (besides id) that get_by() may cache.
+    cache_ttl: Optional[float] = None
+    cache_max_size: int = 1024
+    cache_negative: bool = True
+    cache_lookups: List[tuple] = []
+
+    # Public coroutines of every repository are traced (see _traced)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _trace_methods(cls)
+
     def __init__(self, model: Type[T]):
         self.model = model
         self.db = DatabaseManager()
+        self.cache: Optional[RepositoryCache] = None
+        if self.cache_ttl:
+            self.cache = get_model_cache(
+                model,
+                lookups=self.cache_lookups,
+                ttl=self.cache_ttl,
+                max_size=self.cache_max_size,
+                negative=self.cache_negative,
+            )
+
+    def _invalidate(self, values: dict, id: Optional[int] = None) -> None:
+        # Called after the write; dropping entries only once it has committed
+        # keeps concurrent readers from re-caching the old row in between
+        if self.cache is not None:
+            cache = self.cache
+            self.db.after_commit(lambda: cache.invalidate(values, id=id))
+
+    def _clear_cache(self) -> None:
+        if self.cache is not None:
+            self.db.after_commit(self.cache.clear)
+
+    @property
+    def _dialect(self):
+        return self.db.engine.dialect
+
+    def _upsert_statement(
+        self,
+        index_elements: List[str],
+        rows: List[dict],
+        update_columns: List[str],
+        increment: bool = False,
+    ):
+        """
+        Build a dialect-specific INSERT ... ON CONFLICT DO UPDATE statement, for
+        one of _NATIVE_UPSERT_DIALECTS. With increment=True the update adds the
+        new values to the stored ones.
+        """
+        table = self.model.__table__
+        dialect = self._dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            module = sqlite if dialect == "sqlite" else postgresql
+            stmt = module.insert(self.model).values(rows)
+            new_values = stmt.excluded
+        else:
+            stmt = mysql.insert(self.model).values(rows)
+            new_values = stmt.inserted
+
+        update_values = {
+            column: (table.c[column] + new_values[column])
+            if increment
+            else new_values[column]
+            for column in update_columns
+        }
+        update_values["updated_at"] = datetime.utcnow()
+
+        if dialect in ("mysql", "mariadb"):
+            return stmt.on_duplicate_key_update(**update_values)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements, set_=update_values
+        )
+
+    async def _upsert_row(
+        self,
+        session: AsyncSession,
+        row: dict,
+        index_elements: List[str],
+        update_columns: List[str],
+        increment: bool = False,
+    ) -> None:
+        """
+        Select-then-insert-or-update fallback for dialects without a native
+        upsert. A row inserted concurrently between the two turns the insert
+        into an update.
+        """
+        table = self.model.__table__
+        key = and_(*(table.c[column] == row[column] for column in index_elements))
+        existing = await session.scalar(
+            select(self.model.id).where(key).with_for_update()
+        )
+        if existing is None:
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(self.model).values(row))
+                return
+            except IntegrityError:
+                pass
+
+        update_values = {
+            column: (table.c[column] + row[column]) if increment else row[column]
+            for column in update_columns
+        }
+        update_values["updated_at"] = datetime.utcnow()
+        await session.execute(
+            update(self.model)
+            .where(key)
+            .values(update_values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def upsert(self, index_elements: List[str], **values) -> None:
+        """Insert a row, or update it in place if its unique key already exists"""
+        await self.bulk_upsert([values], index_elements)
 
     async def create(self, **kwargs) -> T:
         async with self.db.get_session() as session:
-            instance = self.model(**kwargs)
-            session.add(instance)
-            await session.commit()
-            await session.refresh(instance)
-            return instance
+            if self._dialect.insert_returning:
+                instance = await session.scalar(
+                    insert(self.model).values(**kwargs).returning(self.model)
+                )
+            else:
+                instance = self.model(**kwargs)
+                session.add(instance)
+                await session.flush()
+                await session.refresh(instance)
+        self._invalidate(kwargs)
+        return instance
 
     async def get_by_id(self, id: int) -> Optional[T]:
+        return await self.get_by(id=id)
+
+    async def get_by(self, **filters) -> Optional[T]:
+        """Fetch the single row matching the column values, through the cache"""
+        key = self.cache.make_key(filters) if self.cache is not None else None
+        # Uncommitted writes in this unit of work could still roll back, and
+        # their invalidations have not run yet: bypass the cache entirely
+        if key is not None and self.db.has_pending_writes():
+            key = None
+        if key is not None:
+            hit, instance = self.cache.get(key)
+            if hit:
+                return instance
+            generation = self.cache.generation
+
         async with self.db.get_session() as session:
-            result = await session.execute(
-                select(self.model).filter(self.model.id == id)
-            )
-            return result.scalar_one_or_none()
+            result = await session.execute(select(self.model).filter_by(**filters))
+            instance = result.scalar_one_or_none()
+
+        if key is not None:
+            self.cache.set(key, instance, generation=generation)
+        return instance
+
+    async def get_many(self, ids: Iterable[int]) -> List[T]:
+        """Fetch all rows whose id is in ids, one IN query per batch"""
+        ids = list(dict.fromkeys(ids))
+        instances = []
+        async with self.db.get_session() as session:
+            for batch in _batches(ids, self.batch_size):
+                result = await session.execute(
+                    select(self.model).filter(self.model.id.in_(batch))
+                )
+                instances.extend(result.scalars().all())
+        return instances
 
     async def get_all(self) -> List[T]:
         async with self.db.get_session() as session:
@@ -34,25 +224,92 @@ class BaseRepository(Generic[T]):
 
     async def update(self, id: int, **kwargs) -> Optional[T]:
         async with self.db.get_session() as session:
-            result = await session.execute(
-                select(self.model).filter(self.model.id == id)
-            )
-            instance = result.scalar_one_or_none()
-            if instance:
-                for key, value in kwargs.items():
-                    setattr(instance, key, value)
-                await session.commit()
-                await session.refresh(instance)
-            return instance
+            if self._dialect.update_returning:
+                instance = await session.scalar(
+                    update(self.model)
+                    .where(self.model.id == id)
+                    .values(**kwargs)
+                    .returning(self.model)
+                    .execution_options(synchronize_session=False)
+                )
+            else:
+                result = await session.execute(
+                    select(self.model).filter(self.model.id == id)
+                )
+                instance = result.scalar_one_or_none()
+                if instance:
+                    for key, value in kwargs.items():
+                        setattr(instance, key, value)
+                    await session.flush()
+                    await session.refresh(instance)
+        self._invalidate(kwargs, id=id)
+        return instance
 
     async def delete(self, id: int) -> bool:
+        return await self.delete_where(id=id) > 0
+
+    async def delete_where(self, **filters) -> int:
+        """Delete every row matching the given column values; returns the count"""
+        if not filters:
+            raise ValueError("delete_where requires at least one filter")
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(self.model).filter(self.model.id == id)
+                delete(self.model)
+                .filter_by(**filters)
+                .execution_options(synchronize_session=False)
             )
-            instance = result.scalar_one_or_none()
-            if instance:
-                await session.delete(instance)
-                await session.commit()
-                return True
-            return False
+        if tuple(filters) == ("id",):
+            self._invalidate({}, id=filters["id"])
+        else:
+            self._clear_cache()
+        return result.rowcount
+
+    async def bulk_create(self, rows: List[dict]) -> int:
+        """Insert many rows with one executemany per batch"""
+        async with self.db.get_session() as session:
+            for batch in _batches(rows, self.batch_size):
+                await session.execute(insert(self.model), list(batch))
+        for row in rows:
+            self._invalidate(row)
+        return len(rows)
+
+    async def bulk_update(self, rows: List[dict]) -> int:
+        """Update many rows by primary key; every row dict must include "id" """
+        async with self.db.get_session() as session:
+            for batch in _batches(rows, self.batch_size):
+                await session.execute(update(self.model), list(batch))
+        for row in rows:
+            self._invalidate(row, id=row["id"])
+        return len(rows)
+
+    async def bulk_upsert(
+        self, rows: List[dict], index_elements: List[str], increment: bool = False
+    ) -> int:
+        """Insert or update many rows with one multi-row VALUES statement per batch"""
+        if not rows:
+            return 0
+        # One VALUES list and one SET clause serve every row, so they must all
+        # carry the same columns
+        columns = rows[0].keys()
+        if any(row.keys() != columns for row in rows):
+            raise ValueError("bulk_upsert rows must all have the same columns")
+        update_columns = [column for column in rows[0] if column not in index_elements]
+        async with self.db.get_session() as session:
+            if self._dialect.name not in _NATIVE_UPSERT_DIALECTS:
+                for row in rows:
+                    await self._upsert_row(
+                        session, row, index_elements, update_columns, increment
+                    )
+            else:
+                for batch in _batches(rows, self.batch_size):
+                    await session.execute(
+                        self._upsert_statement(
+                            index_elements, list(batch), update_columns, increment
+                        )
+                    )
+        for row in rows:
+            self._invalidate(row)
+        return len(rows)
+
+
+_trace_methods(BaseRepository)
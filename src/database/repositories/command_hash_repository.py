@@ -0,0 +1,73 @@
+from src.database.models.command_hash import CommandHash
+from src.database.repositories import BaseRepository
+from sqlalchemy import select
+from typing import Dict, Optional, Tuple
+
+
+# (Merkle root, per-command hashes); the per-command map is None for rows
+# written before per-command hashes were stored
+StoredHashes = Tuple[str, Optional[Dict[str, str]]]
+
+
+class CommandHashRepository(BaseRepository[CommandHash]):
+    def __init__(self):
+        super().__init__(CommandHash)
+
+    async def get_hash(self, guild_id: str) -> Optional[str]:
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(self.model.command_hash).filter(self.model.guild_id == guild_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def get_hashes(self, guild_id: str) -> Optional[StoredHashes]:
+        """Return the stored root and per-command hashes for one scope"""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(self.model.command_hash, self.model.command_hashes).filter(
+                    self.model.guild_id == guild_id
+                )
+            )
+            row = result.one_or_none()
+            return (row.command_hash, row.command_hashes) if row else None
+
+    async def set_hash(
+        self,
+        guild_id: str,
+        command_hash: str,
+        command_hashes: Optional[Dict[str, str]] = None,
+    ) -> None:
+        await self.upsert(
+            ["guild_id"],
+            guild_id=guild_id,
+            command_hash=command_hash,
+            command_hashes=command_hashes,
+        )
+
+    async def get_all_hashes(self) -> Dict[str, StoredHashes]:
+        """Return every stored scope keyed by guild id ("global" for global)"""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(
+                    self.model.guild_id,
+                    self.model.command_hash,
+                    self.model.command_hashes,
+                )
+            )
+            return {
+                row.guild_id: (row.command_hash, row.command_hashes) for row in result
+            }
+
+    async def set_hashes(self, hashes: Dict[str, StoredHashes]) -> None:
+        """Store many scopes in one bulk upsert"""
+        await self.bulk_upsert(
+            [
+                {
+                    "guild_id": guild_id,
+                    "command_hash": command_hash,
+                    "command_hashes": command_hashes,
+                }
+                for guild_id, (command_hash, command_hashes) in hashes.items()
+            ],
+            ["guild_id"],
+        )
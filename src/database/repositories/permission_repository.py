@@ -5,21 +5,19 @@ from typing import List, Optional
 
 
 class PermissionRepository(BaseRepository[Permission]):
+    cache_ttl = 60
+    cache_max_size = 10_000
+    cache_lookups = [("target_type", "target_id", "guild_id")]
+
     def __init__(self):
         super().__init__(Permission)
 
     async def get_permissions(
         self, target_type: str, target_id: int, guild_id: int
     ) -> Optional[Permission]:
-        async with self.db.get_session() as session:
-            result = await session.execute(
-                select(self.model).filter(
-                    self.model.target_type == target_type,
-                    self.model.target_id == target_id,
-                    self.model.guild_id == guild_id,
-                )
-            )
-            return result.scalar_one_or_none()
+        return await self.get_by(
+            target_type=target_type, target_id=target_id, guild_id=guild_id
+        )
 
     async def set_permission(
         self,
@@ -29,43 +27,26 @@ class PermissionRepository(BaseRepository[Permission]):
         permission: str,
         value: bool,
     ) -> None:
-        async with self.db.get_session() as session:
-            result = await session.execute(
-                select(self.model).filter(
-                    self.model.target_type == target_type,
-                    self.model.target_id == target_id,
-                    self.model.guild_id == guild_id,
-                )
-            )
-            instance = result.scalar_one_or_none()
-            if instance:
-                setattr(instance, permission, value)
-                await session.commit()
-            else:
-                # Create a new permission entry if it doesn't exist
-                new_permission = self.model(
-                    target_type=target_type,
-                    target_id=target_id,
-                    guild_id=guild_id,
-                    **{permission: value},
-                )
-                session.add(new_permission)
-                await session.commit()
+        await self.upsert_permissions(
+            target_type, target_id, guild_id, **{permission: value}
+        )
+
+    async def upsert_permissions(
+        self, target_type: str, target_id: int, guild_id: int, **values
+    ) -> None:
+        """Create or update the permission row for a target in a single statement"""
+        await self.upsert(
+            ["target_type", "target_id", "guild_id"],
+            target_type=target_type,
+            target_id=target_id,
+            guild_id=guild_id,
+            **values,
+        )
 
     async def delete_by_target(
         self, target_type: str, target_id: int, guild_id: int
     ) -> bool:
-        async with self.db.get_session() as session:
-            result = await session.execute(
-                select(self.model).filter(
-                    self.model.target_type == target_type,
-                    self.model.target_id == target_id,
-                    self.model.guild_id == guild_id,
-                )
-            )
-            instance = result.scalar_one_or_none()
-            if instance:
-                await session.delete(instance)
-                await session.commit()
-                return True
-            return False
+        deleted = await self.delete_where(
+            target_type=target_type, target_id=target_id, guild_id=guild_id
+        )
+        return deleted > 0
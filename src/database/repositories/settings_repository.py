@@ -0,0 +1,55 @@
+from src.database.models.setting import GuildSetting, SettingsVersion
+from src.database.repositories import BaseRepository
+from sqlalchemy import select, update
+from typing import List
+
+
+class SettingsRepository(BaseRepository[GuildSetting]):
+    def __init__(self):
+        super().__init__(GuildSetting)
+
+    async def get_version(self) -> int:
+        """Current settings version; cheap enough to poll"""
+        async with self.db.get_session() as session:
+            version = await session.scalar(
+                select(SettingsVersion.version).filter(SettingsVersion.id == 1)
+            )
+            return version or 0
+
+    async def get_changed_since(self, version: int) -> List[GuildSetting]:
+        """Every setting written after the given version"""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(self.model).filter(self.model.version > version)
+            )
+            return list(result.scalars().all())
+
+    async def set_setting(self, guild_id: int, key: str, enabled: bool) -> int:
+        """Store a setting and bump the settings version; returns the new version"""
+        async with self.db.get_session() as session:
+            bumped = await session.execute(
+                update(SettingsVersion)
+                .filter(SettingsVersion.id == 1)
+                .values(version=SettingsVersion.version + 1)
+            )
+            if not bumped.rowcount:
+                session.add(SettingsVersion(id=1, version=1))
+                await session.flush()
+            version = await session.scalar(
+                select(SettingsVersion.version).filter(SettingsVersion.id == 1)
+            )
+            await session.execute(
+                self._upsert_statement(
+                    ["guild_id", "key"],
+                    [
+                        {
+                            "guild_id": guild_id,
+                            "key": key,
+                            "enabled": enabled,
+                            "version": version,
+                        }
+                    ],
+                    ["enabled", "version"],
+                )
+            )
+            return version
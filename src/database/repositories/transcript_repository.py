@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime
+from src.database.models.transcript import (
+    Transcript,
+    FTS_TABLE_NAME,
+    decompress_text,
+    transcripts_fts,
+)
+from src.database.repositories import BaseRepository
+from sqlalchemy import select, insert, delete, text, func, literal_column
+from typing import List, Optional, Tuple
+
+
+def to_fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching all words, ignoring syntax"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+class TranscriptRepository(BaseRepository[Transcript]):
+    # Rows removed per DELETE, so pruning never holds the write lock for long
+    prune_batch_size = 5000
+
+    def __init__(self):
+        super().__init__(Transcript)
+
+    @property
+    def has_search(self) -> bool:
+        return self._dialect.name == "sqlite"
+
+    async def add_batch(self, rows: List[dict], texts: List[Tuple[str, str]]) -> int:
+        """
+        Insert transcripts and index their (prompt, response) texts for search,
+        in one transaction. texts[i] is the uncompressed text of rows[i].
+        """
+        if not self.has_search:
+            return await self.bulk_create(rows)
+
+        async with self.db.get_session() as session:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                result = await session.execute(
+                    insert(self.model).returning(
+                        self.model.id, sort_by_parameter_order=True
+                    ),
+                    batch,
+                )
+                ids = result.scalars().all()
+                await session.execute(
+                    insert(transcripts_fts),
+                    [
+                        {"rowid": id, "prompt": prompt, "response": response}
+                        for id, (prompt, response) in zip(
+                            ids, texts[start : start + self.batch_size]
+                        )
+                    ],
+                )
+        return len(rows)
+
+    async def prune_before(self, cutoff: datetime) -> int:
+        """Delete transcripts older than cutoff, and their index entries, in batches"""
+        total = 0
+        while True:
+            async with self.db.get_session() as session:
+                result = await session.execute(
+                    select(self.model.id, self.model.prompt, self.model.response)
+                    .filter(self.model.created_at < cutoff)
+                    .limit(self.prune_batch_size)
+                )
+                expired = result.all()
+                if not expired:
+                    return total
+
+                ids = [row.id for row in expired]
+                if self.has_search:
+                    # A contentless index needs the original text to drop an entry
+                    entries = await asyncio.to_thread(
+                        lambda: [
+                            {
+                                FTS_TABLE_NAME: "delete",
+                                "rowid": row.id,
+                                "prompt": decompress_text(row.prompt),
+                                "response": decompress_text(row.response),
+                            }
+                            for row in expired
+                        ]
+                    )
+                    await session.execute(insert(transcripts_fts), entries)
+
+                await session.execute(
+                    delete(self.model)
+                    .filter(self.model.id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+            total += len(ids)
+            if len(ids) < self.prune_batch_size:
+                return total
+
+    async def search(
+        self,
+        query: str,
+        guild_id: Optional[int] = None,
+        channel_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 20,
+    ) -> List[Transcript]:
+        """
+        Full-text search over prompts and responses, best matches first.
+        Check has_search first: the text is stored compressed, so only the
+        SQLite FTS5 index can search it.
+        """
+        if not self.has_search:
+            raise NotImplementedError("Transcript search requires SQLite FTS5")
+
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return []
+
+        fts = literal_column(FTS_TABLE_NAME)
+        stmt = (
+            select(self.model)
+            .join(transcripts_fts, transcripts_fts.c.rowid == self.model.id)
+            .filter(fts.op("MATCH")(fts_query))
+        )
+        if guild_id is not None:
+            stmt = stmt.filter(self.model.guild_id == guild_id)
+        if channel_id is not None:
+            stmt = stmt.filter(self.model.channel_id == channel_id)
+        if since is not None:
+            stmt = stmt.filter(self.model.created_at >= since)
+        if until is not None:
+            stmt = stmt.filter(self.model.created_at < until)
+        stmt = stmt.order_by(func.bm25(fts)).limit(limit)
+
+        async with self.db.get_session() as session:
+            result = await session.execute(stmt)
+            return result.scalars().all()
+
+    async def optimize_storage(self, vacuum_pages: int = 1000) -> None:
+        """Refresh planner statistics and return freed pages to the OS (SQLite)"""
+        if self._dialect.name != "sqlite":
+            return
+        async with self.db.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"ANALYZE {self.model.__tablename__}"))
+            # Merge a bounded amount of the FTS index segments left by batch inserts
+            await conn.execute(
+                text(
+                    f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rank) "
+                    "VALUES('merge', 500)"
+                )
+            )
+            # Only frees pages when the database uses auto_vacuum=INCREMENTAL
+            result = await conn.exec_driver_sql(
+                f"PRAGMA incremental_vacuum({vacuum_pages})"
+            )
+            result.close()
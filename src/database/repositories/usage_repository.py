@@ -0,0 +1,29 @@
+from datetime import date
+from src.database.models.usage import UsageCounter
+from src.database.repositories import BaseRepository
+from sqlalchemy import select
+from typing import List, Tuple
+
+
+class UsageRepository(BaseRepository[UsageCounter]):
+    def __init__(self):
+        super().__init__(UsageCounter)
+
+    async def get_usage(self, guild_id: int, user_id: int, day: date) -> Tuple[int, int]:
+        """Return the stored (requests, tokens) for a user on a day"""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(self.model.requests, self.model.tokens).filter(
+                    self.model.guild_id == guild_id,
+                    self.model.user_id == user_id,
+                    self.model.day == day,
+                )
+            )
+            row = result.one_or_none()
+            return (row.requests, row.tokens) if row else (0, 0)
+
+    async def increment_many(self, rows: List[dict]) -> int:
+        """Add each row's requests/tokens onto the stored counters in bulk"""
+        return await self.bulk_upsert(
+            rows, ["guild_id", "user_id", "day"], increment=True
+        )
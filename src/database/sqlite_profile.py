@@ -0,0 +1,50 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+def is_file_sqlite(url: str) -> bool:
+    """True for SQLite URLs backed by a file (WAL does not apply to :memory:)"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def apply_pragmas(engine: AsyncEngine, pragmas: dict, readonly: bool = False):
+    """Run the given PRAGMAs on every new DBAPI connection of the engine"""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if readonly:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the reader engine and everything else to
+    the writer. Once a session has written, it stays on the writer so it can
+    read its own uncommitted changes.
+
+    Reads made before a session's first write run on a reader connection and
+    may see an older snapshot than the write. Keep read-modify-write in a
+    single statement (upsert, UPDATE ... SET x = x + 1 RETURNING), as the
+    repositories do, or mark the session as writing up front with
+    session.info["wrote"] = True.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        writer, reader = self.info["writer"], self.info["reader"]
+        if self.info.get("wrote"):
+            return writer
+        if not self._flushing and getattr(clause, "is_select", False):
+            return reader
+        self.info["wrote"] = True
+        return writer
@@ -1,10 +1,15 @@
 import discord
+import time
 from src.llm.interactions import handler
+from src.utils.metrics import message_seconds
+from src.utils.tracing import tracer
 from src.utils.logger import logger
 
 
 async def setup_llm_events(bot: discord.ext.commands.Bot):
     """Set up LLM event handlers for the bot"""
+    handler.on_usage = bot.quota.record_tokens
+    handler.transcripts = bot.transcripts
 
     async def on_message(message: discord.Message) -> None:
         # Ignore messages from the bot itself
@@ -17,10 +22,43 @@ async def setup_llm_events(bot: discord.ext.commands.Bot):
             or isinstance(message.channel, discord.DMChannel)  # Direct message
         )
 
-        if should_respond:
-            async with message.channel.typing():
-                response: str = await handler.handle_message(message)
-                await message.channel.send(response)
+        # Per-guild toggle, resolved from memory without touching the database
+        guild_id = message.guild.id if message.guild else None
+        if should_respond and bot.settings.is_enabled(guild_id, "enable_ai"):
+            started = time.perf_counter()
+            with tracer.trace(
+                "on_message",
+                **{
+                    "discord.guild_id": guild_id or 0,
+                    "discord.channel_id": message.channel.id,
+                },
+            ), bot.db.track_queries("on_message"):
+                await respond(message)
+            message_seconds.observe(time.perf_counter() - started)
+
+    async def respond(message: discord.Message) -> None:
+        logger.debug(
+            "Responding to message %s from %s in channel %s",
+            message.id,
+            message.author.id,
+            message.channel.id,
+        )
+
+        # Enforce quotas before any memory or LLM work. The limit and usage
+        # lookups share one session; the unit of work closes before any I/O.
+        with tracer.span("quota.check"):
+            async with bot.db.unit_of_work():
+                reason = await bot.quota.check(message)
+        if reason:
+            if bot.quota.should_notify(message.author.id):
+                await message.channel.send(reason)
+            return
+
+        # No unit of work around the reply: it would hold a transaction (and
+        # the SQLite write lock) across the LLM call and the send
+        async with message.channel.typing():
+            response: str = await handler.handle_message(message)
+            await message.channel.send(response)
 
     # Remove any existing message listeners to avoid duplicates
     bot.remove_listener(on_message)
@@ -1,7 +1,11 @@
 from src.llm.providers.groq import GroqProvider
 from src.llm.memory.short_term import ShortTermMemory
+from src.utils.transcript_writer import Exchange, TranscriptWriter
+from src.utils.metrics import llm_errors, llm_request_seconds, llm_tokens
+from src.utils.tracing import tracer
 import discord
-from typing import Dict, List
+import time
+from typing import Callable, Dict, List, Optional
 
 
 class InteractionHandler:
@@ -10,6 +14,9 @@ class InteractionHandler:
         self.memories: Dict[
             str, ShortTermMemory
         ] = {}  # Dict to store ShortTermMemory instances per channel
+        # Hooks wired up by setup_llm_events
+        self.on_usage: Optional[Callable[[discord.Message, int], None]] = None
+        self.transcripts: Optional[TranscriptWriter] = None
 
     def get_memory(
         self, channel_id: str, channel: discord.abc.Messageable
@@ -26,29 +33,65 @@ class InteractionHandler:
         return self.memories[memory_key]
 
     async def handle_message(self, message: discord.Message) -> str:
-        # Pass both channel ID and channel object
-        memory: ShortTermMemory = self.get_memory(
-            str(message.channel.id), message.channel
-        )
+        with tracer.span("memory") as span:
+            # Pass both channel ID and channel object
+            memory: ShortTermMemory = self.get_memory(
+                str(message.channel.id), message.channel
+            )
 
-        # Add user message to memory
-        memory.add_message("user", message.content)
+            # Add user message to memory
+            memory.add_message("user", message.content)
 
-        # Get conversation history
-        messages: List[dict[str, str]] = memory.get_conversation_history()
+            # Get conversation history
+            messages: List[dict[str, str]] = memory.get_conversation_history()
 
-        # Add system prompt if this is the start of a conversation
-        if len(messages) <= 1:
-            messages.insert(
-                0,
-                {
-                    "role": "system",
-                    "content": "You are a helpful AI assistant in a Discord chat. Be concise, friendly, and helpful.",
-                },
-            )
+            # Add system prompt if this is the start of a conversation
+            if len(messages) <= 1:
+                messages.insert(
+                    0,
+                    {
+                        "role": "system",
+                        "content": "You are a helpful AI assistant in a Discord chat. Be concise, friendly, and helpful.",
+                    },
+                )
+            span.set_attribute("memory.messages", len(messages))
 
         # Get response from LLM
-        response: str = await self.llm.chat_completion(messages=messages)
+        started = time.perf_counter()
+        try:
+            result = await self.llm.chat_completion_with_usage(messages=messages)
+        except Exception:
+            llm_errors.labels(self.llm.name).inc()
+            raise
+        elapsed = time.perf_counter() - started
+        latency_ms = int(elapsed * 1000)
+        response: str = result.content
+
+        provider, model = self.llm.name, result.model
+        llm_request_seconds.labels(provider, model).observe(elapsed)
+        llm_tokens.labels(provider, model, "prompt").observe(result.prompt_tokens)
+        llm_tokens.labels(provider, model, "completion").observe(
+            result.completion_tokens
+        )
+
+        if self.on_usage:
+            self.on_usage(message, result.total_tokens)
+        if self.transcripts:
+            self.transcripts.enqueue(
+                Exchange(
+                    guild_id=message.guild.id if message.guild else None,
+                    channel_id=message.channel.id,
+                    user_id=message.author.id,
+                    message_id=message.id,
+                    model=result.model,
+                    prompt=message.content,
+                    response=response,
+                    latency_ms=latency_ms,
+                    prompt_tokens=result.prompt_tokens,
+                    completion_tokens=result.completion_tokens,
+                    total_tokens=result.total_tokens,
+                )
+            )
 
         # Add assistant's response to memory
         memory.add_message("assistant", response)
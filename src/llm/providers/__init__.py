@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class CompletionResult:
+    content: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
@@ -1,12 +1,26 @@
-from groq import AsyncGroq
 import base64
 from src.config import Config  # Import the Config class
+from src.llm.providers import CompletionResult
+from src.utils.startup import timed_import
+from src.utils.tracing import KIND_CLIENT, tracer
 
 
 class GroqProvider:
+    # Label used in metrics
+    name = "groq"
+
     def __init__(self):
         config = Config()  # Create an instance of Config
-        self.client = AsyncGroq(api_key=config.groq_api_key)
+        self.api_key = config.groq_api_key
+        self._client = None
+
+    @property
+    def client(self):
+        # The groq SDK is slow to import, so it's loaded on first request
+        if self._client is None:
+            groq = timed_import("groq")
+            self._client = groq.AsyncGroq(api_key=self.api_key)
+        return self._client
 
     async def chat_completion(
         self,
@@ -16,16 +30,42 @@ class GroqProvider:
         max_tokens=1024,
         top_p=1,
     ):
-        chat_completion = await self.client.chat.completions.create(
-            messages=messages,
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=top_p,
-            stop=None,
-            stream=False,
+        result = await self.chat_completion_with_usage(
+            messages, model, temperature, max_tokens, top_p
+        )
+        return result.content
+
+    async def chat_completion_with_usage(
+        self,
+        messages,
+        model="llama3-8b-8192",
+        temperature=0.5,
+        max_tokens=1024,
+        top_p=1,
+    ) -> CompletionResult:
+        """Return the reply text together with the model and token usage"""
+        with tracer.span(
+            "groq chat.completions", KIND_CLIENT, **{"llm.model": model}
+        ) as span:
+            chat_completion = await self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                stop=None,
+                stream=False,
+            )
+            usage = chat_completion.usage
+            if usage:
+                span.set_attribute("llm.total_tokens", usage.total_tokens)
+        return CompletionResult(
+            content=chat_completion.choices[0].message.content,
+            model=chat_completion.model or model,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            total_tokens=usage.total_tokens if usage else 0,
         )
-        return chat_completion.choices[0].message.content
 
     def encode_image(self, image_path):
         with open(image_path, "rb") as image_file:
@@ -1,12 +1,24 @@
-from openai import OpenAI
 import base64
 from src.config import Config
+from src.utils.startup import timed_import
 
 
 class OpenAIProvider:
+    # Label used in metrics
+    name = "openai"
+
     def __init__(self):
         config = Config()
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.api_key = config.openai_api_key
+        self._client = None
+
+    @property
+    def client(self):
+        # The openai SDK is slow to import, so it's loaded on first request
+        if self._client is None:
+            openai = timed_import("openai")
+            self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
 
     def chat_completion(self, messages, model="gpt-4o-mini", max_tokens=300):
         response = self.client.chat.completions.create(
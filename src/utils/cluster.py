@@ -0,0 +1,476 @@
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import secrets
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import aiohttp
+from src.config import Config
+from src.utils.logger import logger
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+@dataclass
+class ClusterInfo:
+    """What a worker process needs to know about its place in the cluster"""
+
+    cluster_id: int
+    shard_ids: List[int]
+    shard_count: int
+    ipc_host: str
+    ipc_port: int
+    secret: str
+
+
+def shard_ranges(shard_count: int, clusters: int) -> List[List[int]]:
+    """Split shards 0..shard_count-1 into contiguous, near-equal ranges"""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for cluster_id in range(clusters):
+        end = start + size + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+async def recommended_shard_count(token: str, api_base: str) -> int:
+    """Ask Discord (or a fake gateway at api_base) how many shards to run"""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"{api_base}/gateway/bot", headers={"Authorization": f"Bot {token}"}
+        ) as response:
+            response.raise_for_status()
+            return int((await response.json())["shards"])
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+    # One JSON object per line
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+class IPCServer:
+    """
+    Message hub run by the launcher. Workers send one JSON object per line:
+    "broadcast" forwards an event to every worker, "request" collects one
+    reply per worker and returns them as a list, "shutdown" stops the cluster.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        secret: str,
+        on_shutdown: Callable[[], None],
+        request_timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.on_shutdown = on_shutdown
+        self.request_timeout = request_timeout
+        self.clients: Dict[int, asyncio.StreamWriter] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+        except ValueError:
+            hello = {}
+        if hello.get("op") != "hello" or not secrets.compare_digest(
+            str(hello.get("secret", "")), self.secret
+        ):
+            writer.close()
+            return
+
+        cluster_id = int(hello["cluster_id"])
+        self.clients[cluster_id] = writer
+        logger.info("Cluster %s connected to IPC", cluster_id)
+        try:
+            async for line in reader:
+                try:
+                    await self._dispatch(cluster_id, json.loads(line))
+                except Exception as e:
+                    logger.error("Bad IPC message from cluster %s: %s", cluster_id, e)
+        finally:
+            if self.clients.get(cluster_id) is writer:
+                del self.clients[cluster_id]
+            writer.close()
+
+    async def _dispatch(self, cluster_id: int, message: dict) -> None:
+        op = message["op"]
+        if op == "broadcast":
+            await self.broadcast(message["event"], message.get("data"))
+        elif op == "request":
+            asyncio.create_task(self._answer(cluster_id, message))
+        elif op == "reply":
+            future = self._pending.pop(message["id"], None)
+            if future is not None and not future.done():
+                future.set_result(message.get("data"))
+        elif op == "shutdown":
+            self.on_shutdown()
+
+    async def broadcast(self, event: str, data: Any = None) -> None:
+        """Send an event to every connected worker"""
+        for writer in list(self.clients.values()):
+            try:
+                await _send(writer, {"op": "event", "event": event, "data": data})
+            except ConnectionError:
+                pass
+
+    async def request(
+        self, event: str, data: Any = None, timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Ask every connected worker and return the replies that arrived in time"""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for writer in list(self.clients.values()):
+            request_id = next(self._ids)
+            future = self._pending[request_id] = loop.create_future()
+            futures.append(future)
+            try:
+                await _send(
+                    writer,
+                    {"op": "request", "id": request_id, "event": event, "data": data},
+                )
+            except ConnectionError:
+                self._pending.pop(request_id, None)
+                future.cancel()
+        if futures:
+            await asyncio.wait(futures, timeout=timeout or self.request_timeout)
+        return [f.result() for f in futures if f.done() and not f.cancelled()]
+
+    async def _answer(self, cluster_id: int, message: dict) -> None:
+        results = await self.request(
+            message["event"], message.get("data"), message.get("timeout")
+        )
+        writer = self.clients.get(cluster_id)
+        if writer is not None:
+            await _send(writer, {"op": "reply", "id": message["id"], "data": results})
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self.clients.values()):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class IPCClient:
+    """A worker's connection to the launcher's IPCServer"""
+
+    def __init__(self, info: ClusterInfo):
+        self.info = info
+        self.handlers: Dict[str, Handler] = {}
+        # Called when the launcher goes away, so orphaned workers exit
+        self.on_disconnect: Optional[Callable[[], Awaitable]] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def cluster_id(self) -> int:
+        return self.info.cluster_id
+
+    def on(self, event: str, handler: Handler) -> None:
+        """Run `await handler(data)` for broadcasts and requests of this event"""
+        self.handlers[event] = handler
+
+    async def connect(self) -> None:
+        reader, self._writer = await asyncio.open_connection(
+            self.info.ipc_host, self.info.ipc_port
+        )
+        await _send(
+            self._writer,
+            {
+                "op": "hello",
+                "cluster_id": self.info.cluster_id,
+                "secret": self.info.secret,
+            },
+        )
+        self._task = asyncio.create_task(self._read(reader))
+
+    async def _run_handler(self, event: str, data: Any) -> Any:
+        handler = self.handlers.get(event)
+        if handler is None:
+            return None
+        try:
+            return await handler(data)
+        except Exception as e:
+            logger.error("IPC handler %s failed: %s", event, e)
+            return None
+
+    async def _reply(self, message: dict) -> None:
+        data = await self._run_handler(message["event"], message.get("data"))
+        await _send(self._writer, {"op": "reply", "id": message["id"], "data": data})
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        async for line in reader:
+            message = json.loads(line)
+            op = message["op"]
+            if op == "event":
+                asyncio.create_task(
+                    self._run_handler(message["event"], message.get("data"))
+                )
+            elif op == "request":
+                asyncio.create_task(self._reply(message))
+            elif op == "reply":
+                future = self._pending.pop(message["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(message.get("data"))
+
+        logger.warning("Cluster %s lost its IPC connection", self.cluster_id)
+        if self.on_disconnect is not None:
+            await self.on_disconnect()
+
+    async def broadcast(self, event: str, data: Any = None) -> None:
+        """Run an event on every cluster, this one included"""
+        await _send(self._writer, {"op": "broadcast", "event": event, "data": data})
+
+    async def request(
+        self, event: str, data: Any = None, timeout: float = 15.0
+    ) -> List[Any]:
+        """
+        Run an event on every cluster and return their replies. Clusters that
+        don't answer within the timeout are left out rather than failing the
+        whole request.
+        """
+        request_id = next(self._ids)
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        await _send(
+            self._writer,
+            {
+                "op": "request",
+                "id": request_id,
+                "event": event,
+                "data": data,
+                # The hub stops waiting first, leaving time to send back the
+                # replies it did get
+                "timeout": timeout * 0.8,
+            },
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def shutdown_cluster(self) -> None:
+        """Ask the launcher to stop every worker"""
+        await _send(self._writer, {"op": "shutdown"})
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def run_worker(info: ClusterInfo) -> None:
+    """Entry point of a worker process: run one AutoShardedBot for its shards"""
+    from src.bot import create_bot, run_bot
+
+    async def main():
+        bot = await create_bot(cluster=info)
+        await run_bot(bot)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # The launcher got the same Ctrl+C and is stopping the cluster
+        pass
+
+
+@dataclass
+class _Worker:
+    info: ClusterInfo
+    process: Optional[multiprocessing.Process] = None
+    started: float = 0.0
+    restart_delay: float = 0.0
+    restart_at: Optional[float] = None
+    done: bool = False
+
+
+class ClusterLauncher:
+    """
+    Spawns one process per cluster, each running an AutoShardedBot for a
+    contiguous range of shards, and restarts workers that crash. Pass
+    `target` to run something other than the bot in the workers (e.g. a
+    stub against a fake gateway in tests).
+    """
+
+    # Restart backoff; a worker that stayed up for stable_after seconds
+    # starts again from the initial delay
+    restart_delay = 1.0
+    max_restart_delay = 60.0
+    stable_after = 60.0
+    # Seconds workers get to close cleanly before they're terminated
+    shutdown_grace = 15.0
+
+    def __init__(
+        self,
+        clusters: int,
+        shard_count: Optional[int] = None,
+        target: Callable[[ClusterInfo], None] = run_worker,
+    ):
+        self.clusters = clusters
+        self.shard_count = shard_count
+        self.target = target
+        self.workers: List[_Worker] = []
+        self.server: Optional[IPCServer] = None
+        self._stopping = asyncio.Event()
+        self._context = multiprocessing.get_context("spawn")
+
+    def shutdown(self) -> None:
+        """Stop supervising and close every worker"""
+        self._stopping.set()
+
+    def _spawn(self, worker: _Worker) -> None:
+        info = worker.info
+        process = self._context.Process(
+            target=self.target, args=(info,), name=f"cluster-{info.cluster_id}"
+        )
+        # Spawned children copy the environment; CLUSTER_ID gives each worker
+        # its own log file, trace file and metrics port
+        previous = os.environ.get("CLUSTER_ID")
+        os.environ["CLUSTER_ID"] = str(info.cluster_id)
+        try:
+            process.start()
+        finally:
+            if previous is None:
+                os.environ.pop("CLUSTER_ID", None)
+            else:
+                os.environ["CLUSTER_ID"] = previous
+        worker.process = process
+        worker.started = time.monotonic()
+        worker.restart_at = None
+        logger.info(
+            "Started cluster %s (pid %s) with shards %s-%s",
+            info.cluster_id,
+            process.pid,
+            info.shard_ids[0],
+            info.shard_ids[-1],
+        )
+
+    def _check(self, worker: _Worker) -> None:
+        now = time.monotonic()
+        if worker.restart_at is not None:
+            if now >= worker.restart_at:
+                self._spawn(worker)
+            return
+        if worker.process.is_alive():
+            return
+
+        code = worker.process.exitcode
+        cluster_id = worker.info.cluster_id
+        if code == 0:
+            logger.info("Cluster %s exited", cluster_id)
+            worker.done = True
+            return
+
+        if now - worker.started >= self.stable_after:
+            worker.restart_delay = 0.0
+        worker.restart_delay = min(
+            max(worker.restart_delay * 2, self.restart_delay), self.max_restart_delay
+        )
+        worker.restart_at = now + worker.restart_delay
+        logger.error(
+            "Cluster %s died with exit code %s, restarting in %.1fs",
+            cluster_id,
+            code,
+            worker.restart_delay,
+        )
+
+    async def run(self) -> None:
+        """Start the cluster and supervise it until shutdown"""
+        config = Config()
+        shard_count = (
+            self.shard_count
+            or config.cluster.shard_count
+            or await recommended_shard_count(
+                config.discord.token, config.discord.api_base
+            )
+        )
+        ranges = shard_ranges(shard_count, self.clusters)
+        logger.info("Launching %s clusters for %s shards", len(ranges), shard_count)
+
+        secret = secrets.token_hex(16)
+        self.server = IPCServer(
+            config.cluster.ipc_host, config.cluster.ipc_port, secret, self.shutdown
+        )
+        await self.server.start()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self.shutdown)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        self.workers = [
+            _Worker(
+                ClusterInfo(
+                    cluster_id,
+                    shard_ids,
+                    shard_count,
+                    config.cluster.ipc_host,
+                    self.server.port,
+                    secret,
+                )
+            )
+            for cluster_id, shard_ids in enumerate(ranges)
+        ]
+        try:
+            for worker in self.workers:
+                self._spawn(worker)
+            while not self._stopping.is_set():
+                for worker in self.workers:
+                    if not worker.done:
+                        self._check(worker)
+                if all(worker.done for worker in self.workers):
+                    break
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Ask workers to close, then terminate any that don't in time"""
+        if self.server is not None:
+            await self.server.broadcast("shutdown")
+
+        deadline = time.monotonic() + self.shutdown_grace
+        running = [w.process for w in self.workers if w.process is not None]
+        while any(p.is_alive() for p in running) and time.monotonic() < deadline:
+            await asyncio.sleep(0.2)
+        for process in running:
+            if process.is_alive():
+                logger.warning("Terminating %s (pid %s)", process.name, process.pid)
+                process.terminate()
+            process.join(timeout=5)
+
+        if self.server is not None:
+            await self.server.stop()
+            self.server = None
+        logger.info("Cluster stopped")
@@ -1,27 +1,105 @@
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import hashlib
 import json
-from typing import Dict, Optional
+import random
+import time
+import weakref
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional
 from src.utils.logger import logger
 from src.database.manager import DatabaseManager
 from sqlalchemy import Column, String, select
 from src.database.models import CommandHash
+from src.database.repositories.command_hash_repository import CommandHashRepository
 import discord
 
 
+@dataclass
+class CommandDiff:
+    """Commands added, changed and removed since the last sync of a scope"""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # No per-command baseline was stored, so only a full sync is safe
+    full: bool = False
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __bool__(self) -> bool:
+        return self.full or len(self) > 0
+
+    def __str__(self) -> str:
+        if self.full:
+            return f"full sync of {len(self.added)} commands"
+        parts = [f"+{name}" for name in self.added]
+        parts += [f"~{name}" for name in self.changed]
+        parts += [f"-{name}" for name in self.removed]
+        return ", ".join(parts) or "no changes"
+
+
+@dataclass
+class _ScopeChanges:
+    guild: Optional[discord.Guild]
+    commands: list
+    hashes: Dict[str, str]
+    root: str
+    diff: CommandDiff
+
+
 class CommandSyncer:
-    def __init__(self, bot: commands.Bot):
+    # Guild syncs allowed in flight at once during sync_all_guilds
+    max_concurrency = 5
+    # Retries for a sync that keeps hitting 429s, and the base backoff delay
+    max_retries = 5
+    backoff_base = 1.0
+    # Up to this many changed commands are pushed one by one; more than that
+    # and a single bulk overwrite is cheaper
+    incremental_limit = 3
+
+    def __init__(self, bot: commands.Bot, sync_global: bool = True):
         self.bot = bot
+        # In a cluster only one worker pushes global commands; every worker
+        # syncs the guilds on its own shards
+        self.sync_global = sync_global
         self.db = DatabaseManager()
+        self.hashes = CommandHashRepository()
+        # Shared pause so one 429 slows every queued sync, not just its own
+        self._paused_until = 0.0
+        # Leaf command hashes, dropped with the command object on reload
+        self._hash_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _command_key(command) -> str:
+        """Name a command uniquely within its scope (context menus share names)"""
+        command_type = getattr(command, "type", None)
+        if command_type is None or command_type == discord.AppCommandType.chat_input:
+            return command.name
+        return f"{command_type.name}:{command.name}"
+
+    @staticmethod
+    def _scope_key(guild: Optional[discord.abc.Snowflake]) -> str:
+        return str(guild.id) if guild else "global"
+
+    @staticmethod
+    def _scope_label(guild: Optional[discord.abc.Snowflake]) -> str:
+        return f"guild {guild.id}" if guild else "global"
+
+    @staticmethod
+    def _digest(data) -> str:
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
     def _get_command_data(
         self, command: app_commands.Command | app_commands.Group
     ) -> dict:
-        """Extract command data recursively, handling both commands and groups"""
+        """Extract command data, hashing group children instead of inlining them"""
         command_dict = {
             "name": command.name,
-            "description": command.description,
+            "description": getattr(command, "description", ""),
         }
 
         # Handle regular commands
@@ -38,53 +116,71 @@ class CommandSyncer:
 
         # Handle command groups
         elif isinstance(command, app_commands.Group):
-            command_dict["subcommands"] = [
-                self._get_command_data(cmd) for cmd in command.commands
-            ]
+            command_dict["subcommands"] = {
+                cmd.name: self._hash_command(cmd) for cmd in command.commands
+            }
 
         return command_dict
 
+    def _hash_command(self, command) -> str:
+        """Hash one command; leaf hashes are memoized per command object"""
+        # Groups are mutable containers, so only their own fields are rehashed
+        # and the (memoized) child hashes are reused
+        if isinstance(command, app_commands.Group):
+            return self._digest(self._get_command_data(command))
+
+        command_hash = self._hash_cache.get(command)
+        if command_hash is None:
+            command_hash = self._digest(self._get_command_data(command))
+            self._hash_cache[command] = command_hash
+        return command_hash
+
+    def _generate_command_hashes(
+        self, commands: list[app_commands.Command | app_commands.Group]
+    ) -> Dict[str, str]:
+        """Hash each top-level command of a scope"""
+        return {self._command_key(cmd): self._hash_command(cmd) for cmd in commands}
+
+    @staticmethod
+    def _merkle_root(command_hashes: Dict[str, str]) -> str:
+        return CommandSyncer._digest(command_hashes)
+
     def _generate_command_hash(
         self, commands: list[app_commands.Command | app_commands.Group]
     ) -> str:
         """Generate a hash of the command tree for comparison"""
-        command_data = []
-
-        for cmd in sorted(commands, key=lambda x: x.name):
-            command_data.append(self._get_command_data(cmd))
+        return self._merkle_root(self._generate_command_hashes(commands))
 
-        command_json = json.dumps(command_data, sort_keys=True)
-        return hashlib.sha256(command_json.encode()).hexdigest()
-
-    async def _get_stored_hash(self, guild_id: Optional[str] = None) -> Optional[str]:
-        """Get the stored command hash for the given guild"""
-        async with self.db.get_session() as session:
-            result = await session.execute(
-                select(CommandHash).filter(
-                    CommandHash.guild_id == (guild_id or "global")
-                )
-            )
-            command_hash = result.scalar_one_or_none()
-            return command_hash.command_hash if command_hash else None
-
-    async def _store_hash(self, command_hash: str, guild_id: Optional[str] = None):
-        """Store the command hash for the given guild"""
-        async with self.db.get_session() as session:
-            result = await session.execute(
-                select(CommandHash).filter(
-                    CommandHash.guild_id == (guild_id or "global")
-                )
-            )
-            command_hash_obj = result.scalar_one_or_none()
+    @staticmethod
+    def _diff(
+        stored: Optional[Dict[str, str]], current: Dict[str, str]
+    ) -> CommandDiff:
+        """Compare stored per-command hashes with the current ones"""
+        if stored is None:
+            return CommandDiff(added=sorted(current), full=True)
+        return CommandDiff(
+            added=sorted(current.keys() - stored.keys()),
+            changed=sorted(
+                key
+                for key in current.keys() & stored.keys()
+                if current[key] != stored[key]
+            ),
+            removed=sorted(stored.keys() - current.keys()),
+        )
 
-            if command_hash_obj:
-                command_hash_obj.command_hash = command_hash
-            else:
-                command_hash_obj = CommandHash(
-                    guild_id=(guild_id or "global"), command_hash=command_hash
-                )
-                session.add(command_hash_obj)
-            await session.commit()
+    def _scope_changes(
+        self, guild: Optional[discord.Guild], stored
+    ) -> Optional[_ScopeChanges]:
+        """Hash a scope and diff it against what was stored, None if unchanged"""
+        commands = self.bot.tree.get_commands(guild=guild)
+        hashes = self._generate_command_hashes(commands)
+        root = self._merkle_root(hashes)
+        stored_root, stored_hashes = stored or (None, None)
+        if stored_root == root:
+            return None
+        return _ScopeChanges(
+            guild, commands, hashes, root, self._diff(stored_hashes, hashes)
+        )
 
     async def sync_commands(self, guild_id: Optional[str] = None) -> bool:
         """
@@ -93,66 +189,168 @@ class CommandSyncer:
         """
         try:
             # Get the command tree for the specified scope
+            guild = None
             if guild_id:
                 guild = self.bot.get_guild(int(guild_id))
                 if not guild:
-                    logger.error(f"Guild not found: {guild_id}")
+                    logger.error("Guild not found: %s", guild_id)
                     return False
-                commands = self.bot.tree.get_commands(guild=guild)
-            else:
-                commands = self.bot.tree.get_commands()
 
-            # Generate hash of current commands
-            current_hash = self._generate_command_hash(commands)
-            stored_hash = await self._get_stored_hash(guild_id)
+            key = self._scope_key(guild)
+            changes = self._scope_changes(guild, await self.hashes.get_hashes(key))
 
             # If hashes match, no sync needed
-            if stored_hash == current_hash:
+            if changes is None:
                 logger.info(
-                    f"Commands unchanged for {'guild ' + guild_id if guild_id else 'global'} - skipping sync"
+                    "Commands unchanged for %s - skipping sync",
+                    self._scope_label(guild),
                 )
                 return False
 
+            logger.info(
+                "Command changes for %s: %s", self._scope_label(guild), changes.diff
+            )
+
             # Sync commands with error handling
             try:
-                if guild_id:
-                    guild = self.bot.get_guild(int(guild_id))
-                    if guild:
-                        synced = await self.bot.tree.sync(guild=guild)
-                        logger.info(
-                            f"Synced {len(synced)} commands for guild {guild_id}"
-                        )
-                else:
-                    synced = await self.bot.tree.sync()
-                    logger.info(f"Synced {len(synced)} global commands")
-
-                # Store new hash only after successful sync
-                await self._store_hash(current_hash, guild_id)
-                return True
-
+                await self._apply_changes(changes)
             except discord.HTTPException as e:
-                logger.error(f"Failed to sync commands: {e}")
+                logger.error("Failed to sync commands: %s", e)
                 return False
 
+            # Store new hashes only after successful sync
+            await self.hashes.set_hash(key, changes.root, changes.hashes)
+            return bool(changes.diff)
+
         except Exception as e:
-            logger.error(f"Error in sync_commands: {str(e)}")
+            logger.error("Error in sync_commands: %s", e)
             return False
 
+    async def _apply_changes(self, changes: _ScopeChanges) -> None:
+        """Push a scope's changes, per command when few changed, else in bulk"""
+        guild, diff = changes.guild, changes.diff
+        label = self._scope_label(guild)
+        if not diff:
+            return
+
+        if diff.full or len(diff) > self.incremental_limit:
+            synced = await self._with_backoff(
+                label, partial(self.bot.tree.sync, guild=guild)
+            )
+            logger.info("Synced %s commands for %s", len(synced), label)
+            return
+
+        http = self.bot.http
+        application_id = self.bot.application_id
+        by_key = {self._command_key(cmd): cmd for cmd in changes.commands}
+
+        for key in diff.added + diff.changed:
+            payload = by_key[key].to_dict(self.bot.tree)
+            if guild:
+                call = partial(
+                    http.upsert_guild_command, application_id, guild.id, payload
+                )
+            else:
+                call = partial(http.upsert_global_command, application_id, payload)
+            await self._with_backoff(label, call)
+
+        if diff.removed:
+            # Deleting needs the remote command ids
+            remote = await self._with_backoff(
+                label, partial(self.bot.tree.fetch_commands, guild=guild)
+            )
+            remote_ids = {self._command_key(cmd): cmd.id for cmd in remote}
+            for key in diff.removed:
+                command_id = remote_ids.get(key)
+                if command_id is None:
+                    continue
+                if guild:
+                    call = partial(
+                        http.delete_guild_command, application_id, guild.id, command_id
+                    )
+                else:
+                    call = partial(
+                        http.delete_global_command, application_id, command_id
+                    )
+                await self._with_backoff(label, call)
+
+        logger.info("Updated %s commands for %s: %s", len(diff), label, diff)
+
+    async def _with_backoff(self, label: str, call: Callable[[], Awaitable]):
+        """Run one Discord request, backing off and retrying on rate limits"""
+        for attempt in range(self.max_retries + 1):
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                return await call()
+            except (discord.RateLimited, discord.HTTPException) as e:
+                rate_limited = isinstance(e, discord.RateLimited) or e.status == 429
+                if not rate_limited or attempt == self.max_retries:
+                    raise
+                retry_after = getattr(e, "retry_after", None) or (
+                    self.backoff_base * 2**attempt
+                )
+                retry_after += random.uniform(0, self.backoff_base)
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+                logger.warning(
+                    "Rate limited syncing commands for %s, retrying in %.1fs",
+                    label,
+                    retry_after,
+                )
+
+    async def _sync_scope(
+        self, changes: _ScopeChanges, semaphore: asyncio.Semaphore
+    ) -> bool:
+        async with semaphore:
+            try:
+                await self._apply_changes(changes)
+                return True
+            except Exception as e:
+                logger.error(
+                    "Failed to sync commands for %s: %s",
+                    self._scope_label(changes.guild),
+                    e,
+                )
+                return False
+
     async def sync_all_guilds(self):
-        """Sync commands for all guilds and global commands"""
+        """Sync global and guild commands whose hashes changed, concurrently"""
         try:
-            # Sync global commands first
-            global_success = await self.sync_commands()
+            stored = await self.hashes.get_all_hashes()
+
+            # Hash every scope up front and keep only the ones that changed
+            scopes: List[Optional[discord.Guild]] = list(self.bot.guilds)
+            if self.sync_global:
+                scopes.insert(0, None)
+            changed: List[_ScopeChanges] = []
+            for guild in scopes:
+                changes = self._scope_changes(guild, stored.get(self._scope_key(guild)))
+                if changes is not None:
+                    changed.append(changes)
+
             logger.info(
-                f"Global command sync {'successful' if global_success else 'not needed'}"
+                "Commands changed for %s of %s scopes", len(changed), len(scopes)
             )
+            if not changed:
+                return
 
-            # Sync guild-specific commands
-            for guild in self.bot.guilds:
-                guild_success = await self.sync_commands(str(guild.id))
-                logger.info(
-                    f"Guild {guild.id} command sync {'successful' if guild_success else 'not needed'}"
-                )
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(
+                *(self._sync_scope(changes, semaphore) for changes in changed)
+            )
+
+            # Store the new hashes of every scope that synced, in one upsert
+            synced_hashes = {
+                self._scope_key(changes.guild): (changes.root, changes.hashes)
+                for changes, success in zip(changed, results)
+                if success
+            }
+            if synced_hashes:
+                await self.hashes.set_hashes(synced_hashes)
 
         except Exception as e:
-            logger.error(f"Error syncing all commands: {str(e)}")
+            logger.error("Error syncing all commands: %s", e)
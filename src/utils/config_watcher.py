@@ -0,0 +1,60 @@
+import asyncio
+import os
+from typing import Optional, Tuple
+from src.config import Config, ENV_PATH
+from src.utils.logger import logger
+
+
+class ConfigWatcher:
+    """Reloads Config when the .env file changes, so settings apply without a restart"""
+
+    def __init__(self, path: str = ENV_PATH, interval: float = 2.0):
+        self.path = path
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        # Editors often replace the file, so poll its stat rather than watch it
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def _run(self) -> None:
+        last = self._stat()
+        while True:
+            await asyncio.sleep(self.interval)
+            current = self._stat()
+            if current == last:
+                continue
+
+            # Wait for the file to settle before reading a half-written save
+            await asyncio.sleep(self.interval / 4)
+            if self._stat() != current:
+                continue
+            last = current
+            try:
+                changes = Config().reload()
+                logger.info(
+                    "Reloaded %s: %s",
+                    self.path,
+                    ", ".join(changes) if changes else "no setting changes",
+                )
+            except Exception as e:
+                logger.error("Failed to reload %s: %s", self.path, e)
+
+    def start(self) -> None:
+        """Start watching the .env file in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop watching"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,9 +1,10 @@
-import importlib
-import pkgutil
-from typing import Dict
+import time
+from typing import Dict, List, Optional
 from discord.ext import commands
 from src.utils.logger import logger
 from src.config import Config
+from src.utils.feature_manifest import FeatureManifest
+from src.utils.startup import import_timings
 
 
 class FeatureManager:
@@ -12,6 +13,9 @@ class FeatureManager:
         self.features: Dict[str, Dict] = {}
         self.loaded_modules: Dict[str, bool] = {}
         self.config = Config()
+        self.manifest = FeatureManifest(
+            "src.cogs", self.config.features.manifest_path
+        )
         logger.info("Initializing FeatureManager...")
 
     async def load_all_features(self):
@@ -21,55 +25,109 @@ class FeatureManager:
         # Log discovered features once
         if self.features:
             discovered = [data["category"] for data in self.features.values()]
-            logger.info(f"Discovered {len(discovered)} features...")
+            logger.info("Discovered %s features...", len(discovered))
 
-        return await self.load_discovered_features()
+        if not self.config.features.defer_noncritical:
+            return await self.load_discovered_features()
+
+        # Load only critical features now and the rest once the gateway is ready
+        deferred = [path for path, data in self.features.items() if not data["critical"]]
+        if deferred:
+            logger.info("Deferring %s features until ready...", len(deferred))
+            self.bot.add_listener(self._load_deferred_features, "on_ready")
+        return await self.load_discovered_features(
+            [path for path in self.features if path not in deferred]
+        )
+
+    async def _load_deferred_features(self):
+        # on_ready fires again after reconnects; only the first one loads
+        self.bot.remove_listener(self._load_deferred_features, "on_ready")
+        await self.load_discovered_features(
+            [path for path in self.features if path not in self.loaded_modules]
+        )
 
     async def discover_features(self, package_name: str = "src.cogs"):
-        """Automatically discover all feature modules"""
+        """Discover feature modules from the cached manifest, without importing them"""
         try:
-            package = importlib.import_module(package_name)
-            for _, name, is_pkg in pkgutil.iter_modules(package.__path__):
-                if is_pkg:
-                    await self.discover_features(f"{package_name}.{name}")
-                else:
-                    module_path = f"{package_name}.{name}"
-                    try:
-                        module = importlib.import_module(module_path)
-                        for item_name in dir(module):
-                            item = getattr(module, item_name)
-                            if (
-                                isinstance(item, type)
-                                and issubclass(item, commands.Cog)
-                                and item != commands.Cog
-                            ):
-                                category = getattr(
-                                    item, "__cog_category__", item.__cog_name__
-                                )
-                                self.features[module_path] = {
-                                    "class": item,
-                                    "category": category,
-                                    "description": getattr(
-                                        item, "__cog_description__", ""
-                                    ),
-                                    "enabled": True,
-                                }
-                    except Exception as e:
-                        logger.error(f"Failed to load module {module_path}: {str(e)}")
+            if package_name != self.manifest.package_name:
+                self.manifest = FeatureManifest(
+                    package_name, self.config.features.manifest_path
+                )
+            for module_path, entry in self.manifest.scan().items():
+                self._add_feature(module_path, entry)
         except Exception as e:
-            logger.error(f"Failed to discover features in {package_name}: {str(e)}")
+            logger.error("Failed to discover features in %s: %s", package_name, e)
+
+    def _add_feature(self, module_path: str, entry: Dict) -> bool:
+        cog = entry["cog"]
+        if cog is None or not entry["has_setup"]:
+            self.features.pop(module_path, None)
+            return False
+        self.features[module_path] = {
+            "class": None,
+            "class_name": cog["class_name"],
+            "cog_name": cog["name"],
+            "category": cog.get("cog_category") or cog["name"],
+            "description": cog.get("cog_description") or "",
+            "critical": bool(cog.get("cog_critical")),
+            "enabled": True,
+        }
+        return True
+
+    async def reload_changed_features(self) -> List[str]:
+        """Rescan the manifest and reload, load or unload the modules that changed"""
+        previous = self.manifest.entries
+        current = self.manifest.scan()
+        touched = []
+
+        for module_path in previous.keys() - current.keys():
+            self.features.pop(module_path, None)
+            if await self.unload_feature(module_path):
+                touched.append(module_path)
+
+        for module_path, entry in current.items():
+            old = previous.get(module_path)
+            if old is not None and (old["mtime"], old["size"]) == (
+                entry["mtime"],
+                entry["size"],
+            ):
+                continue
+            is_feature = self._add_feature(module_path, entry)
+            if self.loaded_modules.get(module_path):
+                if not is_feature:
+                    await self.unload_feature(module_path)
+                elif not await self.reload_feature(module_path):
+                    continue
+            elif is_feature:
+                self.loaded_modules.pop(module_path, None)
+                if not await self.load_discovered_features([module_path]):
+                    continue
+            else:
+                continue
+            touched.append(module_path)
+
+        return touched
 
-    async def load_discovered_features(self) -> bool:
-        """Load all discovered features"""
+    async def load_discovered_features(
+        self, module_paths: Optional[List[str]] = None
+    ) -> bool:
+        """Load discovered features, or only the given ones"""
         success = True
         loaded_features = []
         failed_features = []
 
         for module_path, feature in self.features.items():
+            if module_paths is not None and module_path not in module_paths:
+                continue
             if feature["enabled"]:
                 try:
+                    started = time.perf_counter()
                     await self.bot.load_extension(module_path)
+                    # Loading an extension is dominated by importing it
+                    import_timings[module_path] = (time.perf_counter() - started) * 1000
                     self.loaded_modules[module_path] = True
+                    cog = self.bot.get_cog(feature["cog_name"])
+                    feature["class"] = type(cog) if cog else None
                     loaded_features.append(feature["category"])
                 except Exception as e:
                     success = False
@@ -79,11 +137,15 @@ class FeatureManager:
         # Log results once
         if loaded_features:
             logger.info(
-                f"Successfully loaded {len(loaded_features)} features: {', '.join(loaded_features)}"
+                "Successfully loaded %s features: %s",
+                len(loaded_features),
+                ", ".join(loaded_features),
             )
         if failed_features:
             logger.error(
-                f"Failed to load {len(failed_features)} features: {', '.join(failed_features)}"
+                "Failed to load %s features: %s",
+                len(failed_features),
+                ", ".join(failed_features),
             )
 
         return success
@@ -93,13 +155,13 @@ class FeatureManager:
         try:
             if module_path in self.loaded_modules:
                 await self.bot.reload_extension(module_path)
-                logger.info(f"Reloaded feature: {module_path}")
+                logger.info("Reloaded feature: %s", module_path)
                 return True
             else:
-                logger.warning(f"Feature not loaded: {module_path}")
+                logger.warning("Feature not loaded: %s", module_path)
                 return False
         except Exception as e:
-            logger.error(f"Failed to reload {module_path}: {str(e)}")
+            logger.error("Failed to reload %s: %s", module_path, e)
             return False
 
     async def unload_feature(self, module_path: str) -> bool:
@@ -108,11 +170,11 @@ class FeatureManager:
             if module_path in self.loaded_modules:
                 await self.bot.unload_extension(module_path)
                 del self.loaded_modules[module_path]
-                logger.info(f"Unloaded feature: {module_path}")
+                logger.info("Unloaded feature: %s", module_path)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Failed to unload {module_path}: {str(e)}")
+            logger.error("Failed to unload %s: %s", module_path, e)
             return False
 
     def get_loaded_features(self) -> Dict[str, Dict]:
@@ -0,0 +1,151 @@
+import ast
+import importlib.util
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+from src.utils.logger import logger
+
+
+class FeatureManifest:
+    """Static index of the cogs under a package, cached by file mtime and size"""
+
+    version = 1
+
+    def __init__(self, package_name: str = "src.cogs", cache_path: Optional[str] = None):
+        self.package_name = package_name
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict] = {}
+
+    def package_dir(self) -> str:
+        # find_spec only imports the parent package, not the cogs themselves
+        spec = importlib.util.find_spec(self.package_name)
+        return list(spec.submodule_search_locations)[0]
+
+    def _iter_modules(self):
+        """Yield (module path, file path) for every non-package module"""
+        root = self.package_dir()
+        for directory, subdirs, files in os.walk(root):
+            # Only descend into real packages, like pkgutil.iter_modules would
+            subdirs[:] = sorted(
+                d
+                for d in subdirs
+                if os.path.isfile(os.path.join(directory, d, "__init__.py"))
+            )
+            relative = os.path.relpath(directory, root)
+            prefix = self.package_name
+            if relative != ".":
+                prefix += "." + relative.replace(os.sep, ".")
+            for file_name in sorted(files):
+                if file_name.endswith(".py") and file_name != "__init__.py":
+                    yield f"{prefix}.{file_name[:-3]}", os.path.join(directory, file_name)
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.version:
+                return {}
+            return data.get("modules", {})
+        except Exception as e:
+            logger.warning("Ignoring unreadable feature manifest: %s", e)
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            directory = os.path.dirname(self.cache_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # Unique temp file: cluster workers starting together all save it
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as f:
+                json.dump({"version": self.version, "modules": self.entries}, f, indent=2)
+            try:
+                os.replace(f.name, self.cache_path)
+            except OSError:
+                os.unlink(f.name)
+                raise
+        except Exception as e:
+            logger.warning("Failed to write feature manifest: %s", e)
+
+    @staticmethod
+    def _is_cog_base(base: ast.expr) -> bool:
+        if isinstance(base, ast.Attribute):
+            return base.attr == "Cog"
+        return isinstance(base, ast.Name) and base.id == "Cog"
+
+    @staticmethod
+    def _literal(node: ast.expr):
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, SyntaxError):
+            return None
+
+    @classmethod
+    def parse(cls, file_path: str) -> Dict:
+        """Read cog metadata from a module's source without importing it"""
+        with open(file_path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=file_path)
+
+        entry = {"cog": None, "has_setup": False}
+        for node in tree.body:
+            if (
+                isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and node.name == "setup"
+            ):
+                entry["has_setup"] = True
+            elif (
+                isinstance(node, ast.ClassDef)
+                and entry["cog"] is None
+                and any(cls._is_cog_base(base) for base in node.bases)
+            ):
+                cog = {"class_name": node.name, "name": node.name}
+                for keyword in node.keywords:
+                    if keyword.arg == "name":
+                        cog["name"] = cls._literal(keyword.value) or node.name
+                for item in node.body:
+                    if isinstance(item, ast.Assign):
+                        for target in item.targets:
+                            if isinstance(target, ast.Name) and target.id.startswith(
+                                "__cog_"
+                            ):
+                                cog[target.id.strip("_")] = cls._literal(item.value)
+                entry["cog"] = cog
+        return entry
+
+    def scan(self) -> Dict[str, Dict]:
+        """Return manifest entries, reparsing only files whose mtime or size changed"""
+        cached = self._load_cache()
+        entries: Dict[str, Dict] = {}
+        reparsed = 0
+
+        for module_path, file_path in self._iter_modules():
+            stat = os.stat(file_path)
+            entry = cached.get(module_path)
+            if (
+                entry is None
+                or entry["file"] != file_path
+                or entry["mtime"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                try:
+                    entry = self.parse(file_path)
+                except Exception as e:
+                    logger.error("Failed to parse module %s: %s", module_path, e)
+                    continue
+                entry.update(file=file_path, mtime=stat.st_mtime_ns, size=stat.st_size)
+                reparsed += 1
+            entries[module_path] = entry
+
+        changed = reparsed or entries.keys() != cached.keys()
+        self.entries = entries
+        if changed:
+            self._save_cache()
+        logger.debug(
+            "Feature manifest: %s modules, %s reparsed", len(entries), reparsed
+        )
+        return entries
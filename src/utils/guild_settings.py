@@ -0,0 +1,96 @@
+import asyncio
+from typing import Dict, Optional
+from src.database.repositories.settings_repository import SettingsRepository
+from src.utils.logger import logger
+
+# Value of every setting that has never been written, bot-wide or per guild
+DEFAULTS: Dict[str, bool] = {
+    "enable_commands": True,
+    "enable_logging": True,
+    "enable_analytics": False,
+    "strict_permissions": False,
+    "allow_dm_commands": True,
+    "require_verification": False,
+    "enable_ai": True,
+    "enable_moderation": False,
+    "enable_utilities": True,
+}
+
+
+class GuildSettings:
+    """
+    In-memory copy of the settings table for hot-path checks. Reads never touch
+    the database; a background task polls the settings version and pulls only
+    rows written since, so writes from other processes show up lazily.
+    """
+
+    # Seconds between version checks
+    refresh_interval = 5.0
+
+    def __init__(self):
+        self.repo = SettingsRepository()
+        self.version = 0
+        # Bot-wide values (guild 0) over DEFAULTS, and per-guild overrides
+        self._global: Dict[str, bool] = dict(DEFAULTS)
+        self._guilds: Dict[int, Dict[str, bool]] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def is_enabled(self, guild_id: Optional[int], key: str) -> bool:
+        """Resolve a flag for a guild (None or 0 for bot-wide) from memory"""
+        guild = self._guilds.get(guild_id) if guild_id else None
+        if guild is not None:
+            value = guild.get(key)
+            if value is not None:
+                return value
+        return self._global.get(key, False)
+
+    def get_all(self, guild_id: Optional[int] = None) -> Dict[str, bool]:
+        """Effective value of every setting for a guild, or bot-wide"""
+        return {**self._global, **self._guilds.get(guild_id or 0, {})}
+
+    def _apply(self, guild_id: int, key: str, enabled: bool) -> None:
+        if guild_id == 0:
+            self._global[key] = enabled
+        else:
+            self._guilds.setdefault(guild_id, {})[key] = enabled
+
+    async def set(self, guild_id: Optional[int], key: str, enabled: bool) -> None:
+        """Store a setting (None or 0 for bot-wide) and apply it locally at once"""
+        await self.repo.set_setting(guild_id or 0, key, enabled)
+        self._apply(guild_id or 0, key, enabled)
+
+    async def refresh(self) -> int:
+        """Pull settings written since the last refresh; returns how many"""
+        async with self._lock:
+            version = await self.repo.get_version()
+            if version <= self.version:
+                return 0
+            rows = await self.repo.get_changed_since(self.version)
+            for row in rows:
+                self._apply(row.guild_id, row.key, row.enabled)
+            self.version = max([version, *(row.version for row in rows)])
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Failed to refresh settings: %s", e)
+
+    def start(self) -> None:
+        """Start polling for settings written by other processes"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
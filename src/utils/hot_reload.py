@@ -0,0 +1,175 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+from typing import Dict, Optional, Tuple
+from discord.ext import commands
+from src.utils.logger import logger
+
+
+class _Inotify:
+    """Minimal inotify binding (Linux only) watching directories for .py changes"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> None:
+        # Re-adding an existing path just returns its watch descriptor
+        if self._libc.inotify_add_watch(self.fd, path.encode(), self.MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+
+    def read_names(self):
+        """Yield the file names of all pending events"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            yield data[offset : offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class CogWatcher:
+    """Reloads changed cogs while the bot runs, then re-syncs changed command scopes"""
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+    ):
+        self.bot = bot
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def root(self) -> str:
+        return self.bot.feature_manager.manifest.package_dir()
+
+    def _package_dirs(self):
+        for directory, subdirs, _ in os.walk(self.root):
+            subdirs[:] = [
+                d
+                for d in subdirs
+                if os.path.isfile(os.path.join(directory, d, "__init__.py"))
+            ]
+            yield directory
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory in self._package_dirs():
+            for name in os.listdir(directory):
+                if name.endswith(".py"):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    async def _apply_changes(self) -> None:
+        """Reload the extensions whose files changed and resync their commands"""
+        try:
+            reloaded = await self.bot.feature_manager.reload_changed_features()
+            if not reloaded:
+                return
+            logger.info(
+                "Hot reloaded %s features: %s", len(reloaded), ", ".join(reloaded)
+            )
+            await self.bot.command_syncer.sync_all_guilds()
+        except Exception as e:
+            logger.error("Hot reload failed: %s", e)
+
+    async def _watch_inotify(self, inotify: _Inotify) -> None:
+        changed = asyncio.Event()
+
+        def on_readable():
+            if any(name.endswith(".py") for name in inotify.read_names()):
+                changed.set()
+
+        loop = asyncio.get_running_loop()
+        loop.add_reader(inotify.fd, on_readable)
+        try:
+            while True:
+                for directory in self._package_dirs():
+                    inotify.add_watch(directory)
+                await changed.wait()
+
+                # Debounce: wait until a burst of saves has gone quiet
+                while True:
+                    changed.clear()
+                    try:
+                        await asyncio.wait_for(changed.wait(), self.debounce)
+                    except asyncio.TimeoutError:
+                        break
+                await self._apply_changes()
+        finally:
+            loop.remove_reader(inotify.fd)
+            inotify.close()
+
+    async def _watch_polling(self) -> None:
+        snapshot = self._snapshot()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = self._snapshot()
+            if current == snapshot:
+                continue
+
+            # Debounce: wait until the tree stops changing
+            while True:
+                await asyncio.sleep(self.debounce)
+                settled = self._snapshot()
+                if settled == current:
+                    break
+                current = settled
+            snapshot = current
+            await self._apply_changes()
+
+    async def _run(self) -> None:
+        try:
+            inotify = _Inotify()
+        except OSError as e:
+            logger.warning("inotify unavailable (%s), polling %s instead", e, self.root)
+            await self._watch_polling()
+        else:
+            logger.info("Watching %s for cog changes", self.root)
+            await self._watch_inotify(inotify)
+
+    def start(self) -> None:
+        """Start watching the cogs package in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop watching"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
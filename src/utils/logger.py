@@ -1,7 +1,124 @@
 # src/utils/logger.py
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
+import time
+from datetime import datetime, timezone
+from src.config import Config, cluster_path
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class lazy:
+    """Log argument computed only if the record is actually emitted
+
+    logger.debug("Payload: %s", lazy(json.dumps, payload))
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+    __repr__ = __str__
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets `burst` records per call site through per `interval` seconds
+
+    Records at or above `level` are limited. When a window that suppressed
+    records ends, `emit` is called with a summary record naming the call site
+    and the count, whether or not that site logs again.
+    """
+
+    def __init__(
+        self,
+        burst: int,
+        interval: float,
+        level: int = logging.WARNING,
+        emit=None,
+    ):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.level = level
+        self.emit = emit
+        # (pathname, lineno) -> [window start, emitted in window, suppressed]
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < self.level or self.burst <= 0:
+            return True
+        now = time.monotonic()
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.interval:
+                self._sites[key] = [now, 1, 0]
+                return True
+            if site[1] < self.burst:
+                site[1] += 1
+                return True
+            site[2] += 1
+            if site[2] == 1:
+                # First suppression in this window: report when it closes
+                timer = threading.Timer(
+                    site[0] + self.interval - now,
+                    self._summarize,
+                    (key, site, record),
+                )
+                timer.daemon = True
+                timer.start()
+            return False
+
+    def _summarize(self, key, site, record) -> None:
+        with self._lock:
+            suppressed, site[2] = site[2], 0
+        if suppressed and self.emit is not None:
+            self.emit(
+                logging.LogRecord(
+                    record.name,
+                    record.levelno,
+                    record.pathname,
+                    record.lineno,
+                    "Suppressed %d similar messages from %s:%d in the last %gs",
+                    (suppressed, record.filename, record.lineno, self.interval),
+                    None,
+                    record.funcName,
+                )
+            )
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random fraction of DEBUG records (or of any record that sets
+    extra={"sample_rate": ...}); kept records note the rate they were sampled at
+    """
+
+    def __init__(self, debug_rate: float = 1.0):
+        super().__init__()
+        self.debug_rate = debug_rate
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", None)
+        if rate is None:
+            if record.levelno != logging.DEBUG or self.debug_rate >= 1:
+                return True
+            rate = record.sample_rate = self.debug_rate
+        return random.random() < rate
 
 
 class SingletonLogger:
@@ -17,10 +134,47 @@ class SingletonLogger:
         }
         RESET = "\033[0m"
 
-        def format(self, record):
+        def formatMessage(self, record):
+            # Color a copy so other handlers still see the original message
+            colored = copy.copy(record)
             log_color = self.COLORS.get(record.levelname, self.RESET)
-            record.msg = f"{log_color}{record.msg}{self.RESET}"
-            return super().format(record)
+            colored.message = f"{log_color}{record.message}{self.RESET}"
+            return super().formatMessage(colored)
+
+    class JSONFormatter(logging.Formatter):
+        """One JSON object per line, with any `extra` fields included"""
+
+        def format(self, record):
+            entry = {
+                "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+                "module": record.module,
+                "function": record.funcName,
+                "line": record.lineno,
+            }
+            if record.exc_info:
+                entry["exception"] = self.formatException(record.exc_info)
+            elif record.exc_text:
+                entry["exception"] = record.exc_text
+            for key, value in vars(record).items():
+                if key not in _RECORD_ATTRIBUTES:
+                    entry[key] = value
+            return json.dumps(entry, default=str)
+
+    class QueueHandler(logging.handlers.QueueHandler):
+        def prepare(self, record):
+            # Resolve the message on the calling thread, but keep the traceback
+            # separate from it so the file sink can store it as its own field
+            record = copy.copy(record)
+            record.message = record.getMessage()
+            record.msg = record.message
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            return record
 
     def __new__(cls):
         if cls._instance is None:
@@ -29,14 +183,71 @@ class SingletonLogger:
         return cls._instance
 
     def _initialize_logger(self):
+        config = Config().logging
         self.logger = logging.getLogger("AIChatbotLogger")
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(config.level.upper())
+        self.logger.propagate = False
+
+        handlers = []
+        self.console = logging.StreamHandler(sys.stdout)
+        self.console.setFormatter(self.ColoredFormatter(config.format))
+        handlers.append(self.console)
+
+        try:
+            os.makedirs(config.directory, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(config.directory, cluster_path(config.file_name)),
+                maxBytes=config.max_bytes,
+                backupCount=config.backup_count,
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(self.JSONFormatter())
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"File logging disabled: {e}", file=sys.stderr)
 
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(
-            self.ColoredFormatter("%(asctime)s - %(levelname)s - %(message)s")
+        # Callers only enqueue records; a background thread does the slow
+        # terminal and disk writes, so they never block the event loop
+        log_queue = queue.SimpleQueue()
+        queue_handler = self.QueueHandler(log_queue)
+        # Filters run before a record is formatted or queued, so dropped
+        # records cost next to nothing
+        self.sampling = SamplingFilter(config.debug_sample_rate)
+        self.rate_limit = RateLimitFilter(
+            config.rate_limit_burst,
+            config.rate_limit_interval,
+            logging.getLevelName(config.rate_limit_level.upper()),
+            # Summaries skip the filters, or they'd be rate limited themselves
+            emit=queue_handler.emit,
         )
-        self.logger.addHandler(handler)
+        queue_handler.addFilter(self.sampling)
+        queue_handler.addFilter(self.rate_limit)
+        self.logger.addHandler(queue_handler)
+        self.listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        self._listening = True
+        # Drain whatever is still queued when the process exits
+        atexit.register(self.shutdown)
+        Config().subscribe("logging", self._apply_config)
+
+    def _apply_config(self, changes):
+        """Apply a reloaded LoggingConfig; moving the log file needs a restart"""
+        config = Config().logging
+        self.logger.setLevel(config.level.upper())
+        if "format" in changes:
+            self.console.setFormatter(self.ColoredFormatter(config.format))
+        self.sampling.debug_rate = config.debug_sample_rate
+        self.rate_limit.burst = config.rate_limit_burst
+        self.rate_limit.interval = config.rate_limit_interval
+        self.rate_limit.level = logging.getLevelName(config.rate_limit_level.upper())
+
+    def shutdown(self):
+        """Write out queued records and stop the background writer"""
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
 
     def get_logger(self):
         return self.logger
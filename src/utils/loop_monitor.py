@@ -0,0 +1,171 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional
+from src.utils.logger import logger
+from src.utils.metrics import loop_lag_seconds, loop_stalls
+
+
+class BlockingCallError(AssertionError):
+    """Raised by no_blocking() when something held the event loop too long"""
+
+
+@dataclass
+class Stall:
+    duration_ms: float
+    task: Optional[str] = None
+    stack: Optional[str] = None
+
+    def __str__(self) -> str:
+        where = self.task or "a callback"
+        text = f"Event loop blocked for {self.duration_ms:.0f}ms in {where}"
+        return f"{text}\n{self.stack}" if self.stack else text
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag by timing how late a periodic sleep wakes up. A
+    watchdog thread notices when that wakeup is overdue by more than
+    threshold_ms and captures the loop thread's stack while it is still
+    blocked, so the log shows what was holding the loop, not just that it was.
+
+    A block only shows up as lag by however much it overruns the next wakeup,
+    so the interval is capped at a fifth of the threshold: any block longer
+    than 1.2x the threshold is always caught.
+    """
+
+    # Largest interval allowed, as a fraction of the threshold
+    max_interval_ratio = 0.2
+
+    def __init__(
+        self, interval: float = 0.05, threshold_ms: float = 250, strict: bool = False
+    ):
+        self.interval = min(interval, threshold_ms / 1000 * self.max_interval_ratio)
+        self.threshold_ms = threshold_ms
+        # Keep every stall so tests can fail on them (see no_blocking)
+        self.strict = strict
+        self.stalls: List[Stall] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        # Monotonic time the sampler is due to wake up next
+        self._due = 0.0
+        # (due time, task name, stack) captured by the watchdog for one stall
+        self._captured = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    async def _sample(self) -> None:
+        threshold = self.threshold_ms / 1000
+        while True:
+            # The first wakeup is due from start(), so a stall that begins
+            # before this task first runs is still measured
+            await asyncio.sleep(max(0.0, self._due - time.monotonic()))
+            now = time.monotonic()
+            due, self._due = self._due, now + self.interval
+            lag = max(0.0, now - due)
+            loop_lag_seconds.observe(lag)
+            if lag < threshold:
+                continue
+
+            loop_stalls.inc()
+            captured = self._captured
+            stall = Stall(lag * 1000)
+            if captured is not None and captured[0] == due:
+                stall.task, stall.stack = captured[1], captured[2]
+            logger.warning(
+                "Event loop blocked for %.0fms in %s",
+                stall.duration_ms,
+                stall.task or "a callback",
+            )
+            if self.strict:
+                self.stalls.append(stall)
+
+    def _current_task_name(self) -> Optional[str]:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        if task is None:
+            return None
+        coro = task.get_coro()
+        return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    def _watch(self) -> None:
+        threshold = self.threshold_ms / 1000
+        check_every = min(threshold / 4, self.interval)
+        while not self._stopping.wait(check_every):
+            due = self._due
+            if time.monotonic() - due < threshold or (
+                self._captured is not None and self._captured[0] == due
+            ):
+                continue
+
+            # The loop thread is still inside whatever blocked it
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = self._current_task_name()
+            stack = "".join(traceback.format_stack(frame))
+            self._captured = (due, task, stack)
+            logger.warning(
+                "Event loop blocked for over %.0fms in %s:\n%s",
+                self.threshold_ms,
+                task or "a callback",
+                stack,
+            )
+
+    def start(self) -> None:
+        """Start sampling lag on the running loop and the watchdog thread"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._due = time.monotonic() + self.interval
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._sample(), name="loop-monitor")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop sampling and the watchdog thread"""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+@asynccontextmanager
+async def no_blocking(threshold_ms: float = 50):
+    """
+    Fail with BlockingCallError if anything in the block holds the event loop
+    for longer than threshold_ms, e.g. in tests:
+
+        async with no_blocking(20):
+            await provider.chat_completion(messages)
+    """
+    monitor = LoopMonitor(
+        interval=threshold_ms / 10000, threshold_ms=threshold_ms, strict=True
+    )
+    monitor.start()
+    try:
+        yield monitor
+        # Let the sampler wake up once more to measure a stall at the very end
+        await asyncio.sleep(monitor.interval * 2)
+    finally:
+        await monitor.stop()
+    if monitor.stalls:
+        raise BlockingCallError("\n\n".join(str(stall) for stall in monitor.stalls))
@@ -0,0 +1,436 @@
+import discord
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from aiohttp import web
+from src.database.cache import get_cache_stats
+from src.database.instrumentation import LATENCY_BUCKETS_MS, query_stats
+from src.utils.logger import logger
+
+# Default histogram bucket upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LLM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Metric:
+    """
+    A metric family with one child per label combination. Recording is a
+    dict lookup plus an in-place update on the event loop thread, so no locks
+    are taken and nothing is allocated once a child exists.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def expose(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> List[str]:
+        name = f"{self.name}_total"
+        return [
+            f"{name}{_labels(self.labelnames, values)} {_number(child.value)}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}"
+            for values, child in list(self._children.items())
+        ]
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            lines.extend(
+                histogram_samples(
+                    self.name,
+                    self.labelnames,
+                    values,
+                    self.buckets,
+                    child.counts,
+                    child.sum,
+                    child.count,
+                )
+            )
+        return lines
+
+
+def histogram_samples(
+    name: str,
+    labelnames: Sequence[str],
+    values: Sequence,
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+    count: int,
+) -> List[str]:
+    """Render per-bucket counts as cumulative Prometheus histogram samples"""
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip([*bounds, math.inf], counts):
+        cumulative += bucket_count
+        le = _labels(labelnames, values, f'le="{_number(bound)}"')
+        lines.append(f"{name}_bucket{le} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labelnames, values)} {_number(float(total))}")
+    lines.append(f"{name}_count{_labels(labelnames, values)} {count}")
+    return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Metric read at scrape time from state kept elsewhere (gateway latency,
+    cache counters, memory sizes), so it costs nothing between scrapes.
+    The callback returns a value, or a dict of label values -> value.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], object],
+        labelnames: Sequence[str] = (),
+        type: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = type
+
+    def samples(self) -> List[str]:
+        value = self.callback()
+        if value is None:
+            return []
+        values = value if isinstance(value, dict) else {(): value}
+        suffix = "_total" if self.type == "counter" else ""
+        return [
+            f"{self.name}{suffix}{_labels(self.labelnames, labels)} {_number(sample)}"
+            for labels, sample in values.items()
+            if sample is not None and not math.isnan(sample)
+        ]
+
+
+class QueryStatsMetric(Metric):
+    """Exposes the database instrumentation's all-statements latency histogram"""
+
+    type = "histogram"
+
+    def samples(self) -> List[str]:
+        histogram = query_stats.overall
+        return histogram_samples(
+            self.name,
+            (),
+            (),
+            [bound / 1000 for bound in LATENCY_BUCKETS_MS],
+            histogram.counts,
+            histogram.total_ms / 1000,
+            histogram.count,
+        )
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric, replacing any earlier one of the same name"""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def expose(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                lines.extend(metric.expose())
+            except Exception as e:
+                logger.error("Failed to collect metric %s: %s", metric.name, e)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+llm_request_seconds = registry.register(
+    Histogram(
+        "bot_llm_request_seconds",
+        "LLM completion latency",
+        ("provider", "model"),
+        LLM_LATENCY_BUCKETS,
+    )
+)
+llm_tokens = registry.register(
+    Histogram(
+        "bot_llm_tokens",
+        "Tokens used per LLM completion",
+        ("provider", "model", "kind"),
+        TOKEN_BUCKETS,
+    )
+)
+llm_errors = registry.register(
+    Counter("bot_llm_errors", "LLM completions that raised", ("provider",))
+)
+message_seconds = registry.register(
+    Histogram(
+        "bot_message_seconds",
+        "on_message handling time for messages the bot answers",
+    )
+)
+command_seconds = registry.register(
+    Histogram(
+        "bot_app_command_seconds",
+        "Slash command latency from interaction creation to completion",
+        ("command",),
+    )
+)
+loop_lag_seconds = registry.register(
+    Histogram(
+        "bot_event_loop_lag_seconds",
+        "How late the event loop ran a timer that was due",
+        buckets=LOOP_LAG_BUCKETS,
+    )
+)
+loop_stalls = registry.register(
+    Counter("bot_event_loop_stalls", "Times a callback blocked the event loop")
+)
+registry.register(
+    QueryStatsMetric("bot_db_query_seconds", "Database statement execution time")
+)
+registry.register(
+    CallbackMetric(
+        "bot_db_slow_queries",
+        "Statements slower than the slow query threshold",
+        lambda: query_stats.slow_queries,
+        type="counter",
+    )
+)
+
+
+def _cache_stat(name: str) -> Callable[[], Dict[LabelValues, float]]:
+    return lambda: {(table,): stats[name] for table, stats in get_cache_stats().items()}
+
+
+registry.register(
+    CallbackMetric(
+        "bot_cache_hits",
+        "Repository cache hits, including cached misses",
+        lambda: {
+            (table,): stats["hits"] + stats["negative_hits"]
+            for table, stats in get_cache_stats().items()
+        },
+        ("table",),
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "bot_cache_misses",
+        "Repository cache misses",
+        _cache_stat("misses"),
+        ("table",),
+        type="counter",
+    )
+)
+registry.register(
+    CallbackMetric(
+        "bot_cache_hit_ratio",
+        "Repository cache hit rate",
+        _cache_stat("hit_rate"),
+        ("table",),
+    )
+)
+registry.register(
+    CallbackMetric(
+        "bot_cache_entries", "Repository cache size", _cache_stat("size"), ("table",)
+    )
+)
+
+
+async def on_app_command_completion(interaction: discord.Interaction, command) -> None:
+    elapsed = discord.utils.utcnow() - interaction.created_at
+    command_seconds.labels(command.qualified_name).observe(elapsed.total_seconds())
+
+
+def setup_bot_metrics(bot, handler) -> None:
+    """Metrics that read from a running bot and its LLM interaction handler"""
+    # Module-level listener, so calling this again replaces it instead of
+    # counting every command twice
+    bot.remove_listener(on_app_command_completion)
+    bot.add_listener(on_app_command_completion)
+
+    registry.register(
+        CallbackMetric(
+            "bot_gateway_latency_seconds",
+            "Discord gateway heartbeat latency",
+            lambda: bot.latency,
+        )
+    )
+    registry.register(
+        CallbackMetric(
+            "bot_memory_stores",
+            "Short-term conversation memories held",
+            lambda: len(handler.memories),
+        )
+    )
+    registry.register(
+        CallbackMetric(
+            "bot_memory_messages",
+            "Messages held across short-term conversation memories",
+            lambda: sum(
+                len(memory.messages) for memory in list(handler.memories.values())
+            ),
+        )
+    )
+
+
+class MetricsServer:
+    """Serves the registry at /metrics for Prometheus to scrape"""
+
+    def __init__(self, host: str, port: int, registry: MetricsRegistry = registry):
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.expose().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logger.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
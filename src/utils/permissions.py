@@ -28,6 +28,15 @@ class PermissionManager:
             "moderate_members": "moderate_members",
         }
 
+        # Default values for bot-specific permissions
+        self.default_values = {
+            "can_use_bot": True,
+            "can_manage_permissions": False,
+            "can_use_admin_commands": False,
+            "max_requests_per_day": 100,
+            "max_tokens_per_day": 100_000,
+        }
+
     async def check_permission(
         self,
         guild_id: int,
@@ -73,15 +82,7 @@ class PermissionManager:
                     return False
                 return getattr(channel_perms, permission_name)
 
-        # Default values for bot-specific permissions
-        default_values = {
-            "can_use_bot": True,
-            "can_manage_permissions": False,
-            "can_use_admin_commands": False,
-            "max_requests_per_day": 100,
-        }
-
-        return default_values.get(permission_name, False)
+        return self.default_values.get(permission_name, False)
 
     async def get_effective_permissions(
         self,
@@ -106,6 +107,7 @@ class PermissionManager:
             "can_manage_permissions",
             "can_use_admin_commands",
             "max_requests_per_day",
+            "max_tokens_per_day",
         ]:
             effective_perms[perm_name] = await self.check_permission(
                 guild_id, user, perm_name, channel
@@ -122,26 +124,14 @@ class PermissionManager:
         **permissions,
     ) -> bool:
         """Set permissions for a target"""
-        existing = await self.repo.get_permissions(target_type, target_id, guild_id)
-
-        if existing:
-            return (
-                await self.repo.update(
-                    existing.id, permission_type=permission_type, **permissions
-                )
-                is not None
-            )
-        else:
-            return (
-                await self.repo.create(
-                    target_type=target_type,
-                    target_id=target_id,
-                    guild_id=guild_id,
-                    permission_type=permission_type,
-                    **permissions,
-                )
-                is not None
-            )
+        await self.repo.upsert_permissions(
+            target_type,
+            target_id,
+            guild_id,
+            permission_type=permission_type,
+            **permissions,
+        )
+        return True
 
 
 permission_manager = PermissionManager()
@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the live process: a background thread records
+    the stack of the given threads (default: every other thread) every
+    `interval` seconds. Nothing is hooked into the profiled code, so the
+    cost is one stack walk per thread per sample.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: Optional[Iterable[int]] = None,
+        max_depth: int = 128,
+    ):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.max_depth = max_depth
+        # Collapsed stack -> samples
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self.duration = 0.0
+        self._labels: Dict[object, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            file_name = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({file_name}:{code.co_firstlineno})"
+            label = self._labels[code] = label.replace(";", ":")
+        return label
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (
+                self.thread_ids is not None and thread_id not in self.thread_ids
+            ):
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self.stacks.clear()
+        self.samples = 0
+        self.started = time.monotonic()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self.duration = time.monotonic() - self.started
+
+    def collapsed(self) -> str:
+        """Samples in the collapsed stack format read by flamegraph.pl,
+        speedscope and inferno"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def top_functions(self, limit: int = 10) -> List[tuple]:
+        """(function, share of samples) for the functions most often on-CPU
+        at the top of a stack"""
+        own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = sum(own.values()) or 1
+        return [(name, count / total) for name, count in own.most_common(limit)]
+
+
+class HeapDiff:
+    """Allocation growth between two tracemalloc snapshots"""
+
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self._started_tracing = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+
+    @staticmethod
+    def _filter(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        return snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+        )
+
+    def start(self) -> None:
+        # Leave tracing alone if it was already on (e.g. PYTHONTRACEMALLOC)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._before = self._filter(tracemalloc.take_snapshot())
+
+    def stop(self, group_by: str = "lineno") -> List[tracemalloc.StatisticDiff]:
+        """Stop tracing (if started here) and return the growth, largest first"""
+        after = self._filter(tracemalloc.take_snapshot())
+        self.cancel()
+        return after.compare_to(self._before, group_by)
+
+    def cancel(self) -> None:
+        """Stop tracing without diffing, e.g. when the session was aborted"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @staticmethod
+    def format(stats: List[tracemalloc.StatisticDiff], limit: Optional[int] = None):
+        lines = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks) "
+                f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            )
+        return lines
@@ -0,0 +1,192 @@
+import time
+from typing import Dict, Optional, Tuple
+import discord
+from src.config import LLMConfig
+from src.utils.permissions import PermissionManager
+from src.utils.usage_buffer import UsageBuffer
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "level", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate  # units added per second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, amount: float = 1) -> bool:
+        self._refill()
+        return self.level >= amount
+
+    def consume(self, amount: float) -> None:
+        """Take units unconditionally; the level may go negative (debt)"""
+        self._refill()
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return units taken by consume() for a request that was rejected later"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    @property
+    def is_full(self) -> bool:
+        self._refill()
+        return self.level >= self.capacity
+
+
+class QuotaManager:
+    """
+    Per-user and per-guild LLM quota checks for the message hot path.
+    Burst limits are in-memory token buckets, daily limits come from the
+    permission hierarchy (cached) and daily counters from the UsageBuffer.
+    """
+
+    # Drop idle, fully refilled buckets once this many are tracked
+    max_buckets = 10_000
+    # Minimum seconds between "over quota" replies to the same user
+    notify_interval = 60
+
+    def __init__(
+        self, permissions: PermissionManager, usage: UsageBuffer, config: LLMConfig
+    ):
+        self.permissions = permissions
+        self.usage = usage
+        self.config = config
+
+        self._buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        self._limits: Dict[Tuple[int, int], Tuple[float, int, int]] = {}
+        self._notified: Dict[int, float] = {}
+
+    def _bucket(self, scope: str, id: int) -> TokenBucket:
+        bucket = self._buckets.get((scope, id))
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune_buckets()
+            bucket = TokenBucket(*self._bucket_settings(scope))
+            self._buckets[(scope, id)] = bucket
+        return bucket
+
+    def _bucket_settings(self, scope: str) -> Tuple[float, float]:
+        """(capacity, refill per second) for a bucket scope"""
+        if scope == "user":
+            return self.config.user_burst, self.config.user_requests_per_minute / 60
+        if scope == "guild":
+            return self.config.guild_burst, self.config.guild_requests_per_minute / 60
+        return self.config.user_tokens_per_minute, self.config.user_tokens_per_minute / 60
+
+    def apply_config(self, changes) -> None:
+        """Resize live buckets after an LLMConfig reload, keeping their levels"""
+        for (scope, _), bucket in self._buckets.items():
+            bucket._refill()
+            bucket.capacity, bucket.rate = self._bucket_settings(scope)
+            bucket.level = min(bucket.level, bucket.capacity)
+        if "limits_ttl" in changes:
+            self._limits.clear()
+
+    def _prune_buckets(self) -> None:
+        for key in [key for key, bucket in self._buckets.items() if bucket.is_full]:
+            del self._buckets[key]
+
+    async def _get_limits(self, message: discord.Message) -> Tuple[int, int]:
+        """Resolve (max_requests_per_day, max_tokens_per_day) for the author"""
+        guild_id = message.guild.id if message.guild else 0
+        key = (guild_id, message.author.id)
+        cached = self._limits.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        if message.guild and isinstance(message.author, discord.Member):
+            max_requests = await self.permissions.check_permission(
+                guild_id, message.author, "max_requests_per_day", message.channel
+            )
+            max_tokens = await self.permissions.check_permission(
+                guild_id, message.author, "max_tokens_per_day", message.channel
+            )
+        else:
+            max_requests = self.permissions.default_values["max_requests_per_day"]
+            max_tokens = self.permissions.default_values["max_tokens_per_day"]
+
+        max_requests = self._limit(max_requests, "max_requests_per_day")
+        max_tokens = self._limit(max_tokens, "max_tokens_per_day")
+
+        if len(self._limits) >= self.max_buckets:
+            now = time.monotonic()
+            self._limits = {k: v for k, v in self._limits.items() if v[0] > now}
+        self._limits[key] = (
+            time.monotonic() + self.config.limits_ttl,
+            max_requests,
+            max_tokens,
+        )
+        return max_requests, max_tokens
+
+    def _limit(self, value, name: str) -> int:
+        # check_permission answers False for DENY rows and unset columns;
+        # only a real number overrides the default limit
+        if isinstance(value, bool) or not isinstance(value, int):
+            return self.permissions.default_values[name]
+        return value
+
+    async def check(self, message: discord.Message) -> Optional[str]:
+        """
+        Count a request against the author's quotas.
+        Returns None if it is allowed, otherwise a reason to show the user.
+        """
+        user_id = message.author.id
+        guild_id = message.guild.id if message.guild else None
+
+        # In-memory burst limits first, so floods are rejected without any I/O
+        user_bucket = self._bucket("user", user_id)
+        guild_bucket = self._bucket("guild", guild_id) if guild_id else None
+        if not user_bucket.available() or (
+            guild_bucket is not None and not guild_bucket.available()
+        ):
+            return "You're sending requests too quickly. Please slow down."
+        if not self._bucket("tokens", user_id).available():
+            return "You've used a lot of tokens recently. Please wait a moment."
+
+        # Take the burst slots before the first await, so concurrent messages
+        # from the same user can't all pass the check above
+        user_bucket.consume(1)
+        if guild_bucket is not None:
+            guild_bucket.consume(1)
+
+        max_requests, max_tokens = await self._get_limits(message)
+        requests, tokens = await self.usage.get_usage(guild_id, user_id)
+        if requests >= max_requests or tokens >= max_tokens:
+            user_bucket.refund(1)
+            if guild_bucket is not None:
+                guild_bucket.refund(1)
+            return "You've reached your daily usage limit. Try again tomorrow."
+
+        self.usage.record(guild_id, user_id, requests=1)
+        return None
+
+    def record_tokens(self, message: discord.Message, tokens: int) -> None:
+        """Feed provider token usage back into the buckets and daily counters"""
+        self._bucket("tokens", message.author.id).consume(tokens)
+        self.usage.record(
+            message.guild.id if message.guild else None,
+            message.author.id,
+            requests=0,
+            tokens=tokens,
+        )
+
+    def should_notify(self, user_id: int) -> bool:
+        """Rate-limit over-quota replies so rejected floods stay quiet"""
+        now = time.monotonic()
+        if now - self._notified.get(user_id, 0) < self.notify_interval:
+            return False
+        if len(self._notified) >= self.max_buckets:
+            self._notified = {
+                id: at
+                for id, at in self._notified.items()
+                if now - at < self.notify_interval
+            }
+        self._notified[user_id] = now
+        return True
@@ -0,0 +1,92 @@
+import asyncio
+import importlib
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Awaitable, Callable, Dict, List, Sequence
+from src.utils.logger import logger
+
+# Wall-clock milliseconds spent importing each module loaded via timed_import
+import_timings: Dict[str, float] = {}
+
+
+def timed_import(name: str) -> ModuleType:
+    """Import a module on first use and record how long the import took"""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    if name not in import_timings:
+        import_timings[name] = (time.perf_counter() - started) * 1000
+        logger.debug("Imported %s in %.1fms", name, import_timings[name])
+    return module
+
+
+@dataclass
+class _Phase:
+    name: str
+    func: Callable[[], Awaitable]
+    after: Sequence[str]
+    started_ms: float = 0.0
+    duration_ms: float = 0.0
+
+
+@dataclass
+class StartupPipeline:
+    """Runs startup phases concurrently, each as soon as its dependencies finish"""
+
+    phases: Dict[str, _Phase] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    def add(self, name: str, func: Callable[[], Awaitable], after: Sequence[str] = ()):
+        """Register a phase that starts once every phase in `after` has finished"""
+        for dependency in after:
+            if dependency not in self.phases:
+                raise ValueError(f"Phase {name} depends on unknown phase {dependency}")
+        self.phases[name] = _Phase(name, func, tuple(after))
+
+    async def run(self) -> None:
+        """Run every phase, failing fast if any phase raises"""
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_phase(phase: _Phase):
+            await asyncio.gather(*(tasks[name] for name in phase.after))
+            phase.started_ms = (time.perf_counter() - started) * 1000
+            await phase.func()
+            phase.duration_ms = (
+                (time.perf_counter() - started) * 1000 - phase.started_ms
+            )
+
+        # Phases can only depend on earlier ones, so creation order is valid
+        for name, phase in self.phases.items():
+            tasks[name] = asyncio.create_task(run_phase(phase), name=f"startup:{name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        finally:
+            self.total_ms = (time.perf_counter() - started) * 1000
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        """Start offset and duration of each phase, in milliseconds"""
+        return {
+            name: {"start_ms": phase.started_ms, "duration_ms": phase.duration_ms}
+            for name, phase in self.phases.items()
+        }
+
+    def report(self) -> List[str]:
+        """Human-readable timing breakdown of phases and timed imports"""
+        lines = [f"Startup completed in {self.total_ms:.1f}ms"]
+        for phase in sorted(self.phases.values(), key=lambda p: p.started_ms):
+            lines.append(
+                f"  phase {phase.name}: {phase.duration_ms:.1f}ms "
+                f"(started at {phase.started_ms:.1f}ms)"
+            )
+        for name, duration in sorted(
+            import_timings.items(), key=lambda item: item[1], reverse=True
+        ):
+            lines.append(f"  import {name}: {duration:.1f}ms")
+        return lines
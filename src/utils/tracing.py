@@ -0,0 +1,279 @@
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from src.config import Config, cluster_path
+from src.utils.logger import logger
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(self, trace, name: str, parent_id: str, kind: int, attributes: dict):
+        self.trace = trace
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Stands in for a span when nothing is being traced"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans", "error")
+
+    def __init__(self):
+        self.trace_id = "%032x" % random.getrandbits(128)
+        # Finished spans, children before their parents
+        self.spans: List[Span] = []
+        self.error = False
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def otlp_span(span: Span) -> dict:
+    """A finished span in the OTLP/JSON encoding"""
+    status = {"code": STATUS_OK}
+    if span.error is not None:
+        status = {"code": STATUS_ERROR, "message": span.error}
+    return {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "parentSpanId": span.parent_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+        "status": status,
+    }
+
+
+class OTLPFileExporter:
+    """
+    Appends each kept trace to a file as one OTLP/JSON ExportTraceServiceRequest
+    per line, which collectors' file receivers and most trace viewers can read.
+    Encoding and writing happen on a background thread.
+    """
+
+    def __init__(self, path: str, service_name: str = "discord-bot"):
+        self.path = path
+        self.resource = {"attributes": [_attribute("service.name", service_name)]}
+        self._queue: "queue.SimpleQueue[Optional[_Trace]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: _Trace) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._write, name="trace-exporter", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(trace)
+
+    def _encode(self, trace: _Trace) -> str:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [otlp_span(span) for span in trace.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        return json.dumps(request, default=str)
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        while True:
+            trace = self._queue.get()
+            if trace is None:
+                return
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(self._encode(trace) + "\n")
+            except Exception as e:
+                logger.error("Failed to export trace %s: %s", trace.trace_id, e)
+
+    def shutdown(self) -> None:
+        """Write out queued traces and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+class Tracer:
+    """
+    Span tracing with the current span carried in a contextvar, so child
+    spans attach to the right trace across awaits and tasks. Sampling is
+    decided when the root span ends: every slow or failed trace is kept,
+    plus a random sample_rate fraction of the rest.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.exporter: Optional[OTLPFileExporter] = None
+        self.slow_ms = 1000.0
+        self.sample_rate = 0.0
+        # Spans kept per trace; runaway loops can't grow a trace without bound
+        self.max_spans = 1000
+
+    def configure(self, config) -> None:
+        """Apply a TracingConfig"""
+        path = cluster_path(config.path)
+        if self.exporter is None or self.exporter.path != path:
+            if self.exporter is not None:
+                self.exporter.shutdown()
+            self.exporter = OTLPFileExporter(path, config.service_name)
+        self.slow_ms = config.slow_ms
+        self.sample_rate = config.sample_rate
+        self.enabled = config.enabled
+
+    @contextmanager
+    def trace(self, name: str, kind: int = KIND_SERVER, **attributes):
+        """Start a trace, or a child span if one is already active"""
+        parent = _current_span.get()
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        trace = parent.trace if parent is not None else _Trace()
+        with self._span(trace, name, parent, kind, attributes) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, kind: int = KIND_INTERNAL, **attributes):
+        """Child span of the active trace; does nothing outside a trace"""
+        parent = _current_span.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        with self._span(parent.trace, name, parent, kind, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _span(self, trace: _Trace, name, parent: Optional[Span], kind, attributes):
+        span = Span(trace, name, parent.span_id if parent else "", kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            trace.error = True
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            if len(trace.spans) < self.max_spans:
+                trace.spans.append(span)
+            if parent is None:
+                self._finish(trace, span)
+
+    def _finish(self, trace: _Trace, root: Span) -> None:
+        if self.exporter is None:
+            return
+        if (
+            trace.error
+            or root.duration_ms >= self.slow_ms
+            or random.random() < self.sample_rate
+        ):
+            self.exporter.export(trace)
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer()
+tracer.configure(Config().tracing)
+Config().subscribe("tracing", lambda changes: tracer.configure(Config().tracing))
+atexit.register(tracer.shutdown)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def instrument_http(http) -> None:
+    """Record every Discord REST request made through a discord.py HTTPClient"""
+    request = http.request
+
+    @functools.wraps(request)
+    async def traced_request(route, **kwargs):
+        if _current_span.get() is None:
+            return await request(route, **kwargs)
+        with tracer.span(
+            f"discord {route.method} {route.path}",
+            KIND_CLIENT,
+            **{"http.method": route.method, "http.route": route.path},
+        ):
+            return await request(route, **kwargs)
+
+    http.request = traced_request
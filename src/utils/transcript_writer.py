@@ -0,0 +1,163 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from src.database.models.transcript import compress_text
+from src.database.repositories.transcript_repository import TranscriptRepository
+from src.utils.logger import logger
+
+
+@dataclass
+class Exchange:
+    guild_id: Optional[int]
+    channel_id: int
+    user_id: int
+    message_id: int
+    model: str
+    prompt: str
+    response: str
+    latency_ms: int
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    created_at: Optional[datetime] = None
+
+
+class TranscriptWriter:
+    """
+    Async ingest queue for LLM exchanges. enqueue() never awaits the database;
+    a background task drains the queue, compresses the bodies off the event
+    loop and inserts them in large batches. A retention job prunes old rows
+    and keeps SQLite statistics and free pages in check.
+    """
+
+    def __init__(
+        self,
+        retention_days: int = 30,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_queue: int = 10_000,
+        retention_interval: float = 3600.0,
+    ):
+        self.repo = TranscriptRepository()
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_interval = retention_interval
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self._writer: Optional[asyncio.Task] = None
+        self._retention: Optional[asyncio.Task] = None
+
+    def enqueue(self, exchange: Exchange) -> None:
+        """Queue an exchange for writing; drops it if the queue is full"""
+        if exchange.created_at is None:
+            exchange.created_at = datetime.utcnow()
+        try:
+            self.queue.put_nowait(exchange)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _next_batch(self) -> Tuple[List[Exchange], bool]:
+        """
+        Wait for one exchange, then gather more until the batch or interval
+        fills. Returns the batch and whether the stop sentinel was reached.
+        """
+        first = await self.queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                exchange = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if exchange is None:
+                return batch, True
+            batch.append(exchange)
+        return batch, False
+
+    @staticmethod
+    def _to_rows(batch: List[Exchange]) -> List[dict]:
+        return [
+            {
+                "guild_id": exchange.guild_id,
+                "channel_id": exchange.channel_id,
+                "user_id": exchange.user_id,
+                "message_id": exchange.message_id,
+                "model": exchange.model,
+                "latency_ms": exchange.latency_ms,
+                "prompt_tokens": exchange.prompt_tokens,
+                "completion_tokens": exchange.completion_tokens,
+                "total_tokens": exchange.total_tokens,
+                "prompt": compress_text(exchange.prompt),
+                "response": compress_text(exchange.response),
+                "created_at": exchange.created_at,
+                "updated_at": exchange.created_at,
+            }
+            for exchange in batch
+        ]
+
+    async def _write(self, batch: List[Exchange]) -> None:
+        try:
+            rows = await asyncio.to_thread(self._to_rows, batch)
+            texts = [(exchange.prompt, exchange.response) for exchange in batch]
+            await self.repo.add_batch(rows, texts)
+        except Exception as e:
+            logger.error("Failed to write %d transcripts: %s", len(batch), e)
+
+    async def _run_writer(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def _run_retention(self):
+        while True:
+            await self.prune()
+            await asyncio.sleep(self.retention_interval)
+
+    async def prune(self) -> int:
+        """Delete expired transcripts, then refresh stats and reclaim space"""
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+            deleted = await self.repo.prune_before(cutoff)
+            await self.repo.optimize_storage()
+            if deleted:
+                logger.info(
+                    "Pruned %s transcripts older than %s", deleted, cutoff.date()
+                )
+            return deleted
+        except Exception as e:
+            logger.error("Transcript retention failed: %s", e)
+            return 0
+
+    def start(self) -> None:
+        """Start the background writer and retention tasks"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run_writer())
+            self._retention = asyncio.create_task(self._run_retention())
+
+    async def stop(self) -> None:
+        """Write everything still queued, then stop the background tasks"""
+        if self._retention is not None:
+            self._retention.cancel()
+            try:
+                await self._retention
+            except asyncio.CancelledError:
+                pass
+            self._retention = None
+
+        if self._writer is not None:
+            # The writer flushes everything queued before the sentinel and exits
+            await self.queue.put(None)
+            await self._writer
+            self._writer = None
@@ -0,0 +1,147 @@
+import asyncio
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+from src.database.repositories.usage_repository import UsageRepository
+from src.utils.logger import logger
+
+# (guild_id, user_id, day) -> [requests, tokens]
+UsageKey = Tuple[int, int, date]
+
+
+class UsageBuffer:
+    """
+    Write-behind buffer for per-user daily request and token counters.
+    Increments are aggregated in memory and written in batched upserts every
+    flush_interval seconds, once max_pending keys are buffered, and on stop().
+    Reads merge the buffered deltas onto the stored totals, so a quota check
+    costs at most one query per user per day.
+    """
+
+    def __init__(self, flush_interval: float = 10.0, max_pending: int = 1000):
+        self.repo = UsageRepository()
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: Dict[UsageKey, list] = {}
+        self._in_flight: Dict[UsageKey, list] = {}
+        self._stored: Dict[UsageKey, list] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._threshold_flush: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(guild_id: Optional[int], user_id: int, day: Optional[date]) -> UsageKey:
+        return (guild_id or 0, user_id, day or datetime.utcnow().date())
+
+    def record(
+        self,
+        guild_id: Optional[int],
+        user_id: int,
+        requests: int = 1,
+        tokens: int = 0,
+        day: Optional[date] = None,
+    ) -> None:
+        """Add to a user's counters for the day without touching the database"""
+        key = self._key(guild_id, user_id, day)
+        counters = self._pending.get(key)
+        if counters is None:
+            self._pending[key] = [requests, tokens]
+        else:
+            counters[0] += requests
+            counters[1] += tokens
+
+        if len(self._pending) >= self.max_pending and (
+            self._threshold_flush is None or self._threshold_flush.done()
+        ):
+            self._threshold_flush = asyncio.create_task(self._safe_flush())
+
+    async def get_usage(
+        self, guild_id: Optional[int], user_id: int, day: Optional[date] = None
+    ) -> Tuple[int, int]:
+        """Return (requests, tokens) for the day, including unflushed deltas"""
+        key = self._key(guild_id, user_id, day)
+        stored = self._stored.get(key)
+        if stored is None:
+            # Load under the flush lock so a concurrent flush is not counted twice
+            async with self._flush_lock:
+                stored = self._stored.get(key)
+                if stored is None:
+                    stored = list(await self.repo.get_usage(*key))
+                    self._stored[key] = stored
+
+        requests, tokens = stored
+        for buffer in (self._in_flight, self._pending):
+            delta = buffer.get(key)
+            if delta:
+                requests += delta[0]
+                tokens += delta[1]
+        return requests, tokens
+
+    async def flush(self) -> int:
+        """Write all buffered deltas in one batched upsert; returns keys written"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            self._in_flight, self._pending = self._pending, {}
+            rows = [
+                {
+                    "guild_id": guild_id,
+                    "user_id": user_id,
+                    "day": day,
+                    "requests": requests,
+                    "tokens": tokens,
+                }
+                for (guild_id, user_id, day), (requests, tokens) in self._in_flight.items()
+            ]
+            try:
+                await self.repo.increment_many(rows)
+            except Exception:
+                # Put the deltas back so the next flush retries them
+                for key, (requests, tokens) in self._in_flight.items():
+                    counters = self._pending.setdefault(key, [0, 0])
+                    counters[0] += requests
+                    counters[1] += tokens
+                self._in_flight = {}
+                raise
+
+            for key, (requests, tokens) in self._in_flight.items():
+                stored = self._stored.get(key)
+                if stored is not None:
+                    stored[0] += requests
+                    stored[1] += tokens
+            self._in_flight = {}
+            self._prune_stored()
+            return len(rows)
+
+    def _prune_stored(self):
+        today = datetime.utcnow().date()
+        for key in [key for key in self._stored if key[2] < today]:
+            del self._stored[key]
+
+    async def _safe_flush(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Failed to flush usage counters: %s", e)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._safe_flush()
+
+    def start(self) -> None:
+        """Start the periodic background flush"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flush and write anything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._safe_flush()
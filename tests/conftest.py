@@ -0,0 +1,34 @@
+import dataclasses
+import pytest_asyncio
+import src.database.models  # noqa: F401  (registers every table)
+from src.database.cache import _caches
+from src.database.manager import Base, DatabaseManager, create_engines
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path, monkeypatch):
+    """DatabaseManager pointed at a fresh file database with the tuned profile"""
+    manager = DatabaseManager()
+    config = dataclasses.replace(
+        manager.config,
+        url=f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite'}",
+        sqlite_tuned=True,
+        sqlite_busy_timeout_ms=5000,
+        # Short enough that only busy_timeout, not pool checkout, can absorb
+        # a writer waiting on another transaction
+        pool_timeout=0.2,
+    )
+    engine, read_engine, session_factory = create_engines(config)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    monkeypatch.setattr(manager, "engine", engine)
+    monkeypatch.setattr(manager, "read_engine", read_engine)
+    monkeypatch.setattr(manager, "SessionLocal", session_factory)
+    for cache in _caches.values():
+        cache.clear()
+    yield manager
+    for cache in _caches.values():
+        cache.clear()
+    await engine.dispose()
+    await read_engine.dispose()
@@ -0,0 +1,114 @@
+import pytest
+from types import SimpleNamespace
+from src.database import cache as cache_module
+from src.database.cache import RepositoryCache
+from src.database.repositories.user_repository import UserRepository
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def _row(id: int, discord_id: int):
+    return SimpleNamespace(id=id, discord_id=discord_id)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = RepositoryCache([("discord_id",)], ttl=10)
+    key = cache.make_key({"id": 1})
+    cache.set(key, _row(1, 100))
+
+    clock.now += 9
+    assert cache.get(key) == (True, _row(1, 100))
+    clock.now += 2
+    assert cache.get(key) == (False, None)
+    assert cache.stats()["size"] == 1  # the row's discord_id alias remains
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = RepositoryCache([], ttl=10, max_size=2)
+    keys = [cache.make_key({"id": id}) for id in (1, 2, 3)]
+    cache.set(keys[0], _row(1, 100))
+    cache.set(keys[1], _row(2, 200))
+    cache.get(keys[0])
+    cache.set(keys[2], _row(3, 300))
+
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0])[0] and cache.get(keys[2])[0]
+    assert cache.evictions == 1
+
+
+def test_negative_entries(clock):
+    cache = RepositoryCache([("discord_id",)], ttl=10)
+    key = cache.make_key({"discord_id": 100})
+    cache.set(key, None)
+    assert cache.get(key) == (True, None)
+    assert cache.negative_hits == 1
+
+    # Creating the row drops the negative entry
+    cache.invalidate({"discord_id": 100})
+    assert cache.get(key) == (False, None)
+
+    disabled = RepositoryCache([("discord_id",)], ttl=10, negative=False)
+    disabled.set(key, None)
+    assert disabled.get(key) == (False, None)
+
+
+def test_invalidation_drops_every_alias_and_stale_loads(clock):
+    cache = RepositoryCache([("discord_id",)], ttl=10)
+    by_id = cache.make_key({"id": 1})
+    by_discord_id = cache.make_key({"discord_id": 100})
+    cache.set(by_id, _row(1, 100))
+
+    generation = cache.generation
+    cache.invalidate({"username": "new"}, id=1)
+    assert cache.get(by_id) == (False, None)
+    assert cache.get(by_discord_id) == (False, None)
+
+    # A load that started before the write must not be stored
+    cache.set(by_discord_id, _row(1, 100), generation=generation)
+    assert cache.get(by_discord_id) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_waits_for_commit(db):
+    repo = UserRepository()
+    user = await repo.create(discord_id=100, username="old")
+    assert (await repo.get_by_discord_id(100)).username == "old"
+    invalidations = repo.cache.invalidations
+
+    async with db.unit_of_work():
+        await repo.update(user.id, username="new")
+        # The cache still holds "old", but the uncommitted write must win
+        assert (await repo.get_by_discord_id(100)).username == "new"
+        assert repo.cache.invalidations == invalidations
+
+    assert repo.cache.invalidations == invalidations + 1
+    assert (await repo.get_by_discord_id(100)).username == "new"
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_leaves_cache_intact(db):
+    repo = UserRepository()
+    user = await repo.create(discord_id=100, username="old")
+    await repo.get_by_discord_id(100)
+    invalidations = repo.cache.invalidations
+
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work():
+            await repo.update(user.id, username="new")
+            raise RuntimeError("boom")
+
+    assert repo.cache.invalidations == invalidations
+    assert (await repo.get_by_discord_id(100)).username == "old"
@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy import func, select
+from src.database.models import UsageCounter
+
+DAY = date(2024, 1, 1)
+
+
+async def _count(db) -> int:
+    async with db.get_session() as session:
+        return await session.scalar(select(func.count()).select_from(UsageCounter))
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_and_runs_after_commit(db):
+    committed = []
+    async with db.unit_of_work() as session:
+        session.add(UsageCounter(day=DAY, guild_id=1, user_id=1))
+        async with db.get_session() as joined:
+            assert joined is session
+            joined.add(UsageCounter(day=DAY, guild_id=1, user_id=2))
+        db.after_commit(lambda: committed.append(True))
+        assert db.has_pending_writes()
+        assert committed == []
+    assert committed == [True]
+    assert await _count(db) == 2
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(db):
+    committed = []
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work() as session:
+            session.add(UsageCounter(day=DAY, guild_id=1, user_id=1))
+            await session.flush()
+            db.after_commit(lambda: committed.append(True))
+            raise RuntimeError("boom")
+    assert committed == []
+    assert await _count(db) == 0
+
+
+@pytest.mark.asyncio
+async def test_savepoint_rolls_back_on_its_own(db):
+    async with db.unit_of_work() as session:
+        session.add(UsageCounter(day=DAY, guild_id=1, user_id=1))
+        with pytest.raises(RuntimeError):
+            async with db.savepoint() as nested:
+                nested.add(UsageCounter(day=DAY, guild_id=1, user_id=2))
+                await nested.flush()
+                raise RuntimeError("boom")
+    async with db.get_session() as session:
+        users = (await session.scalars(select(UsageCounter.user_id))).all()
+    assert users == [1]
+
+
+@pytest.mark.asyncio
+async def test_spawned_task_does_not_join_unit_of_work(db):
+    async def background():
+        async with db.get_session() as session:
+            assert not db.has_pending_writes()
+            return session
+
+    async with db.unit_of_work() as session:
+        db.after_commit(lambda: None)
+        assert await asyncio.create_task(background()) is not session
@@ -0,0 +1,70 @@
+import pytest
+from datetime import date
+from src.database import repositories
+from src.database.repositories.usage_repository import UsageRepository
+
+DAY = date(2024, 1, 1)
+KEY = ["guild_id", "user_id", "day"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_fallback_without_native_upsert(db, monkeypatch):
+    monkeypatch.setattr(repositories, "_NATIVE_UPSERT_DIALECTS", ())
+    repo = UsageRepository()
+
+    await repo.upsert(KEY, guild_id=1, user_id=1, day=DAY, requests=1, tokens=10)
+    await repo.increment_many(
+        [
+            {"guild_id": 1, "user_id": 1, "day": DAY, "requests": 2, "tokens": 5},
+            {"guild_id": 1, "user_id": 2, "day": DAY, "requests": 1, "tokens": 1},
+        ]
+    )
+
+    assert await repo.get_usage(1, 1, DAY) == (3, 15)
+    assert await repo.get_usage(1, 2, DAY) == (1, 1)
+    await repo.upsert(KEY, guild_id=1, user_id=1, day=DAY, requests=0, tokens=0)
+    assert await repo.get_usage(1, 1, DAY) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_inserts_across_batches(db, monkeypatch):
+    repo = UsageRepository()
+    monkeypatch.setattr(repo, "batch_size", 2)
+    rows = [{"guild_id": 1, "user_id": user, "day": DAY} for user in range(5)]
+
+    assert await repo.bulk_create(rows) == 5
+    assert len(await repo.get_all()) == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_increment_adds_to_stored_values(db):
+    repo = UsageRepository()
+    row = {"guild_id": 1, "user_id": 1, "day": DAY, "requests": 1, "tokens": 10}
+
+    await repo.bulk_upsert([row], KEY, increment=True)
+    await repo.bulk_upsert([row, {**row, "user_id": 2}], KEY, increment=True)
+
+    assert await repo.get_usage(1, 1, DAY) == (2, 20)
+    assert await repo.get_usage(1, 2, DAY) == (1, 10)
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_rows_with_different_columns(db):
+    repo = UsageRepository()
+    rows = [
+        {"guild_id": 1, "user_id": 1, "day": DAY, "requests": 1},
+        {"guild_id": 1, "user_id": 2, "day": DAY, "tokens": 5},
+    ]
+    with pytest.raises(ValueError):
+        await repo.bulk_upsert(rows, KEY)
+
+
+@pytest.mark.asyncio
+async def test_delete_where_requires_a_filter(db):
+    repo = UsageRepository()
+    await repo.create(guild_id=1, user_id=1, day=DAY)
+
+    with pytest.raises(ValueError):
+        await repo.delete_where()
+    assert len(await repo.get_all()) == 1
+    assert await repo.delete_where(guild_id=1) == 1
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy import select
+from src.database.models import UsageCounter
+from src.database.repositories.usage_repository import UsageRepository
+
+DAY = date(2024, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_write_queues_behind_open_unit_of_work(db):
+    repo = UsageRepository()
+    holding = asyncio.Event()
+
+    async def long_unit_of_work():
+        async with db.unit_of_work():
+            await repo.create(day=DAY, guild_id=1, user_id=1)
+            holding.set()
+            await asyncio.sleep(0.5)
+
+    async def background_write():
+        await holding.wait()
+        await repo.create(day=DAY, guild_id=1, user_id=2)
+
+    await asyncio.gather(long_unit_of_work(), background_write())
+
+    async with db.get_session() as session:
+        users = (await session.scalars(select(UsageCounter.user_id))).all()
+    assert sorted(users) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_session_stays_on_writer_after_first_write(db):
+    async with db.get_session() as session:
+        await session.execute(select(UsageCounter))
+        assert not session.info.get("wrote")
+        session.add(UsageCounter(day=DAY, guild_id=1, user_id=1))
+        await session.flush()
+        assert session.info["wrote"]
+        # Reads now see the uncommitted row
+        assert (await session.scalars(select(UsageCounter))).one().user_id == 1
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from src.config import Config
+from src.utils.cluster import ClusterLauncher, IPCClient, shard_ranges
+
+
+def stub_worker(info):
+    """Stands in for a bot worker: answers stats over IPC until shut down"""
+
+    async def main():
+        client = IPCClient(info)
+        done = asyncio.Event()
+
+        async def stats(data):
+            return {
+                "cluster_id": info.cluster_id,
+                "shards": info.shard_ids,
+                "pid": os.getpid(),
+                "guilds": len(info.shard_ids),
+            }
+
+        async def shutdown(data):
+            done.set()
+
+        async def disconnected():
+            done.set()
+
+        client.on("stats", stats)
+        client.on("shutdown", shutdown)
+        client.on_disconnect = disconnected
+        await client.connect()
+        await done.wait()
+        await client.close()
+
+    asyncio.run(main())
+
+
+@pytest_asyncio.fixture
+async def fake_gateway(monkeypatch):
+    """Serve GET /gateway/bot the way Discord does, recommending 4 shards"""
+
+    async def gateway_bot(request):
+        assert request.headers["Authorization"] == "Bot test-token"
+        return web.json_response(
+            {
+                "url": "wss://gateway.invalid",
+                "shards": 4,
+                "session_start_limit": {"remaining": 1000, "max_concurrency": 1},
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/gateway/bot", gateway_bot)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    config = Config()
+    monkeypatch.setattr(config.discord, "token", "test-token")
+    monkeypatch.setattr(config.discord, "api_base", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(config.cluster, "shard_count", 0)
+    monkeypatch.setattr(config.cluster, "ipc_port", 0)
+    yield
+    await runner.cleanup()
+
+
+async def _wait_for(condition, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def test_shard_ranges():
+    assert shard_ranges(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert shard_ranges(2, 4) == [[0], [1]]
+
+
+@pytest.mark.asyncio
+async def test_cluster_restarts_dead_worker_and_aggregates_stats(fake_gateway):
+    launcher = ClusterLauncher(2, target=stub_worker)
+    launcher.restart_delay = 0.1
+    launcher.shutdown_grace = 5.0
+    run = asyncio.create_task(launcher.run())
+    try:
+        await _wait_for(
+            lambda: launcher.server is not None and len(launcher.server.clients) == 2
+        )
+        stats = await launcher.server.request("stats", timeout=5.0)
+        assert sorted(s["shards"] for s in stats) == [[0, 1], [2, 3]]
+        assert sum(s["guilds"] for s in stats) == 4
+
+        killed = launcher.workers[0].process
+        killed.kill()
+        await _wait_for(
+            lambda: launcher.workers[0].process is not killed
+            and len(launcher.server.clients) == 2
+        )
+
+        stats = await launcher.server.request("stats", timeout=5.0)
+        assert sorted(s["cluster_id"] for s in stats) == [0, 1]
+        assert killed.pid not in [s["pid"] for s in stats]
+    finally:
+        launcher.shutdown()
+        await asyncio.wait_for(run, 30)
+
+    assert all(worker.process.exitcode == 0 for worker in launcher.workers)
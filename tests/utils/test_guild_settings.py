@@ -0,0 +1,38 @@
+import pytest
+from src.utils.guild_settings import DEFAULTS, GuildSettings
+
+
+@pytest.mark.asyncio
+async def test_guild_value_wins_over_global(db):
+    settings = GuildSettings()
+    await settings.set(None, "enable_ai", False)
+    await settings.set(42, "enable_ai", True)
+
+    assert settings.is_enabled(42, "enable_ai") is True
+    assert settings.is_enabled(7, "enable_ai") is False
+    assert settings.is_enabled(None, "enable_ai") is False
+
+    assert settings.get_all(42) == {**DEFAULTS, "enable_ai": True}
+    assert settings.get_all(7) == {**DEFAULTS, "enable_ai": False}
+    assert settings.get_all() == {**DEFAULTS, "enable_ai": False}
+
+
+@pytest.mark.asyncio
+async def test_refresh_pulls_only_new_writes(db):
+    settings = GuildSettings()
+    assert await settings.refresh() == 0
+
+    # Another process writes through its own copy
+    other = GuildSettings()
+    await other.set(None, "enable_moderation", True)
+    await other.set(42, "enable_utilities", False)
+
+    assert settings.is_enabled(42, "enable_utilities") is True
+    assert await settings.refresh() == 2
+    assert settings.is_enabled(7, "enable_moderation") is True
+    assert settings.is_enabled(42, "enable_utilities") is False
+    assert await settings.refresh() == 0
+
+    await other.set(42, "enable_utilities", True)
+    assert await settings.refresh() == 1
+    assert settings.is_enabled(42, "enable_utilities") is True
@@ -0,0 +1,35 @@
+import asyncio
+import time
+import pytest
+from src.utils.loop_monitor import BlockingCallError, LoopMonitor, no_blocking
+
+
+@pytest.mark.asyncio
+async def test_no_blocking_fails_on_blocking_sleep():
+    with pytest.raises(BlockingCallError) as error:
+        async with no_blocking(50):
+            time.sleep(0.2)
+
+    assert "time.sleep(0.2)" in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_no_blocking_allows_awaited_sleep():
+    async with no_blocking(50):
+        await asyncio.sleep(0.2)
+
+
+@pytest.mark.asyncio
+async def test_default_interval_catches_blocks_over_threshold():
+    monitor = LoopMonitor(interval=0.5, threshold_ms=250, strict=True)
+    assert monitor.interval <= 0.05
+
+    monitor.start()
+    try:
+        for _ in range(5):
+            time.sleep(0.4)
+            await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    assert len(monitor.stalls) == 5
@@ -0,0 +1,97 @@
+import dataclasses
+import pytest
+from types import SimpleNamespace
+from src.config import LLMConfig
+from src.utils import quota as quota_module
+from src.utils.quota import QuotaManager, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(quota_module.time, "monotonic", clock)
+    return clock
+
+
+class FakeUsage:
+    def __init__(self, requests: int = 0, tokens: int = 0):
+        self.usage = (requests, tokens)
+        self.recorded = []
+
+    async def get_usage(self, guild_id, user_id):
+        return self.usage
+
+    def record(self, guild_id, user_id, requests=0, tokens=0):
+        self.recorded.append((guild_id, user_id, requests, tokens))
+
+
+def _manager(usage: FakeUsage) -> QuotaManager:
+    permissions = SimpleNamespace(
+        default_values={"max_requests_per_day": 10, "max_tokens_per_day": 1000}
+    )
+    config = dataclasses.replace(
+        LLMConfig(), user_burst=2, user_requests_per_minute=60
+    )
+    return QuotaManager(permissions, usage, config)
+
+
+def _dm(user_id: int = 1):
+    return SimpleNamespace(author=SimpleNamespace(id=user_id), guild=None)
+
+
+def test_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(capacity=2, rate=0.5)
+    bucket.consume(2)
+    assert not bucket.available()
+
+    clock.now += 1
+    assert not bucket.available()
+    clock.now += 1
+    assert bucket.available() and not bucket.available(2)
+
+    clock.now += 100
+    assert bucket.is_full and bucket.level == 2
+
+
+def test_bucket_refund_is_capped_at_capacity(clock):
+    bucket = TokenBucket(capacity=2, rate=0)
+    bucket.consume(3)
+    assert bucket.level == -1
+    bucket.refund(1)
+    assert bucket.level == 0
+    bucket.refund(5)
+    assert bucket.level == 2
+
+
+@pytest.mark.asyncio
+async def test_burst_limit_rejects_until_refill(clock):
+    manager = _manager(FakeUsage())
+    assert await manager.check(_dm()) is None
+    assert await manager.check(_dm()) is None
+    assert "too quickly" in await manager.check(_dm())
+
+    clock.now += 1
+    assert await manager.check(_dm()) is None
+
+
+@pytest.mark.asyncio
+async def test_daily_limit_rejection_refunds_burst_slots(clock):
+    usage = FakeUsage(requests=10)
+    manager = _manager(usage)
+
+    for _ in range(3):
+        assert "daily usage limit" in await manager.check(_dm())
+    assert manager._bucket("user", 1).is_full
+    assert usage.recorded == []
+
+    usage.usage = (9, 0)
+    assert await manager.check(_dm()) is None
+    assert usage.recorded == [(None, 1, 1, 0)]